@@ -0,0 +1,205 @@
+"""End-to-end benchmark on synthetic counties of 1x, 10x and 100x normal size.
+
+Each scale runs in a fresh process and working directory: the synthetic
+season is loaded through add_clubs ... add_matches and add_new_results, then
+the tables, pages and Instagram images are built, timing every step. Results
+go to benchmarks/<version>-<git revision>.json; pass --compare with an
+earlier file to see the change in each timing. --memory also records each
+phase's peak memory (far slower, as it runs under tracemalloc).
+
+    python benchmark.py
+    python benchmark.py --scales 1 10 --compare benchmarks/0.1.0-abc1234.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from importlib import metadata
+
+import county
+from county.synthetic import CountySpec, synthetic_county
+
+RESULTS_DIR = "benchmarks"
+
+
+def _timed(timings, name, func, *args, **kwargs):
+    start = time.perf_counter()
+    # add_new_results prints a line per result
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    timings[name] = round(time.perf_counter() - start, 4)
+    print(f"  {name}: {timings[name]:.3f}s", file=sys.stderr)
+    return result
+
+
+def run_scale(scale, assets, sample):
+    """Builds and times one county; runs inside its own working directory."""
+    spec = CountySpec().scaled(scale)
+    data = synthetic_county(spec)
+    if os.path.isdir(assets):
+        os.symlink(assets, "data")
+    county.initialise("sqlite:///county.db")
+
+    timings = {}
+    _timed(timings, "add_clubs", county.add_clubs, clubs_df=data.clubs)
+    _timed(timings, "add_referees", county.add_referees, referees_df=data.referees)
+    _timed(timings, "add_venues", county.add_venues, venues_df=data.venues)
+    _timed(
+        timings,
+        "add_competitions",
+        county.add_competitions,
+        competitions_df=data.competitions,
+    )
+    _timed(timings, "add_divisions", county.add_divisions, divisions_df=data.divisions)
+    _timed(timings, "add_groups", county.add_groups, groups_df=data.groups)
+    _timed(timings, "add_criteria", county.add_criteria, criteria_df=data.criteria)
+    _timed(timings, "add_teams", county.add_teams, teams_df=data.teams)
+    _timed(timings, "add_matches", county.add_matches, matches_df=data.matches)
+    _timed(timings, "add_new_results", county.add_new_results, new_results=data.results)
+    _timed(timings, "update_all_tables", county.update_all_tables)
+    _timed(timings, "generate_all_pages", county.generate_all_pages, force=True)
+
+    if os.path.isdir("data"):
+        matches = data.matches.set_index("match_id")
+        last_played = matches.loc[data.results["match_id"], "match_date"].max()
+        fixtures_date = last_played + timedelta(days=1)
+        results_date = fixtures_date - timedelta(days=7)
+        divisions = [int(i) for i in data.divisions["division_id"][:sample]]
+        for render, start_date in (
+            (county.instagram_division_results, results_date),
+            (county.instagram_division_fixtures, fixtures_date),
+        ):
+            # Mean seconds per division, each drawn from scratch
+            start = time.perf_counter()
+            for division_id in divisions:
+                render(division_id, start_date, days=6, force=True)
+            seconds = (time.perf_counter() - start) / len(divisions)
+            timings[render.__name__] = round(seconds, 4)
+            print(f"  {render.__name__}: {seconds:.3f}s each", file=sys.stderr)
+    else:
+        print(f"  no assets at {assets}; skipping images", file=sys.stderr)
+
+    return {"spec": asdict(spec), "sizes": data.sizes, "timings": timings}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _compare(report, baseline_path):
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    for scale, result in report["scales"].items():
+        before = baseline["scales"].get(scale, {}).get("timings", {})
+        for step, seconds in result["timings"].items():
+            if step in before and before[step]:
+                change = seconds / before[step] - 1
+                print(
+                    f"{scale:>4}x {step:<28} {before[step]:9.3f}s -> "
+                    f"{seconds:9.3f}s  {change:+7.1%}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--assets", default="data", help="fonts, backgrounds, logos")
+    parser.add_argument(
+        "--sample", type=int, default=5, help="divisions to render images for"
+    )
+    parser.add_argument("--output", help="default benchmarks/<version>-<rev>.json")
+    parser.add_argument("--compare", help="an earlier results file")
+    parser.add_argument(
+        "--memory", action="store_true", help="profile memory per phase"
+    )
+    parser.add_argument("--run-scale", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scale:
+        result = run_scale(args.run_scale, args.assets, args.sample)
+        print(json.dumps(result, default=str))
+        return
+
+    version = _version()
+    revision = _git_revision()
+    report = {
+        "version": version,
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "scales": {},
+    }
+    assets = os.path.abspath(args.assets)
+    for scale in args.scales:
+        print(f"{scale}x county", file=sys.stderr)
+        with tempfile.TemporaryDirectory() as workdir:
+            env = dict(os.environ)
+            if args.memory:
+                env["COUNTY_MEMPROFILE"] = os.path.join(workdir, "memory.json")
+            child = subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--run-scale",
+                    str(scale),
+                    "--assets",
+                    assets,
+                    "--sample",
+                    str(args.sample),
+                ],
+                cwd=workdir,
+                env=env,
+                stdout=subprocess.PIPE,
+                text=True,
+                check=True,
+            )
+            result = json.loads(child.stdout.splitlines()[-1])
+            if args.memory:
+                # Highest peak and retained size over each phase's calls
+                memory = {}
+                with open(env["COUNTY_MEMPROFILE"]) as file:
+                    for phase in json.load(file):
+                        before = memory.get(phase["name"], {"peak": 0, "retained": 0})
+                        memory[phase["name"]] = {
+                            key: max(before[key], phase[key])
+                            for key in ("peak", "retained")
+                        }
+                result["memory"] = memory
+        report["scales"][str(scale)] = result
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{version}-{revision}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=1)
+    print(f"Results written to {output}", file=sys.stderr)
+    if args.compare:
+        _compare(report, args.compare)
+
+
+def _version():
+    try:
+        return metadata.version("county")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,1674 +1,1209 @@
-import os
-from datetime import date, time, timedelta
-from functools import wraps
-
-import pandas as pd
-from PIL import Image, ImageDraw, ImageFont  # Import necessary libraries
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.orm import scoped_session, sessionmaker
-
-from .create_competitions import (  # noqa F401
-    add_club,
-    add_competition,
-    add_division,
-    add_group,
-    add_match,
-    add_player,
-    add_player_participation,
-    add_player_team_association,
-    add_referee,
-    add_team,
-    add_team_club_association,
-    add_venue,
-)
-from .create_schema import (  # noqa F401
-    Base,
-    Club,
-    Competition,
-    Division,
-    Group,
-    Match,
-    Player,
-    PlayerParticipation,
-    Referee,
-    Team,
-    Venue,
-    player_team_association,
-    team_club_association,
-)
-from .update_matches import (  # noqa F401
-    add_result,
-    update_date,
-    update_date_time,
-    update_league_ranks,
-    update_player_participation,
-    update_referee,
-    update_time,
-    update_venue,
-)
-
-# Global variable to store the engine
-engine = None
-Session = None
-
-
-def with_session(func):
-    """Decorator to manage SQLAlchemy sessions."""
-
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        session = Session()
-        try:
-            result = func(session, *args, **kwargs)
-            session.commit()
-            return result
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            Session.remove()
-
-    return wrapper
-
-
-# add_club = with_session(add_club)
-# add_competition = with_session(add_competition)
-# add_division = with_session(add_division)
-# add_group = with_session(add_group)
-# add_match = with_session(add_match)
-# add_player_participation = with_session(add_player_participation)
-# add_player_team_association = with_session(add_player_team_association)
-# add_referee = with_session(add_referee)
-# add_team = with_session(add_team)
-# add_team_club_association = with_session(add_team_club_association)
-# add_venue = with_session(add_venue)
-
-
-def get_engine(db_url=None):
-    """Creates a database engine with the provided URL or from environment variables."""
-    if db_url is None:
-        db_url = os.environ.get("DATABASE_URL")
-    if db_url is None:
-        raise ValueError("DATABASE_URL environment variable not set.")
-    return create_engine(db_url)
-
-
-def get_session(db_url=None):
-    """Returns a session object."""
-
-    global engine  # Use global engine
-    global Session  # Use global Session
-    if engine is None:  # Create engine if it doesn't exist
-        engine = get_engine(db_url)
-    session_factory = sessionmaker(bind=engine)
-    Session = scoped_session(session_factory)
-
-    return Session
-
-
-def initialise(db_url=None):
-    """Creates the database schema."""
-    global engine  # Use global engine
-    global Session  # Use global Session
-    # Create the database engine
-    Session = get_session(db_url)
-    # Create the database tables if they do not exist
-    inspector = inspect(engine)
-    if not inspector.has_table("clubs"):  # Check for one of the tables
-        Base.metadata.create_all(engine)
-    return Session
-
-
-@with_session
-def add_clubs(session, clubs_df):
-    for idx, row in clubs_df.iterrows():
-        club_id: int = row["club_id"]
-        club_name: str = row["name"]
-        ainm: str | None = row["ainm"] if pd.notna(row["ainm"]) else None
-        add_club(session=session, club_id=club_id, name=club_name, ainm=ainm)
-
-
-@with_session
-def add_referees(session, referees_df):
-    for idx, row in referees_df.iterrows():
-        referee_id: int = row["referee_id"]
-        ref_name: str = row["name"]
-        club_id: int = row["club_id"]
-        add_referee(
-            session=session, referee_id=referee_id, name=ref_name, club_id=club_id
-        )
-
-
-@with_session
-def add_venues(session, venues_df):
-    for idx, row in venues_df.iterrows():
-        venue_id: int = row["venue_id"]
-        venue_name: str = row["name"]
-        club_id: int = row["club_id"]
-        address: str | None = row["address"] if pd.notna(row["address"]) else None
-        add_venue(
-            session=session,
-            venue_id=venue_id,
-            name=venue_name,
-            club_id=club_id,
-            address=address,
-        )
-
-
-@with_session
-def add_competitions(session, competitions_df):
-    for idx, row in competitions_df.iterrows():
-        competition_id: int = row["competition_id"]
-        competition_name: str = row["name"]
-        add_competition(
-            session=session, competition_id=competition_id, name=competition_name
-        )
-
-
-@with_session
-def add_divisions(session, divisions_df):
-    for idx, row in divisions_df.iterrows():
-        division_id: int = row["division_id"]
-        division_name: str = row["name"]
-        competition_id: int = row["competition_id"]
-        add_division(
-            session=session,
-            division_id=division_id,
-            name=division_name,
-            competition_id=competition_id,
-        )
-
-
-@with_session
-def add_groups(session, groups_df):
-    for idx, row in groups_df.iterrows():
-        group_id: int = row["group_id"]
-        group_name: str = row["name"]
-        competition_id: int = row["competition_id"]
-        division_id: int = row["division_id"]
-        add_group(
-            session=session,
-            group_id=group_id,
-            name=group_name,
-            competition_id=competition_id,
-            division_id=division_id,
-        )
-
-
-@with_session
-def add_teams(session, teams_df):
-    for idx, row in teams_df.iterrows():
-        team_id: int = row["team_id"]
-        team_name: str = row["name"]
-        competition_id: int = row["competition_id"]
-        division_id: int = row["division_id"]
-        group_id: int = row["group_id"]
-        club_id1: int = row["club_id1"]
-        club_id2: int | None = (
-            int(row["club_id2"]) if pd.notna(row["club_id2"]) else None
-        )
-        add_team(
-            session=session,
-            team_id=team_id,
-            name=team_name,
-            competition_id=competition_id,
-            division_id=division_id,
-            group_id=group_id,
-            club_id1=club_id1,
-            club_id2=club_id2,
-        )
-
-
-@with_session
-def add_matches(session, matches_df):
-    for idx, row in matches_df.iterrows():
-        match_id: int = row["match_id"]
-        home_team_id: int = (
-            row["home_team_id"] if pd.notna(row["home_team_id"]) else None
-        )
-        away_team_id: int = (
-            row["away_team_id"] if pd.notna(row["away_team_id"]) else None
-        )
-        venue_id: int = row["venue_id"] if pd.notna(row["venue_id"]) else None
-        competition_id: int = row["competition_id"]
-        division_id: int = row["division_id"]
-        stage: str = row["stage"]
-        group_round: str = row["group_round"]
-        match_no: int = row["match_no"]
-        group_id: int | None = row["group_id"] if pd.notna(row["group_id"]) else None
-        match_date: date | None = (
-            row["match_date"] if pd.notna(row["match_date"]) else None
-        )
-        match_time: time | None = (
-            row["match_time"] if pd.notna(row["match_time"]) else None
-        )
-        referee_id: int = row["referee_id"] if pd.notna(row["referee_id"]) else None
-
-        add_match(
-            session=session,
-            match_id=match_id,
-            home_team_id=home_team_id,
-            away_team_id=away_team_id,
-            venue_id=venue_id,
-            competition_id=competition_id,
-            division_id=division_id,
-            stage=stage,
-            group_round=group_round,
-            match_no=match_no,
-            group_id=group_id,
-            match_date=match_date,
-            match_time=match_time,
-            referee_id=referee_id,
-        )
-
-
-@with_session
-def add_new_results(session, new_results):
-    for idx, row in new_results.iterrows():
-        match_id: int = row["match_id"]
-        home_goals: int = row["home_goals"] if pd.notna(row["home_goals"]) else None
-        home_points: int = row["home_points"] if pd.notna(row["home_points"]) else None
-        away_goals: int = row["away_goals"] if pd.notna(row["away_goals"]) else None
-        away_points: int = row["away_points"] if pd.notna(row["away_points"]) else None
-        walkover: bool = row["walkover"] if pd.notna(row["walkover"]) else False
-        winner_id: int = row["winner_id"] if pd.notna(row["winner_id"]) else None
-        print("Adding result for match_id:", match_id)
-        add_result(
-            session=session,
-            match_id=match_id,
-            home_goals=home_goals,
-            home_points=home_points,
-            away_goals=away_goals,
-            away_points=away_points,
-            walkover=walkover,
-            winner_id=winner_id,
-        )
-
-
-def generate_league_page_html(session, division_id):
-    """Generates HTML for a league table."""
-
-    # Start of HTML
-    html = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>League Table, Results, and Fixtures</title>
-    <style>
-        /* CSS styles */
-        body {
-            font-family: sans-serif;
-        }
-        .h2 {
-        font-family: "IBM Plex Sans", sans-serif;
-        font-size: 1.5rem;
-        font-weight: 600;
-        color: rgba(0, 102, 0, 1);
-        letter-spacing: 0;
-        line-height: 2rem;
-        margin-top: 20px;
-    }
-    .container {
-        grid-template-columns: 1fr; /* Single column for all screen sizes */
-        grid-gap: 20px; /* Gap between rows */
-    }
-
-    .table-row {
-        grid-column: 1;
-        grid-row: 1;
-    }
-
-    .fixtures-results-container { /* Styles for smaller screens */
-        display: grid;
-        grid-template-columns: 1fr; /* Single column */
-        grid-template-rows: auto auto; /* Two rows for Results and Fixtures */
-        grid-gap: 20px; /* Gap between rows */
-        grid-column: 1;
-        grid-row: 2;
-    }
-
-    .results-column {
-        grid-column: 1;
-        grid-row: 1;
-    }
-
-    .fixtures-column {
-        grid-column: 1;
-        grid-row: 2;
-    }
-
-    @media (min-width: 768px) { /* Example breakpoint - adjust as needed */
-        .fixtures-results-container {
-            grid-template-columns: 1fr 1fr; /* Two columns for Results and Fixtures */
-            grid-template-rows: auto; /* Single row */
-        }
-
-        .results-column {
-            grid-column: 1;
-            grid-row: 1;
-        }
-
-        .fixtures-column {
-            grid-column: 2;
-            grid-row: 1;
-        }
-    }
-    .results-container, .fixtures-container, .group-table-container {
-        display: grid; /* Ensure grid layout within containers */
-    }
-
-    .group-table { /* Apply grid display to the container */
-        display: grid;
-    }
-
-
-    .group-table .grid-row div {
-        padding-top: 7px;
-        padding-bottom: 9px;
-    }
-    .group-table .grid-row div.team {
-        padding-left: 20px;
-    }
-    .group-table .D, .group-table .GA, .group-table .GF, .group-table .L, .group-table .P, .group-table .PA, .group-table .PF, .group-table .W, .group-table .diff, .group-table .points, .group-table .rank {
-        text-align: center;
-        font-weight: 600;
-    }
-
-    .group-table .grid-row {
-        display: grid;
-        grid-template-columns: 1fr 6fr 1fr 1fr 1fr 1fr 1fr 1fr 1fr 1fr 1fr 1fr;
-        color: #000000;
-        font-family: "IBM Plex Sans", sans-serif;
-        font-size: 1rem;
-        letter-spacing: 0;
-        line-height: 1.25rem;
-    }
-    .group-table .grid-row.odd {
-        background-color: white;
-    }
-    .group-table .grid-row.even {
-        background-color: rgba(0, 102, 0, 0.1);
-    }
-    .group-table .grid-row.head {
-        display: grid;
-        color: white;
-        background-color: rgba(0, 102, 0, 1);
-        font-family: "IBM Plex Sans", sans-serif;
-        font-size: 1rem;
-        font-weight: 600;
-        letter-spacing: 0;
-        line-height: 1.25rem;
-        text-align: left;
-        height: 36px;
-        border-spacing: 0;
-        text-transform: capitalize;
-    }
-    .group-table .rank {
-      grid-column: 1;
-      grid-row: 1;
-    }
-    .group-table .team {
-      grid-column: 2;
-      grid-row: 1;
-    }
-    .group-table .P {
-      grid-column: 3;
-      grid-row: 1;
-    }
-    .group-table .W {
-      grid-column: 4;
-      grid-row: 1;
-    }
-    .group-table .D {
-      grid-column: 5;
-      grid-row: 1;
-    }
-    .group-table .L {
-      grid-column: 6;
-      grid-row: 1;
-    }
-
-    .group-table .GF {
-      grid-column: 7;
-      grid-row: 1;
-    }
-    .group-table .PF {
-      grid-column: 8;
-      grid-row: 1;
-    }
-    .group-table .GA {
-      grid-column: 9;
-      grid-row: 1;
-    }
-    .group-table .PA {
-      grid-column: 10;
-      grid-row: 1;
-    }
-
-    .group-table .diff {
-      grid-column: 11;
-      grid-row: 1;
-    }
-    .group-table .points {
-      grid-column: 12;
-      grid-row: 1;
-    }
-
-    td p {
-      text-align: center;
-    }
-
-    td h3 {
-      text-align: center;
-    }
-        /* Hide GF, PF, GA, PA on smaller screens */
-    @media (max-width: 600px) { /* Adjust breakpoint as needed */
-        .group-table .GF,
-        .group-table .PF,
-        .group-table .GA,
-        .group-table .PA {
-            display: none;
-        }
-
-        /* Adjust grid template columns for smaller screens */
-        .group-table .grid-row {
-            grid-template-columns: 1fr 6fr 1fr 1fr 1fr 1fr 1fr 1fr; /* Reduced number of columns */
-        }
-
-        .group-table .rank {
-          grid-column: 1;
-          grid-row: 1;
-        }
-        .group-table .team {
-          grid-column: 2;
-          grid-row: 1;
-        }
-        .group-table .P {
-          grid-column: 3;
-          grid-row: 1;
-        }
-        .group-table .W {
-          grid-column: 4;
-          grid-row: 1;
-        }
-        .group-table .D {
-          grid-column: 5;
-          grid-row: 1;
-        }
-        .group-table .L {
-          grid-column: 6;
-          grid-row: 1;
-        }
-
-        .group-table .diff {
-          grid-column: 7;
-          grid-row: 1;
-        }
-        .group-table .points {
-          grid-column: 8;
-          grid-row: 1;
-        }
-    }
-
-    .fixtures-container {
-        background-color: #EEECEC;
-        margin-top: 20px; /* top padding */
-    }
-
-    .fixtures-container .grid-row {
-        display: grid;
-        grid-template-columns: 5fr 1fr 5fr;
-        grid-template-areas: "home_fix vs away_fix";
-        color: #000000;
-        font-family: "IBM Plex Sans", sans-serif;
-        font-size: 1rem;
-        letter-spacing: 0;
-        line-height: 1rem;
-        padding-top: 7px; /* top padding */
-    }
-
-    .fixtures-container .grid-row.head {
-        color: white;
-        background-color: rgba(0, 102, 0, 1);
-        font-family: "IBM Plex Sans", sans-serif;
-        font-size: 1rem;
-        font-weight: 600;
-        letter-spacing: 0;
-        line-height: 1.25rem;
-        /* Vertically center and add left padding */
-        display: flex;
-        align-items: center; /* Vertical centering */
-        padding-left: 20px; /* Left padding */
-        height: 36px;
-        padding-top: 0; /* top padding */
-        border-spacing: 0;
-        text-transform: capitalize;
-    }
-
-    .fixtures-container h3.date { /* Target the date heading specifically */
-        margin: 0; /* Remove default margins */
-    }
-
-    .fixtures-container .H {
-        grid-area: home_fix;
-        padding-left: 20px;
-        text-align: left;
-        font-weight: 500;
-    }
-    .fixtures-container .A {
-        grid-area: away_fix;
-        padding-right: 20px;
-        text-align: right;
-        font-weight: 500;
-    }
-    .fixtures-container .vs {
-        grid-area: vs;
-        text-align: center;
-        font-weight: 400;
-    }
-
-        /* Style the footer row */
-    .fixtures-container .grid-row.footer {
-        display: grid;
-        grid-template-columns: 1fr;
-        padding-bottom: 7px;
-    }
-
-    .fixtures-container .footer-text {
-        grid-column: 1;
-        margin: 0; /* Remove default margins */
-        font-family: "IBM Plex Sans", sans-serif;
-        letter-spacing: 0;
-        line-height: 0.8rem;
-        text-align: center; /* Center the content */
-        font-size: 0.8rem; /* Smaller font size */
-        color: #444444; /* Lighter text color */
-        padding-bottom: 5px;
-    }
-    .fixtures-container > .grid-row > div { /* Select direct div children of grid-row */
-        margin: 0; /* Remove any default margins */
-    }
-
-    .fixtures-container > .grid-row > div > p { /* Select the <p> within the divs */
-        margin: 0; /* Remove default margins from the <p> */
-    }
-
-    .results-container {
-        background-color: #EEECEC;
-        margin-top: 20px; /* top padding */
-    }
-
-    .results-container h3.date { /* Target the date heading specifically */
-        margin: 0; /* Remove default margins */
-    }
-
-    .results-container .grid-row {
-        display: grid;
-        grid-template-columns: 6fr 2fr 2fr 6fr;
-        grid-template-areas: "r-home hs as r-away";
-        color: #000000;
-        font-family: "IBM Plex Sans", sans-serif;
-        font-size: 1rem;
-        letter-spacing: 0;
-        padding-top: 7px; /* top padding */
-        line-height: 1rem;
-    }
-
-    .results-container .grid-row.head {
-        color: white;
-        background-color: rgba(0, 102, 0, 1);
-        font-family: "IBM Plex Sans", sans-serif;
-        font-size: 1rem;
-        font-weight: 600;
-        letter-spacing: 0;
-        line-height: 1.25rem;
-        /* Vertically center and add left padding */
-        display: flex;
-        align-items: center; /* Vertical centering */
-        padding-left: 20px; /* Left padding */
-        height: 36px;
-        padding-top: 0; /* top padding */
-        border-spacing: 0;
-        text-transform: capitalize;
-    }
-
-    .results-container .H {
-        grid-area: r-home;
-        padding-left: 20px;
-        text-align: left;
-        font-weight: 500;
-    }
-    .results-container .HS {
-        grid-area: hs;
-        padding-right: 20px;
-        text-align: center;
-        font-weight: 400;
-    }
-    .results-container .AS {
-        grid-area: as;
-        padding-left: 20px;
-        text-align: center;
-        font-weight: 400;
-    }
-
-    .results-container .A {
-        grid-area: r-away;
-        padding-right: 20px;
-        text-align: right;
-        font-weight: 500;
-    }
-
-
-        /* Style the footer row */
-    .results-container .grid-row.footer {
-        display: grid;
-        grid-template-columns: 1fr;
-        padding-bottom: 7px;
-    }
-
-    .results-container .footer-text {
-        grid-column: 1;
-        margin: 0; /* Remove default margins */
-        font-family: "IBM Plex Sans", sans-serif;
-        letter-spacing: 0;
-        line-height: 0.8rem;
-        text-align: center; /* Center the content */
-        font-size: 0.8rem; /* Smaller font size */
-        color: #444444; /* Lighter text color */
-        padding-bottom: 5px;
-    }
-    .results-container > .grid-row > div { /* Select direct div children of grid-row */
-        margin: 0; /* Remove any default margins */
-    }
-
-    .results-container > .grid-row > div > p { /* Select the <p> within the divs */
-        margin: 0; /* Remove default margins from the <p> */
-    }
-
-</style>
-</head>
-<body>
-  <div class="container">
-    <div class="group-table-container">
-    """
-
-    groups = session.query(Group).filter_by(division_id=division_id).all()
-
-    for group in groups:
-
-        if group.name == "(single group)":
-            table_title = f"{group.division.name}"
-        else:
-            table_title = f"{group.name}"
-
-        html += f"""
-
-      <div class="group-table">
-        <div class="grid-row head">
-          <div class="rank  "></div>
-          <div class="team  ">{table_title}</div>
-          <div class="P  ">P</div>
-          <div class="W  ">W</div>
-          <div class="D  ">D</div>
-          <div class="L  ">L</div>
-          <div class="GF  ">GF</div>
-          <div class="PF  ">PF</div>
-          <div class="GA  ">GA</div>
-          <div class="PA  ">PA</div>
-          <div class="diff  ">+/-</div>
-          <div class="points  ">Pts</div>
-        </div>
-        """
-
-        teams = session.query(Team).filter_by(group_id=group.id).all()
-        sorted_teams = sorted(teams, key=lambda team: team.league_rank)
-        for team in sorted_teams:
-            html += f"""
-        <div class="grid-row {'even' if team.league_rank % 2 == 0 else 'odd'}">
-          <div class="rank">{team.league_rank}</div>
-          <div class="team">{team.name}</div>
-          <div class="P">{team.played}</div>
-          <div class="W">{team.won}</div>
-          <div class="D">{team.drawn}</div>
-          <div class="L">{team.lost}</div>
-          <div class="GF">{team.goals_for}</div>
-          <div class="PF">{team.points_for}</div>
-          <div class="GA">{team.goals_against}</div>
-          <div class="PA">{team.points_against}</div>
-          <div class="diff">{team.scoring_difference_x_wo}</div>
-          <div class="points">{team.league_points}</div>
-        </div>
-            """
-
-        # close group-table
-        html += """
-      </div>
-        """
-
-    # close group-table-container
-    html += """
-    </div>
-    """
-
-    # add fixtures-results-container
-    html += """
-    <div class="fixtures-results-container">
-    """
-
-    # add results container
-    html += """
-      <div class="results-column">
-        <div class="h2">Results</div>
-    """
-
-    results = (
-        session.query(Match)
-        .filter(Match.division_id == division_id, Match.date <= date.today())
-        .all()
-    )
-    unique_dates = sorted(list({result.date for result in results}), reverse=True)
-
-    for match_date in unique_dates:  # Iterate through unique dates and add date heading
-        html += f"""
-        <div class="results-container">
-          <div class="grid-row head">
-            <h3 class="date">{match_date.strftime('%A %d %B %Y')}</h3>
-          </div>
-    """
-        matches_on_date = [
-            result for result in results if result.date == match_date
-        ]  # Filter matches for current date
-        for match in matches_on_date:
-            if (
-                match.winner_id is None
-                and match.home_goals is None
-                and match.away_goals is None
-                and match.home_points is None
-                and match.away_points is None
-            ):
-                continue
-            home_team_name = (
-                f"<strong>{match.home_team.name}</strong>"
-                if (match.winner_id == match.home_team_id)
-                else match.home_team.name
-            )
-            away_team_name = (
-                f"<strong>{match.away_team.name}</strong>"
-                if (match.winner_id == match.away_team_id)
-                else match.away_team.name
-            )
-            if match.walkover:
-                home_score = "W/O" if (match.winner_id == match.home_team_id) else "X"
-                away_score = "W/O" if (match.winner_id == match.away_team_id) else "X"
-            else:
-                home_score = f"{match.home_goals}-{match.home_points:02}"
-                away_score = f"{match.away_goals}-{match.away_points:02}"
-
-            html += f"""
-          <div class="grid-row">
-            <div class="H">
-              <p class="team-name team-home ">{home_team_name}</p>
-            </div>
-            <div class="HS">
-              <p class="match-main-info">{home_score}</p>
-            </div>
-            <div class="AS">
-              <p class="match-main-info">{away_score}</p>
-            </div>
-            <div class="A">
-              <p class="team-name team-away">{away_team_name}</p>
-            </div>
-          </div>
-                """
-            # Add footer row for each match
-            if match.referee:  # Check if referee is available
-                html += f"""
-          <div class="grid-row footer">
-            <p class="footer-text">Referee: {match.referee.name} ({match.referee.club.name})</p>
-          </div>
-                """
-
-        # Close results-container
-        html += """
-        </div>
-
-        """
-
-    # Close results-column
-    html += """
-      </div>
-      """
-
-    # add fixtures container
-    html += """
-      <div class="fixtures-column">
-        <div class="h2">Fixtures</div>
-        """
-
-    fixtures = (
-        session.query(Match)
-        .filter(
-            Match.division_id == division_id,
-            Match.stage == "group",
-            Match.date > date.today(),
-        )
-        .all()
-    )
-    fixture_dates = sorted(list({fixture.date for fixture in fixtures}))
-
-    for match_date in fixture_dates:  # Iterate through unique dates
-        html += f"""
-        <div class="fixtures-container">
-          <div class="grid-row head">
-            <h3 class="date">{match_date.strftime('%A %d %B %Y')}</h3>
-          </div>
-    """  # Add date heading
-        matches_on_date = [
-            fixture for fixture in fixtures if fixture.date == match_date
-        ]  # Filter matches for current date
-        for match in matches_on_date:
-            html += f"""
-          <div class="grid-row">
-            <div class="H">
-              <p class="team-name team-home ">{match.home_team.name}</p>
-            </div>
-            <div class="vs"><p>v</p></div>
-            <div class="A">
-              <p class="team-name team-away">{match.away_team.name}</p>
-            </div>
-          </div>
-          <div class="grid-row footer">
-            <p class="footer-text">Throw-in: {match.time.strftime('%H:%M')}, {match.venue.name}
-                """
-            # Add footer row for each match
-            if match.referee:  # Check if referee is available
-                html += f"""(Referee: {match.referee.name})
-                """
-            html += """
-            </p>
-          </div>
-        """
-
-        # Close fixtures-container
-        html += """
-        </div>
-                """
-
-    # Close fixtures-container, fixtures-results-container, container, body, html
-    html += """
-      </div>
-    </div>
-  </div>
-</body>
-</html>
-            """
-
-    if not os.path.exists("outputs"):
-        os.makedirs("outputs")
-    current_div = session.query(Division).filter_by(id=division_id).first()
-    fname = f"outputs/league_page_{current_div.name}.html"
-    with open(fname, "w") as file:
-        file.write(html)
-
-
-@with_session
-def generate_div_page(session, division_id):
-    """Generates HTML for a league table."""
-    generate_league_page_html(session, division_id)
-
-
-@with_session
-def generate_all_pages(session):
-    """Generates HTML for all league tables."""
-    divisions = session.query(Division).all()
-    for division in divisions:
-        generate_league_page_html(session, division.id)
-
-
-@with_session
-def update_match_referee(session, match_id, referee_id):
-    """Updates the referee for a match."""
-    update_referee(session, match_id, referee_id)
-
-
-@with_session
-def update_match_date(session, match_id, match_date):
-    """Updates the date for a match."""
-    update_date(session, match_id, match_date.date())
-
-
-@with_session
-def update_match_time(session, match_id, match_time):
-    """Updates the date for a match."""
-    update_time(session, match_id, match_time.time())
-
-
-@with_session
-def update_match_datetime(session, match_id, match_datetime):
-    """Updates the date for a match."""
-    update_date(session, match_id, match_datetime.date())
-    update_time(session, match_id, match_datetime.time())
-
-
-@with_session
-def update_match_venue(session, match_id, venue_id):
-    """Updates the venue for a match."""
-    update_venue(session, match_id, venue_id)
-
-
-def add_fixtures_to_image(draw, font, fixtures, y_position):
-    """Helper function to add fixtures to the image."""
-
-    for match in fixtures:
-        time_str = match.time.strftime("%H:%M")
-        home_team = match.home_team.name
-        away_team = match.away_team.name
-        venue_referee = f"{match.venue.name}. Referee: {match.referee.name}"
-
-        # Add fixture details to image, with formatting and background colors
-        draw.text((50, y_position), time_str, font=font, fill="black")
-        draw.text(
-            (200, y_position),
-            home_team,
-            font=font,
-            fill="black",
-            background="rgba(0, 102, 0, 0.5)",
-        )  # Semi-transparent green
-        draw.text(
-            (540, y_position),
-            "v",
-            font=font,
-            fill="black",
-            background="rgba(255, 255, 255, 0.5)",
-        )  # Semi-transparent white
-        draw.text(
-            (800, y_position),
-            away_team,
-            font=font,
-            fill="black",
-            background="rgba(0, 102, 0, 0.5)",
-        )  # Semi-transparent green
-        y_position += 40  # Increment y-position for next row
-        draw.text((50, y_position), venue_referee, font=font, fill="black")
-        y_position += 60  # Increment y-position for next fixture
-
-    return y_position
-
-
-def add_results_to_image(draw, font, results, y_position):
-    """Helper function to add results to the image."""
-
-    for match in results:
-        time_str = match.time.strftime("%H:%M")
-        home_team = match.home_team.name
-        away_team = match.away_team.name
-        home_score = f"{match.home_goals}-{match.home_points:02}"
-        away_score = f"{match.away_goals}-{match.away_points:02}"
-        venue_referee = f"{match.venue.name}. Referee: {match.referee.name}"
-
-        # Add result details to image, with formatting and background colors
-        draw.text((50, y_position), time_str, font=font, fill="black")
-        draw.text(
-            (200, y_position),
-            home_team,
-            font=font,
-            fill="black",
-            background="rgba(0, 102, 0, 0.5)",
-        )  # Semi-transparent green
-        draw.text(
-            (540, y_position),
-            home_score,
-            font=font,
-            fill="black",
-            background="rgba(255, 255, 255, 0.5)",
-        )  # Semi-transparent white
-        draw.text(
-            (800, y_position),
-            away_score,
-            font=font,
-            fill="black",
-            background="rgba(0, 102, 0, 0.5)",
-        )  # Semi-transparent green
-        draw.text(
-            (900, y_position),
-            away_team,
-            font=font,
-            fill="black",
-            background="rgba(255, 255, 255, 0.5)",
-        )  # Semi-transparent white
-        y_position += 40  # Increment y-position for next row
-        draw.text((50, y_position), venue_referee, font=font, fill="black")
-        y_position += 60  # Increment y-position for next result
-
-    return y_position
-
-
-@with_session
-def instagram_division_results(session, division_id, start_date, days=0):
-    """Generates Instagram image with results and tables for a division on a particular date."""
-
-    division = session.query(Division).filter_by(id=division_id).first()
-    groups = session.query(Group).filter_by(division_id=division_id).all()
-
-    # Create a new image with the specified dimensions and background
-    image = Image.new("RGB", (1080, 1350), color="white")
-    bg_image = Image.open("data/fix_bg.png")  # Open background image
-    image.paste(bg_image, (0, 0))  # Paste background image
-
-    draw = ImageDraw.Draw(image, "RGBA")
-    font_title = ImageFont.truetype("data/klima-bold-web.ttf", 60)  # Load fonts
-    font_subtitle = ImageFont.truetype("data/klima-medium-italic-web.ttf", 40)
-    font_section = ImageFont.truetype("data/klima-medium-web.ttf", 30)
-    font_name = ImageFont.truetype("data/klima-regular-web.ttf", 30)
-    font_stats = ImageFont.truetype("data/klima-light-web.ttf", 30)
-
-    # initial coordinates
-    x1 = 50
-    x2 = 1030
-    y1 = 100  # 180
-    x_rank = 70
-    x_name = 140
-    x_logo = 95
-    x_g = 60
-    x_p = 600
-    x_w = 640
-    x_d = 680
-    x_l = 720
-    x_f = 785
-    x_a = 875
-    x_diff = 950
-    x_pts = 1005
-    x_home_l = 440
-    x_home_m = 485
-    x_home_r = 530
-    x_away_l = 550
-    x_away_m = 595
-    x_away_r = 640
-    x_home_name = 100
-    x_away_name = 980
-    x_home_logo = 60
-    x_away_logo = 990
-
-    # define background colours
-    table_head_bg = "#ffffffbf"  # "rgba(255, 255, 255, 0.75)"
-    row_bg_odd = "#2d8c3380"  # rgba(45, 140, 51, 0.5)"
-    row_bg_even = "#ffffff33"  # "rgba(255, 255, 255, 0.2)"
-    result_bg = "#ffffff80"  # "rgba(255, 255, 255, 0.5)"
-
-    # Add uppercase division name as title
-
-    if division.competition_id < 3:
-        title = f"{division.competition.name.upper()} {division.name.upper()}"
-    else:
-        title = division.name.upper()
-    draw.text((540, y1), title, font=font_title, fill="white", anchor="ms")
-    y1 += 20
-
-    # Add league tables
-
-    for group in groups:
-        y2 = y1 + 40
-
-        # Header row
-        y3 = y1 + 31
-
-        draw.rectangle([x1, y1, x2, y2], fill=table_head_bg)
-        draw.text(
-            (x_g, y3),
-            group.name if len(groups) > 1 else division.name,
-            font=font_section,
-            fill="black",
-            anchor="ls",
-        )
-        draw.text((x_p, y3), "P", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_w, y3), "W", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_d, y3), "D", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_l, y3), "L", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_f, y3), "F", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_a, y3), "A", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_diff, y3), "+/-", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_pts, y3), "Pts", font=font_stats, fill="black", anchor="ms")
-
-        y1 = y2
-
-        teams = session.query(Team).filter_by(group_id=group.id).all()
-        sorted_teams = sorted(teams, key=lambda team: team.league_rank)
-
-        for team in sorted_teams:
-            y2 = y1 + 40
-            y3 = y1 + 31
-            draw.rectangle(
-                [x1, y1, x2, y2],
-                fill=(row_bg_even if team.league_rank % 2 == 0 else row_bg_odd),
-            )
-            draw.text(
-                (x_rank, y3),
-                str(team.league_rank),
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            # Draw team logo
-            try:
-                logo = Image.open(f"data/logos/logo30_{team.clubs[0].name}.png")
-                image.paste(logo, (x_logo, y1 + 5))
-            finally:
-                pass
-            draw.text(
-                (x_name, y3), team.name, font=font_name, fill="white", anchor="ls"
-            )
-            draw.text(
-                (x_p, y3), str(team.played), font=font_stats, fill="white", anchor="ms"
-            )
-            draw.text(
-                (x_w, y3), str(team.won), font=font_stats, fill="white", anchor="ms"
-            )
-            draw.text(
-                (x_d, y3), str(team.drawn), font=font_stats, fill="white", anchor="ms"
-            )
-            draw.text(
-                (x_l, y3), str(team.lost), font=font_stats, fill="white", anchor="ms"
-            )
-            draw.text(
-                (x_f, y3),
-                f"{team.goals_for}-{team.points_for}",
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            draw.text(
-                (x_a, y3),
-                f"{team.goals_against}-{team.points_against}",
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            draw.text(
-                (x_diff, y3),
-                str(team.scoring_difference_x_wo),
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            draw.text(
-                (x_pts, y3),
-                str(team.league_points),
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            y1 = y2
-
-        y1 += 20
-
-    # Define date range
-    date_range = [start_date]
-    if days > 0:
-        date_range.extend(start_date + timedelta(days=i) for i in range(1, days + 1))
-    for results_date in date_range:
-        if (
-            results := session.query(Match)
-            .filter_by(division_id=division_id, date=results_date)
-            .filter(
-                (
-                    (Match.home_goals >= 0)
-                    & (Match.away_goals >= 0)
-                    & (Match.home_points >= 0)
-                    & (Match.away_points >= 0)
-                )
-                | Match.walkover
-            )
-            .all()
-        ):
-            # Add date as subtitle - format day-name dd month yyyy
-            date_str = results_date.strftime("%A %d %B %Y")
-            draw.text(
-                (540, y1 + 35),
-                date_str,
-                font=font_subtitle,
-                fill="lightgray",
-                anchor="ms",
-            )
-            y1 += 50
-
-            # Add results
-
-            for result in results:
-                y2 = y1 + 50
-                y3 = y1 + 36
-
-                match result.home_team.name:
-                    case "Templeglantine/Knockaderry":
-                        home_name = "Templegl / Knockaderry"
-                    case "Croagh-Kilfinny / Crecora":
-                        home_name = "Croagh-Kilf / Crecora"
-                    case _:
-                        home_name = result.home_team.name
-
-                match result.away_team.name:
-                    case "Templeglantine/Knockaderry":
-                        away_name = "Templegl / Knockaderry"
-                    case "Croagh-Kilfinny / Crecora":
-                        away_name = "Croagh-Kilf / Crecora"
-                    case _:
-                        away_name = result.away_team.name
-
-                draw.rectangle([x1, y1, x2, y2], fill=result_bg)
-                draw.rectangle([x_home_l, y1, x_home_r, y2], fill="white")
-                draw.rectangle([x_away_l, y1, x_away_r, y2], fill="white")
-                # home logo here
-                try:
-                    logo = Image.open(
-                        f"data/logos/logo30_{result.home_team.clubs[0].name}.png"
-                    )
-                    image.paste(logo, (x_home_logo, y1 + 10))
-                finally:
-                    pass
-
-                if result.walkover:
-                    if result.winner_id == result.home_team_id:
-                        home_score = "W/O"
-                        away_score = "X"
-                    elif result.winner_id == result.away_team_id:
-                        home_score = "X"
-                        away_score = "W/O"
-                else:
-                    home_score = f"{result.home_goals}-{result.home_points:02}"
-                    away_score = f"{result.away_goals}-{result.away_points:02}"
-
-                draw.text(
-                    (x_home_name, y3),
-                    home_name,
-                    font=font_name,
-                    fill="black",
-                    anchor="ls",
-                )
-                draw.text(
-                    (x_home_m, y3),
-                    home_score,
-                    font=font_name,
-                    fill="black",
-                    anchor="ms",
-                )
-                draw.text(
-                    (x_away_m, y3),
-                    away_score,
-                    font=font_name,
-                    fill="black",
-                    anchor="ms",
-                )
-                draw.text(
-                    (x_away_name, y3),
-                    away_name,
-                    fill="black",
-                    anchor="rs",
-                    font=font_name,
-                )
-                # away logo here
-                try:
-                    logo = Image.open(
-                        f"data/logos/logo30_{result.away_team.clubs[0].name}.png"
-                    )
-                    image.paste(logo, (x_away_logo, y1 + 10))
-                finally:
-                    pass
-
-                y1 = y2 + 20
-
-    image.save(f"outputs/results_{division.name}_{results_date.strftime('%Y%m%d')}.png")
-    image.save(f"outputs/results_{division.name}_{results_date.strftime('%Y%m%d')}.png")
-
-
-@with_session
-def instagram_division_fixtures(session, division_id, start_date, days=0):
-    """Generates Instagram image with fixtures for a division on a particular date range."""
-
-    division = session.query(Division).filter_by(id=division_id).first()
-    groups = session.query(Group).filter_by(division_id=division_id).all()
-
-    # Create a new image with the specified dimensions and background
-    image = Image.new("RGB", (1080, 1350), color="white")
-    bg_image = Image.open("data/fix_bg.png")  # Open background image
-    image.paste(bg_image, (0, 0))  # Paste background image
-
-    draw = ImageDraw.Draw(image, "RGBA")
-    font_title = ImageFont.truetype("data/klima-bold-web.ttf", 60)  # Load fonts
-    font_subtitle = ImageFont.truetype("data/klima-medium-italic-web.ttf", 40)
-    font_section = ImageFont.truetype("data/klima-medium-web.ttf", 30)
-    font_name = ImageFont.truetype("data/klima-regular-web.ttf", 30)
-    font_stats = ImageFont.truetype("data/klima-light-web.ttf", 30)
-    font_info = ImageFont.truetype("data/klima-light-italic-web.ttf", 20)
-
-    # initial coordinates
-    x1 = 50
-    x2 = 1030
-    y1 = 100
-    x_rank = 70
-    x_name = 140
-    x_logo = 95
-    x_g = 60
-    x_p = 600
-    x_w = 640
-    x_d = 680
-    x_l = 720
-    x_f = 785
-    x_a = 875
-    x_diff = 950
-    x_pts = 1005
-    x_fix_time = 60
-    x_home_logo = 150
-    x_home_name = 190
-    x_v = 585
-    x_away_name = 980
-    x_away_logo = 990
-
-    # define background colours
-    table_head_bg = "#ffffffbf"  # "rgba(255, 255, 255, 0.75)"
-    row_bg_odd = "#2d8c3380"  # rgba(45, 140, 51, 0.5)"
-    row_bg_even = "#ffffff33"  # "rgba(255, 255, 255, 0.2)"
-    result_bg = "#ffffff80"  # "rgba(255, 255, 255, 0.5)"
-
-    # Add uppercase division name as title
-    if division.competition_id < 3:
-        title = f"{division.competition.name.upper()} {division.name.upper()}"
-    else:
-        title = division.name.upper()
-    draw.text((540, y1), title, font=font_title, fill="white", anchor="ms")
-    y1 += 30
-
-    # Add league tables
-
-    for group in groups:
-        y2 = y1 + 40
-
-        # Header row
-        y3 = y1 + 31
-
-        draw.rectangle([x1, y1, x2, y2], fill=table_head_bg)
-        draw.text(
-            (x_g, y3),
-            group.name if len(groups) > 1 else division.name,
-            font=font_section,
-            fill="black",
-            anchor="ls",
-        )
-        draw.text((x_p, y3), "P", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_w, y3), "W", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_d, y3), "D", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_l, y3), "L", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_f, y3), "F", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_a, y3), "A", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_diff, y3), "+/-", font=font_stats, fill="black", anchor="ms")
-        draw.text((x_pts, y3), "Pts", font=font_stats, fill="black", anchor="ms")
-
-        y1 = y2
-
-        teams = session.query(Team).filter_by(group_id=group.id).all()
-        sorted_teams = sorted(teams, key=lambda team: team.league_rank)
-
-        for team in sorted_teams:
-            y2 = y1 + 40
-            y3 = y1 + 31
-            draw.rectangle(
-                [x1, y1, x2, y2],
-                fill=(row_bg_even if team.league_rank % 2 == 0 else row_bg_odd),
-            )
-            draw.text(
-                (x_rank, y3),
-                str(team.league_rank),
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            # Draw team logo
-            try:
-                logo = Image.open(f"data/logos/logo30_{team.clubs[0].name}.png")
-                image.paste(logo, (x_logo, y1 + 5))
-            finally:
-                pass
-            draw.text(
-                (x_name, y3), team.name, font=font_name, fill="white", anchor="ls"
-            )
-            draw.text(
-                (x_p, y3), str(team.played), font=font_stats, fill="white", anchor="ms"
-            )
-            draw.text(
-                (x_w, y3), str(team.won), font=font_stats, fill="white", anchor="ms"
-            )
-            draw.text(
-                (x_d, y3), str(team.drawn), font=font_stats, fill="white", anchor="ms"
-            )
-            draw.text(
-                (x_l, y3), str(team.lost), font=font_stats, fill="white", anchor="ms"
-            )
-            draw.text(
-                (x_f, y3),
-                f"{team.goals_for}-{team.points_for}",
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            draw.text(
-                (x_a, y3),
-                f"{team.goals_against}-{team.points_against}",
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            draw.text(
-                (x_diff, y3),
-                str(team.scoring_difference_x_wo),
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            draw.text(
-                (x_pts, y3),
-                str(team.league_points),
-                font=font_stats,
-                fill="white",
-                anchor="ms",
-            )
-            y1 = y2
-
-        y1 += 20
-
-    # Define date range
-    date_range = [start_date]
-    if days > 0:
-        date_range.extend(start_date + timedelta(days=i) for i in range(1, days + 1))
-
-    for fixtures_date in date_range:
-        if (
-            fixtures := session.query(Match)
-            .filter_by(division_id=division_id, date=fixtures_date)
-            .all()
-        ):
-            # Add date as subtitle - format day-name dd month yyyy
-            date_str = fixtures_date.strftime("%A %d %B %Y")
-            draw.text(
-                (540, y1 + 35),
-                date_str,
-                font=font_subtitle,
-                fill="lightgray",
-                anchor="ms",
-            )
-            y1 += 50
-
-            # Add fixtures
-
-            for fixture in fixtures:
-                y2 = y1 + 60
-                y3 = y1 + 31
-
-                match fixture.home_team.name:
-                    case "Templeglantine/Knockaderry":
-                        home_name = "Templeglan / Knockaderry"
-                    case _:
-                        home_name = fixture.home_team.name
-
-                match fixture.away_team.name:
-                    case "Templeglantine/Knockaderry":
-                        away_name = "Templeglan / Knockaderry"
-                    case _:
-                        away_name = fixture.away_team.name
-
-                draw.rectangle([x1, y1, x2, y2], fill=result_bg)
-
-                # home logo here
-                try:
-                    logo = Image.open(
-                        f"data/logos/logo30_{fixture.home_team.clubs[0].name}.png"
-                    )
-                    image.paste(logo, (x_home_logo, y1 + 5))
-                finally:
-                    pass
-
-                match_time = fixture.time.strftime("%H:%M")
-
-                draw.text(
-                    (x_fix_time, y3),
-                    match_time,
-                    font=font_name,
-                    fill="black",
-                    anchor="ls",
-                )
-                draw.text(
-                    (x_home_name, y3),
-                    home_name,
-                    font=font_name,
-                    fill="black",
-                    anchor="ls",
-                )
-                draw.text((x_v, y3), "v", font=font_name, fill="black", anchor="ms")
-                draw.text(
-                    (x_away_name, y3),
-                    away_name,
-                    fill="black",
-                    anchor="rs",
-                    font=font_name,
-                )
-                # away logo here
-                try:
-                    logo = Image.open(
-                        f"data/logos/logo30_{fixture.away_team.clubs[0].name}.png"
-                    )
-                    image.paste(logo, (x_away_logo, y1 + 5))
-                finally:
-                    pass
-
-                if fixture.referee:
-                    match_info = f"Venue: {fixture.venue.name} - Referee: {fixture.referee.name} ({fixture.referee.club.name})"
-                else:
-                    match_info = f"{fixture.venue.name}"
-                draw.text(
-                    (x_v, y3 + 22),
-                    match_info,
-                    font=font_info,
-                    fill="black",
-                    anchor="ms",
-                )
-
-                y1 = y2 + 10
-
-    image.save(
-        f"outputs/fixtures_{division.name}_{start_date.strftime('%A %d %B %Y')}.png"
-    )
-
-
-@with_session
-def update_ref_club(
-    session,
-    referee_id,
-    club_id,
-):
-    if ref := session.query(Referee).filter_by(id=referee_id).first():
-        ref.club_id = club_id
-
-
-@with_session
-def add_match_result(
-    session,
-    match_id,
-    home_goals=None,
-    home_points=None,
-    away_goals=None,
-    away_points=None,
-    walkover=False,
-    winner_id=None,
-):
-    add_result(
-        session,
-        match_id,
-        home_goals=home_goals,
-        home_points=home_points,
-        away_goals=away_goals,
-        away_points=away_points,
-        walkover=walkover,
-        winner_id=winner_id,
-    )
-
-
-@with_session
-def update_all_tables(session):
-    """Updates all league tables."""
-    groups = session.query(Group).all()
-    for group in groups:
-        update_league_ranks(session, group.id)
-
-
-@with_session
-def update_division_tables(
-    session,
-    division_id,
-):
-    groups = session.query(Group).filter_by(division_id=division_id).all()
-    for group in groups:
-        update_league_ranks(session, group.id)
-
-
-@with_session
-def update_stats(
-    session,
-    team_id,
-    P,
-    W,
-    D,
-    L,
-):
-    if team := session.query(Team).filter_by(id=team_id).first():
-        team.played = P
-        team.won = W
-        team.drawn = D
-        team.lost = L
-        update_league_ranks(session, team.group_id)
-
-
-@with_session
-def withdraw_team(session, team_id):
-    team = session.query(Team).filter_by(id=team_id).first()
-    for match in team.home_matches:
-        session.delete(match)
-    for match in team.away_matches:
-        session.delete(match)
-    team.fielded_all = False
-    team.played = 0
-    team.won = 0
-    team.drawn = 0
-    team.lost = 0
-    team.goals_for = 0
-    team.points_for = 0
-    team.goals_against = 0
-    team.points_against = 0
-    team.goals_for_x_wo = 0
-    team.points_for_x_wo = 0
-    team.goals_against_x_wo = 0
-    team.points_against_x_wo = 0
-    update_league_ranks(session, team.group_id)
-
-
-name = "County Competitions"
-__version__ = "0.1.0"
-__author__ = "Breandán Anraoi MacGabhann"
+import logging
+import os
+import threading
+from datetime import date, time
+from functools import wraps
+
+import pandas as pd
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from .assets import (  # noqa F401
+    LOGO_SIZES,
+    build_logo_atlas,
+    clear_asset_cache,
+    refresh_assets,
+)
+from .calendars import (  # noqa F401
+    calendar_feeds,
+    calendar_path,
+    feed_version,
+    render_calendar,
+    write_calendars,
+)
+from .consistency import (  # noqa F401
+    expected_standings,
+    find_discrepancies,
+    load_tables,
+    repair_standings,
+)
+from .create_competitions import (  # noqa F401
+    add_club,
+    add_competition,
+    add_criterion,
+    add_division,
+    add_group,
+    add_match,
+    add_player,
+    add_player_participation,
+    add_player_team_association,
+    add_referee,
+    add_team,
+    add_team_club_association,
+    add_venue,
+)
+from .create_schema import (  # noqa F401
+    Base,
+    Club,
+    Competition,
+    Division,
+    Group,
+    Match,
+    Player,
+    PlayerParticipation,
+    Referee,
+    Team,
+    Venue,
+    player_team_association,
+    team_club_association,
+)
+from .encoders import (  # noqa F401
+    ImageFormat,
+    as_image_format,
+    compare_formats,
+    encode_image,
+    parse_image_format,
+)
+from .exports import (  # noqa F401
+    division_document,
+    division_json_path,
+    team_documents,
+    team_json_path,
+    write_json_exports,
+)
+from .images import (  # noqa F401
+    IMAGE_KINDS,
+    existing_slides,
+    fixtures_image_path,
+    image_version,
+    render_division_fixtures,
+    render_division_results,
+    results_image_path,
+    shows_matches,
+    slide_path,
+    write_division_fixtures,
+    write_division_results,
+)
+from .jobs import (  # noqa F401
+    RegenerationQueue,
+    after_commit,
+    defer_dirty,
+    mark_dirty,
+    queue_metrics,
+    queue_running,
+    start_queue,
+    stop_queue,
+)
+from .manifest import Manifest  # noqa F401
+from .memprofile import (  # noqa F401
+    MemoryProfile,
+    memory_profiling,
+    phase,
+    start_memory_profiling,
+    stop_memory_profiling,
+)
+from .pages import (  # noqa F401
+    PAGE_TEMPLATE_VERSION,
+    league_page_path,
+    league_page_version,
+    render_league_page,
+    render_round_page,
+    round_page_path,
+    round_page_versions,
+    write_division_pages,
+    write_league_page,
+)
+from .plan import Plan, plan_changes  # noqa F401
+from .publish import precompress_enabled, publish, write_atomic  # noqa F401
+from .querycount import (  # noqa F401
+    QueryStats,
+    assert_query_budget,
+    count_queries,
+    query_budget,
+)
+from .render import default_workers, render_jobs  # noqa F401
+from .season import SeasonIndex, build_season_index  # noqa F401
+from .season_pages import (  # noqa F401
+    club_page_path,
+    referee_page_path,
+    render_club_page,
+    render_referee_page,
+    render_team_page,
+    season_page_versions,
+    team_page_path,
+    write_season_pages,
+)
+from .server import CountyServer  # noqa F401
+from .snapshots import (  # noqa F401
+    DivisionSnapshot,
+    load_division_snapshot,
+    load_division_snapshots,
+)
+from .social import (  # noqa F401
+    social_manifest_path,
+    week_windows,
+    write_social_manifest,
+)
+from .standings import (  # noqa F401
+    apply_result,
+    load_groups,
+    rank_group,
+    recompute_ranks,
+    result_from_row,
+)
+from .textfit import abbreviations, fit_text  # noqa F401
+from .tracing import (  # noqa F401
+    Tracer,
+    span,
+    start_tracing,
+    stop_tracing,
+    traced,
+    tracing,
+)
+from .update_matches import (  # noqa F401
+    add_result,
+    update_date,
+    update_date_time,
+    update_knockout_teams,
+    update_league_ranks,
+    update_player_participation,
+    update_referee,
+    update_time,
+    update_venue,
+)
+from .watch import InboxWatcher, read_results, run_watcher  # noqa F401
+
+# Held while building outputs that span divisions, such as season pages
+_SHARED_OUTPUTS = threading.Lock()
+
+# Global variable to store the engine
+engine = None
+Session = None
+
+
+def with_session(func):
+    """Decorator to manage SQLAlchemy sessions."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        session = Session()
+        try:
+            with span(func.__name__), phase(func.__name__):
+                result = func(session, *args, **kwargs)
+                session.commit()
+            after_commit(session)
+            return result
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            Session.remove()
+
+    return wrapper
+
+
+# add_club = with_session(add_club)
+# add_competition = with_session(add_competition)
+# add_division = with_session(add_division)
+# add_group = with_session(add_group)
+# add_match = with_session(add_match)
+# add_player_participation = with_session(add_player_participation)
+# add_player_team_association = with_session(add_player_team_association)
+# add_referee = with_session(add_referee)
+# add_team = with_session(add_team)
+# add_team_club_association = with_session(add_team_club_association)
+# add_venue = with_session(add_venue)
+
+
+def get_engine(db_url=None):
+    """Creates a database engine with the provided URL or from environment variables."""
+    if db_url is None:
+        db_url = os.environ.get("DATABASE_URL")
+    if db_url is None:
+        raise ValueError("DATABASE_URL environment variable not set.")
+    return create_engine(db_url)
+
+
+def get_session(db_url=None):
+    """Returns a session object."""
+
+    global engine  # Use global engine
+    global Session  # Use global Session
+    if engine is None:  # Create engine if it doesn't exist
+        engine = get_engine(db_url)
+    session_factory = sessionmaker(bind=engine)
+    Session = scoped_session(session_factory)
+
+    return Session
+
+
+def initialise(db_url=None):
+    """Creates the database schema."""
+    global engine  # Use global engine
+    global Session  # Use global Session
+    # Create the database engine
+    Session = get_session(db_url)
+    # Create the database tables if they do not exist
+    inspector = inspect(engine)
+    if not inspector.has_table("clubs"):  # Check for one of the tables
+        Base.metadata.create_all(engine)
+    return Session
+
+
+@with_session
+def add_clubs(session, clubs_df):
+    for idx, row in clubs_df.iterrows():
+        club_id: int = row["club_id"]
+        club_name: str = row["name"]
+        ainm: str | None = row["ainm"] if pd.notna(row["ainm"]) else None
+        add_club(session=session, club_id=club_id, name=club_name, ainm=ainm)
+
+
+@with_session
+def add_referees(session, referees_df):
+    for idx, row in referees_df.iterrows():
+        referee_id: int = row["referee_id"]
+        ref_name: str = row["name"]
+        club_id: int = row["club_id"]
+        add_referee(
+            session=session, referee_id=referee_id, name=ref_name, club_id=club_id
+        )
+
+
+@with_session
+def add_venues(session, venues_df):
+    for idx, row in venues_df.iterrows():
+        venue_id: int = row["venue_id"]
+        venue_name: str = row["name"]
+        club_id: int = row["club_id"]
+        address: str | None = row["address"] if pd.notna(row["address"]) else None
+        add_venue(
+            session=session,
+            venue_id=venue_id,
+            name=venue_name,
+            club_id=club_id,
+            address=address,
+        )
+
+
+@with_session
+def add_competitions(session, competitions_df):
+    for idx, row in competitions_df.iterrows():
+        competition_id: int = row["competition_id"]
+        competition_name: str = row["name"]
+        add_competition(
+            session=session, competition_id=competition_id, name=competition_name
+        )
+
+
+@with_session
+def add_divisions(session, divisions_df):
+    for idx, row in divisions_df.iterrows():
+        division_id: int = row["division_id"]
+        division_name: str = row["name"]
+        competition_id: int = row["competition_id"]
+        add_division(
+            session=session,
+            division_id=division_id,
+            name=division_name,
+            competition_id=competition_id,
+        )
+
+
+@with_session
+def add_groups(session, groups_df):
+    for idx, row in groups_df.iterrows():
+        group_id: int = row["group_id"]
+        group_name: str = row["name"]
+        competition_id: int = row["competition_id"]
+        division_id: int = row["division_id"]
+        add_group(
+            session=session,
+            group_id=group_id,
+            name=group_name,
+            competition_id=competition_id,
+            division_id=division_id,
+        )
+
+
+@with_session
+def add_criteria(session, criteria_df):
+    for idx, row in criteria_df.iterrows():
+        criteria_id: int = row["criteria_id"]
+        description: str = row["description"]
+        sql_query: str = row["sql_query"]
+        add_criterion(
+            session=session,
+            criteria_id=criteria_id,
+            description=description,
+            sql_query=sql_query,
+        )
+
+
+@with_session
+def add_teams(session, teams_df):
+    for idx, row in teams_df.iterrows():
+        team_id: int = row["team_id"]
+        team_name: str = row["name"]
+        competition_id: int = row["competition_id"]
+        division_id: int = row["division_id"]
+        group_id: int = row["group_id"]
+        club_id1: int = row["club_id1"]
+        club_id2: int | None = (
+            int(row["club_id2"]) if pd.notna(row["club_id2"]) else None
+        )
+        add_team(
+            session=session,
+            team_id=team_id,
+            name=team_name,
+            competition_id=competition_id,
+            division_id=division_id,
+            group_id=group_id,
+            club_id1=club_id1,
+            club_id2=club_id2,
+        )
+
+
+@with_session
+def add_matches(session, matches_df):
+    for idx, row in matches_df.iterrows():
+        match_id: int = row["match_id"]
+        home_team_id: int = (
+            row["home_team_id"] if pd.notna(row["home_team_id"]) else None
+        )
+        away_team_id: int = (
+            row["away_team_id"] if pd.notna(row["away_team_id"]) else None
+        )
+        venue_id: int = row["venue_id"] if pd.notna(row["venue_id"]) else None
+        competition_id: int = row["competition_id"]
+        division_id: int = row["division_id"]
+        stage: str = row["stage"]
+        group_round: str = row["group_round"]
+        match_no: int = row["match_no"]
+        group_id: int | None = row["group_id"] if pd.notna(row["group_id"]) else None
+        match_date: date | None = (
+            row["match_date"] if pd.notna(row["match_date"]) else None
+        )
+        match_time: time | None = (
+            row["match_time"] if pd.notna(row["match_time"]) else None
+        )
+        referee_id: int = row["referee_id"] if pd.notna(row["referee_id"]) else None
+        home_criteria_id: int | None = (
+            int(row["home_team_criteria_id"])
+            if pd.notna(row.get("home_team_criteria_id"))
+            else None
+        )
+        away_criteria_id: int | None = (
+            int(row["away_team_criteria_id"])
+            if pd.notna(row.get("away_team_criteria_id"))
+            else None
+        )
+
+        add_match(
+            session=session,
+            match_id=match_id,
+            home_team_id=home_team_id,
+            away_team_id=away_team_id,
+            venue_id=venue_id,
+            competition_id=competition_id,
+            division_id=division_id,
+            stage=stage,
+            group_round=group_round,
+            match_no=match_no,
+            group_id=group_id,
+            match_date=match_date,
+            match_time=match_time,
+            referee_id=referee_id,
+            home_team_criteria_id=home_criteria_id,
+            away_team_criteria_id=away_criteria_id,
+        )
+
+
+@with_session
+def add_new_results(session, new_results):
+    for idx, row in new_results.iterrows():
+        match_id: int = row["match_id"]
+        print("Adding result for match_id:", match_id)
+        add_result(session=session, match_id=match_id, **result_from_row(row))
+
+
+@with_session
+def apply_new_results(session, new_results):
+    """Adds the results of matches that have none yet, leaving the others alone.
+
+    Safe to run repeatedly over the same file: a match with a result already
+    is skipped, with a warning if the file now gives a different score. The
+    batch is applied in one transaction: each group is re-ranked once and
+    each division's knockout teams settled once, however many results.
+    Returns {division_id: set of match dates} for the results applied.
+    """
+    match_ids = [int(match_id) for match_id in new_results["match_id"]]
+    matches = {
+        match.id: match
+        for match in session.query(Match).filter(Match.id.in_(match_ids))
+    }
+    group_ids = {match.group_id for match in matches.values() if match.stage == "group"}
+    teams, group_matches = load_groups(session, group_ids)
+    teams_by_id = {team.id: team for group in teams.values() for team in group}
+    applied = {}
+    ranked = set()
+    for idx, row in new_results.iterrows():
+        result = result_from_row(row)
+        if (match := matches.get(int(row["match_id"]))) is None:
+            logging.warning(
+                "apply_new_results: No match found for id %s", row["match_id"]
+            )
+            continue
+        if match.walkover or match.home_goals is not None:
+            recorded = (
+                match.home_goals,
+                match.home_points,
+                match.away_goals,
+                match.away_points,
+            )
+            if not result["walkover"] and recorded != (
+                result["home_goals"],
+                result["home_points"],
+                result["away_goals"],
+                result["away_points"],
+            ):
+                logging.warning(
+                    "apply_new_results: match %s already has a result; "
+                    "correct it by hand",
+                    match.id,
+                )
+            continue
+        apply_result(match, teams_by_id, **result)
+        if match.stage == "group":
+            ranked.add(match.group_id)
+        applied.setdefault(match.division_id, set()).add(match.date)
+    for group_id in ranked:
+        rank_group(teams[group_id], group_matches[group_id])
+    for division_id in sorted(applied):
+        update_knockout_teams(session, division_id)
+    return applied
+
+
+@with_session
+def plan_results(session, new_results=None, amendments=None, image_format=None):
+    """Previews new results and fixture changes without committing anything.
+
+    new_results is shaped like data/new_results.csv; amendments has a match_id
+    column and any of match_date, match_time, venue_id and referee_id. Reports
+    the Team rows, ranks, knockout slots, pages, JSON and images that applying
+    them would change. Returns a Plan; plan.report() summarises it.
+    """
+    return plan_changes(session, new_results, amendments, image_format)
+
+
+@with_session
+def _knockout_fixture_dates(session, division_ids):
+    """{division_id: dates} of the divisions' knockout matches still to be played."""
+    fixture_dates = {}
+    for division_id, match_date in session.query(Match.division_id, Match.date).filter(
+        Match.division_id.in_(list(division_ids)),
+        Match.stage == "knockout",
+        Match.date.isnot(None),
+        Match.home_goals.is_(None),
+        Match.walkover.isnot(True),
+    ):
+        fixture_dates.setdefault(division_id, set()).add(match_date)
+    return fixture_dates
+
+
+def publish_results(applied, images=True, image_format=None, fixtures=None):
+    """Regenerates the outputs that new results change.
+
+    applied is what apply_new_results returns. Pages and calendar feeds are
+    rebuilt only where their data changed; JSON and results images are limited
+    to the divisions affected, with one image covering the dates of the new
+    results. Results can change who plays in knockout matches, so fixtures
+    images are redrawn for those still to come, as well as for the dates in
+    fixtures ({division_id: dates}, e.g. of amended matches). Returns the
+    paths written.
+    """
+    division_ids = sorted(applied)
+    written = generate_all_pages(division_ids=division_ids)
+    # Season pages and calendars span divisions; background jobs take turns so
+    # they are built once
+    with _SHARED_OUTPUTS:
+        written += generate_season_pages()
+        written += generate_calendars()
+    written += export_json(division_ids=division_ids)
+    dates = sorted({day for days in applied.values() for day in days if day})
+    if not images:
+        return written
+    if dates:
+        written += generate_all_images(
+            results_date=dates[0],
+            days=(dates[-1] - dates[0]).days,
+            division_ids=division_ids,
+            image_format=image_format,
+        )
+    divisions_by_date = {}
+    resulted = [division_id for division_id, days in applied.items() if days]
+    knockouts = _knockout_fixture_dates(resulted) if resulted else {}
+    for fixture_dates in (fixtures or {}, knockouts):
+        for division_id, days in fixture_dates.items():
+            for day in days:
+                divisions_by_date.setdefault(day, set()).add(division_id)
+    for day, fixture_divisions in sorted(divisions_by_date.items()):
+        written += generate_all_images(
+            fixtures_date=day,
+            division_ids=sorted(fixture_divisions),
+            image_format=image_format,
+        )
+    return written
+
+
+def process_results_files(paths, images=True, image_format=None):
+    """Applies the unseen results in the given CSV files and publishes them."""
+    if (new_results := read_results(paths)) is None:
+        return []
+    applied = apply_new_results(new_results)
+    if not applied:
+        return []
+    written = publish_results(applied, images, image_format)
+    logging.info(
+        "Applied results in %d divisions; wrote %d files", len(applied), len(written)
+    )
+    return written
+
+
+def watch_results(
+    path="data/new_results.csv",
+    interval=1.0,
+    debounce=2.0,
+    images=True,
+    image_format=None,
+):
+    """Applies new results as they arrive in a CSV file or directory of CSVs.
+
+    Bursts of saves are handled as one batch once the files have been quiet
+    for `debounce` seconds; only results not yet in the database are added,
+    then the affected pages, JSON and images are regenerated. Runs until Ctrl-C.
+    """
+    run_watcher(
+        InboxWatcher(path, debounce),
+        lambda paths: process_results_files(paths, images, image_format),
+        interval,
+    )
+
+
+@traced
+def generate_league_page_html(session, division_id):
+    """Generates HTML for a league table and its round archive pages."""
+    today = date.today()
+    snapshot = load_division_snapshot(session, division_id)
+    fnames = [league_page_path(snapshot.name), *round_page_versions(snapshot, today)]
+    return write_division_pages(snapshot, today, fnames)
+
+
+@with_session
+def generate_div_page(session, division_id):
+    """Generates HTML for a league table."""
+    return generate_league_page_html(session, division_id)
+
+
+@with_session
+def generate_all_pages(
+    session, force=False, workers=None, compress=None, division_ids=None
+):
+    """Generates HTML for all league tables whose data changed since the last run.
+
+    Each division page shows recent results and upcoming fixtures, with older
+    and later rounds on archive pages that are only rebuilt when their round
+    changes. Division data is fetched once and the pages are rendered across a
+    pool of `workers` processes (default: COUNTY_WORKERS or all cores). Pages
+    whose data is unchanged are left untouched. With compress (default:
+    COUNTY_PRECOMPRESS) pages also get .gz/.br siblings. division_ids limits
+    the run to some divisions. Returns the paths of the pages that were rebuilt.
+    """
+    today = date.today()
+    manifest = Manifest()
+    snapshots = load_division_snapshots(session, division_ids)
+    jobs = []
+    versions = {}
+    for snapshot in snapshots.values():
+        division_versions = {
+            league_page_path(snapshot.name): league_page_version(snapshot, today),
+            **round_page_versions(snapshot, today),
+        }
+        dirty = [
+            fname
+            for fname, version in division_versions.items()
+            if force or not manifest.is_current(fname, version, compress)
+        ]
+        if dirty:
+            jobs.append((write_division_pages, snapshot, today, dirty, compress))
+            versions.update(division_versions)
+
+    rebuilt = [fname for fnames in render_jobs(jobs, workers) for fname in fnames]
+    for fname in rebuilt:
+        manifest.set(fname, versions[fname])
+    manifest.save()
+    logging.info(
+        "generate_all_pages: rebuilt %d pages across %d of %d divisions",
+        len(rebuilt),
+        len(jobs),
+        len(snapshots),
+    )
+    return rebuilt
+
+
+@with_session
+def generate_season_pages(session, force=False, workers=None, compress=None):
+    """Generates team, club and referee pages whose data changed since the last run.
+
+    The season is loaded once and indexed in memory by team, club and referee,
+    so the pages cost no more queries than the division pages. Team pages have
+    the group table, form and every match; club pages cover all of a club's
+    teams across competitions; referee pages list appointments. Returns the
+    paths of the pages that were rebuilt.
+    """
+    today = date.today()
+    manifest = Manifest()
+    index = build_season_index(load_division_snapshots(session).values())
+    versions = season_page_versions(index, today)
+    dirty = [
+        fname
+        for fname, version in versions.items()
+        if force or not manifest.is_current(fname, version, compress)
+    ]
+    # One job per worker, so the index is shipped to each process only once
+    workers = min(workers or default_workers(), len(dirty)) or 1
+    jobs = [
+        (write_season_pages, index, today, dirty[i::workers], compress)
+        for i in range(workers)
+        if dirty[i::workers]
+    ]
+    rebuilt = [fname for fnames in render_jobs(jobs, workers) for fname in fnames]
+    for fname in rebuilt:
+        manifest.set(fname, versions[fname])
+    manifest.save()
+    logging.info(
+        "generate_season_pages: rebuilt %d of %d pages", len(rebuilt), len(versions)
+    )
+    return rebuilt
+
+
+@with_session
+def export_json(session, division_ids=None, force=False, compress=None):
+    """Exports standings, results and fixtures as JSON for divisions and their teams.
+
+    Documents go to outputs/json/ and carry a strong ETag derived from their
+    data; unchanged documents are not rewritten. Returns the paths written.
+    """
+    manifest = Manifest()
+    written = write_json_exports(
+        load_division_snapshots(session, division_ids).values(),
+        manifest,
+        force=force,
+        compress=compress,
+    )
+    manifest.save()
+    return written
+
+
+def _render_images(images, days=0, workers=None, force=False, image_format=None):
+    """Renders (snapshot, kind, start_date) images, skipping unchanged ones.
+
+    An image is redrawn only if the hash of its inputs differs from the one
+    recorded in the manifest. Returns the slide paths of each requested
+    image, in order, whether redrawn or not.
+    """
+    # Pick up logos or fonts replaced since the last batch
+    refresh_assets()
+    image_format = as_image_format(image_format)
+    manifest = Manifest()
+    slides = []
+    jobs = []
+    pending = []
+    for snapshot, kind, start_date in images:
+        path_of, writer = IMAGE_KINDS[kind]
+        fname = path_of(snapshot, start_date, days, image_format.extension)
+        version = image_version(kind, snapshot, start_date, days, image_format)
+        if not force and manifest.is_current(fname, version):
+            slides.append(existing_slides(fname))
+            continue
+        # Encoding happens in the workers too
+        jobs.append((writer, snapshot, start_date, days, image_format))
+        pending.append((len(slides), fname, version))
+        slides.append([])
+
+    for (position, fname, version), written in zip(pending, render_jobs(jobs, workers)):
+        manifest.set(fname, version)
+        slides[position] = written
+    manifest.save()
+    logging.info("_render_images: redrew %d of %d images", len(jobs), len(images))
+    return slides
+
+
+@with_session
+def generate_all_images(
+    session,
+    results_date=None,
+    fixtures_date=None,
+    days=0,
+    division_ids=None,
+    workers=None,
+    force=False,
+    image_format=None,
+):
+    """Generates results and/or fixtures images for many divisions in parallel.
+
+    Division data is fetched once and rendered across a pool of `workers`
+    processes. Busy divisions get several slides. Images whose inputs are
+    unchanged since they were last drawn are skipped unless force is set.
+    image_format is a spec such as 'png', 'png8', 'jpeg:85' or 'webp:80'
+    (default: COUNTY_IMAGE_FORMAT, else optimized PNG). Returns the slide paths.
+    """
+    images = []
+    if results_date is not None:
+        images.append(("results", results_date))
+    if fixtures_date is not None:
+        images.append(("fixtures", fixtures_date))
+    snapshots = load_division_snapshots(session, division_ids).values()
+    images = [
+        (snapshot, kind, start_date)
+        for snapshot in snapshots
+        for kind, start_date in images
+    ]
+    rendered = _render_images(images, days, workers, force, image_format)
+    return [fname for slides in rendered for fname in slides]
+
+
+@with_session
+def weekly_social_batch(
+    session,
+    week_start=None,
+    days=6,
+    division_ids=None,
+    workers=None,
+    force=False,
+    image_format=None,
+):
+    """Renders the week's social media images for many divisions in one run.
+
+    Results slides cover the days + 1 days before week_start (default today)
+    and fixtures slides the days + 1 days from it; divisions with nothing to
+    show in a window get no image for it. Division data is fetched in a few
+    queries and every image renders across one pool of `workers` processes,
+    skipping those whose inputs are unchanged unless force is set. The images
+    and their slides are listed in outputs/social_<week_start>.json, whose
+    path is returned.
+    """
+    week_start = week_start or date.today()
+    image_format = as_image_format(image_format)
+    results_date, fixtures_date = week_windows(week_start, days)
+    images = [
+        (snapshot, kind, start_date)
+        for snapshot in load_division_snapshots(session, division_ids).values()
+        for kind, start_date in (("results", results_date), ("fixtures", fixtures_date))
+        if shows_matches(kind, snapshot, start_date, days)
+    ]
+    rendered = _render_images(images, days, workers, force, image_format)
+    entries = [
+        (kind, start_date, snapshot, slides)
+        for (snapshot, kind, start_date), slides in zip(images, rendered)
+    ]
+    return write_social_manifest(
+        social_manifest_path(week_start), week_start, days, image_format, entries
+    )
+
+
+@with_session
+def compare_image_formats(
+    session,
+    division_id,
+    start_date,
+    days=0,
+    kind="results",
+    formats=("png", "png8", "jpeg:85", "webp:80"),
+):
+    """Renders a division's image once and reports each format's size and encode time.
+
+    Returns one dict per slide and format with the format spec, bytes and seconds.
+    """
+    snapshot = load_division_snapshot(session, division_id)
+    render = render_division_results if kind == "results" else render_division_fixtures
+    slides = render(snapshot, start_date, days)
+    formats = [parse_image_format(spec) for spec in formats]
+    return [
+        {"slide": number, **row}
+        for number, slide in enumerate(slides, 1)
+        for row in compare_formats(slide, formats)
+    ]
+
+
+@with_session
+def generate_logo_atlas(session, sizes=LOGO_SIZES):
+    """Packs every club's logo into data/logos/atlas_<size>.png, keyed by club id.
+
+    Run after adding clubs or logos; image rendering then reads no logo files.
+    """
+    clubs = session.query(Club.id, Club.name).order_by(Club.id).all()
+    return build_logo_atlas(clubs, sizes)
+
+
+@with_session
+def get_division_snapshots(session, division_ids=None):
+    """Returns detached snapshots of the given divisions (default all), keyed by id."""
+    return load_division_snapshots(session, division_ids)
+
+
+def serve(host="127.0.0.1", port=8000, ttl=5.0):
+    """Serves division pages, JSON and images rendered on demand from the database.
+
+    Paths mirror outputs/ (league_page_<division>.html, json/index.json,
+    results_<division>_<YYYYMMDD>.png and _2.png for its next slide), with
+    ?days=N on images that span several days. Data is re-read at most every
+    `ttl` seconds and rendered responses are cached per division data
+    version, with ETags.
+    """
+    server = CountyServer((host, port), get_division_snapshots, ttl=ttl)
+    logging.info("Serving on http://%s:%s/", host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@with_session
+def generate_calendars(session, force=False, compress=None):
+    """Writes the iCalendar feeds whose matches changed since the last run.
+
+    There is one feed per division, team, club and referee, in
+    outputs/calendars/<kind>_<id>.ics. Each feed is versioned in the
+    manifest by a hash of its matches, so amendments and results are
+    picked up however they were made. Returns the paths written.
+    """
+    manifest = Manifest()
+    written = write_calendars(
+        load_division_snapshots(session).values(), manifest, force, compress
+    )
+    manifest.save()
+    return written
+
+
+def _defer_match(session, match_id, result=False):
+    """Queues a match's division for background regeneration once committed.
+
+    A result also queues its date, so the division's results image is
+    redrawn; an amendment queues it as a fixture date, so that day's fixtures
+    image is. Call it before and after moving a match to cover both dates.
+    """
+    if not queue_running():
+        return
+    match = session.query(Match.division_id, Match.date).filter_by(id=match_id).first()
+    if match is not None:
+        dates = [match.date]
+        if result:
+            defer_dirty(session, [match.division_id], dates)
+        else:
+            defer_dirty(session, [match.division_id], fixture_dates=dates)
+
+
+def _regenerate(job, images, image_format):
+    applied = {division_id: dates for division_id, (dates, _) in job.items()}
+    fixtures = {division_id: dates for division_id, (_, dates) in job.items()}
+    publish_results(applied, images, image_format, fixtures)
+
+
+def start_regeneration(debounce=2.0, workers=2, images=True, image_format=None):
+    """Regenerates outputs in the background after every write.
+
+    Amendments, results, table updates and withdrawals then queue their
+    division; a division's events are coalesced until it has been quiet for
+    `debounce` seconds, and `workers` threads rebuild its pages, JSON,
+    calendars, results images and the fixtures images of amended dates.
+    Returns the RegenerationQueue, whose metrics() give queue depth, counts
+    and job latency.
+    """
+    return start_queue(
+        lambda job: _regenerate(job, images, image_format), debounce, workers
+    )
+
+
+def stop_regeneration(flush=True):
+    """Stops background regeneration, by default after finishing what is queued."""
+    return stop_queue(flush)
+
+
+@with_session
+def update_match_referee(session, match_id, referee_id):
+    """Updates the referee for a match."""
+    update_referee(session, match_id, referee_id)
+    _defer_match(session, match_id)
+
+
+@with_session
+def update_match_date(session, match_id, match_date):
+    """Updates the date for a match."""
+    _defer_match(session, match_id)
+    update_date(session, match_id, match_date.date())
+    _defer_match(session, match_id)
+
+
+@with_session
+def update_match_time(session, match_id, match_time):
+    """Updates the date for a match."""
+    update_time(session, match_id, match_time.time())
+    _defer_match(session, match_id)
+
+
+@with_session
+def update_match_datetime(session, match_id, match_datetime):
+    """Updates the date for a match."""
+    _defer_match(session, match_id)
+    update_date(session, match_id, match_datetime.date())
+    update_time(session, match_id, match_datetime.time())
+    _defer_match(session, match_id)
+
+
+@with_session
+def update_match_venue(session, match_id, venue_id):
+    """Updates the venue for a match."""
+    update_venue(session, match_id, venue_id)
+    _defer_match(session, match_id)
+
+
+def add_fixtures_to_image(draw, font, fixtures, y_position):
+    """Helper function to add fixtures to the image."""
+
+    for match in fixtures:
+        time_str = match.time.strftime("%H:%M")
+        home_team = match.home_team.name
+        away_team = match.away_team.name
+        venue_referee = f"{match.venue.name}. Referee: {match.referee.name}"
+
+        # Add fixture details to image, with formatting and background colors
+        draw.text((50, y_position), time_str, font=font, fill="black")
+        draw.text(
+            (200, y_position),
+            home_team,
+            font=font,
+            fill="black",
+            background="rgba(0, 102, 0, 0.5)",
+        )  # Semi-transparent green
+        draw.text(
+            (540, y_position),
+            "v",
+            font=font,
+            fill="black",
+            background="rgba(255, 255, 255, 0.5)",
+        )  # Semi-transparent white
+        draw.text(
+            (800, y_position),
+            away_team,
+            font=font,
+            fill="black",
+            background="rgba(0, 102, 0, 0.5)",
+        )  # Semi-transparent green
+        y_position += 40  # Increment y-position for next row
+        draw.text((50, y_position), venue_referee, font=font, fill="black")
+        y_position += 60  # Increment y-position for next fixture
+
+    return y_position
+
+
+def add_results_to_image(draw, font, results, y_position):
+    """Helper function to add results to the image."""
+
+    for match in results:
+        time_str = match.time.strftime("%H:%M")
+        home_team = match.home_team.name
+        away_team = match.away_team.name
+        home_score = f"{match.home_goals}-{match.home_points:02}"
+        away_score = f"{match.away_goals}-{match.away_points:02}"
+        venue_referee = f"{match.venue.name}. Referee: {match.referee.name}"
+
+        # Add result details to image, with formatting and background colors
+        draw.text((50, y_position), time_str, font=font, fill="black")
+        draw.text(
+            (200, y_position),
+            home_team,
+            font=font,
+            fill="black",
+            background="rgba(0, 102, 0, 0.5)",
+        )  # Semi-transparent green
+        draw.text(
+            (540, y_position),
+            home_score,
+            font=font,
+            fill="black",
+            background="rgba(255, 255, 255, 0.5)",
+        )  # Semi-transparent white
+        draw.text(
+            (800, y_position),
+            away_score,
+            font=font,
+            fill="black",
+            background="rgba(0, 102, 0, 0.5)",
+        )  # Semi-transparent green
+        draw.text(
+            (900, y_position),
+            away_team,
+            font=font,
+            fill="black",
+            background="rgba(255, 255, 255, 0.5)",
+        )  # Semi-transparent white
+        y_position += 40  # Increment y-position for next row
+        draw.text((50, y_position), venue_referee, font=font, fill="black")
+        y_position += 60  # Increment y-position for next result
+
+    return y_position
+
+
+@with_session
+def instagram_division_results(
+    session, division_id, start_date, days=0, force=False, image_format=None
+):
+    """Generates Instagram slides with results and tables for a division on a particular date.
+
+    Returns the slide paths; the first is results_<division>_<date>.png and any
+    further slides add _2, _3 and so on. Unchanged images are not redrawn.
+    """
+    snapshot = load_division_snapshot(session, division_id)
+    [slides] = _render_images(
+        [(snapshot, "results", start_date)], days, 1, force, image_format
+    )
+    return slides
+
+
+@with_session
+def instagram_division_fixtures(
+    session, division_id, start_date, days=0, force=False, image_format=None
+):
+    """Generates Instagram slides with fixtures for a division on a particular date range.
+
+    Returns the slide paths, numbered like instagram_division_results.
+    """
+    snapshot = load_division_snapshot(session, division_id)
+    [slides] = _render_images(
+        [(snapshot, "fixtures", start_date)], days, 1, force, image_format
+    )
+    return slides
+
+
+@with_session
+def update_ref_club(
+    session,
+    referee_id,
+    club_id,
+):
+    if ref := session.query(Referee).filter_by(id=referee_id).first():
+        ref.club_id = club_id
+
+
+@with_session
+def add_match_result(
+    session,
+    match_id,
+    home_goals=None,
+    home_points=None,
+    away_goals=None,
+    away_points=None,
+    walkover=False,
+    winner_id=None,
+):
+    add_result(
+        session,
+        match_id,
+        home_goals=home_goals,
+        home_points=home_points,
+        away_goals=away_goals,
+        away_points=away_points,
+        walkover=walkover,
+        winner_id=winner_id,
+    )
+    _defer_match(session, match_id, result=True)
+
+
+@with_session
+def check_standings(session, repair=False):
+    """Recomputes every group table from the matches and diffs it against the teams.
+
+    Catches Team rows left out of step with their matches, for instance by
+    update_stats, a result added twice or a withdrawal. The whole county is
+    recomputed in one vectorized pass from two queries, ranked by the same
+    rank_group as new results. Returns the discrepancies, one row per wrong
+    value; with repair the Team rows are set to the recomputed values.
+    """
+    discrepancies = find_discrepancies(*load_tables(session))
+    logging.info(
+        "check_standings: %d wrong values across %d teams",
+        len(discrepancies),
+        discrepancies["team_id"].nunique(),
+    )
+    if repair and len(discrepancies):
+        repair_standings(session, discrepancies)
+        defer_dirty(session, set(discrepancies["division_id"]))
+    return discrepancies
+
+
+@with_session
+def update_all_tables(session):
+    """Updates all league tables, in the same few queries however many teams."""
+    groups = session.query(Group.id, Group.division_id).all()
+    recompute_ranks(session, [group_id for group_id, _ in groups])
+    defer_dirty(session, {division_id for _, division_id in groups})
+
+
+@with_session
+def update_division_tables(
+    session,
+    division_id,
+):
+    groups = session.query(Group.id).filter_by(division_id=division_id)
+    recompute_ranks(session, [group_id for (group_id,) in groups])
+    defer_dirty(session, [division_id])
+
+
+@with_session
+def update_stats(
+    session,
+    team_id,
+    P,
+    W,
+    D,
+    L,
+):
+    if team := session.query(Team).filter_by(id=team_id).first():
+        team.played = P
+        team.won = W
+        team.drawn = D
+        team.lost = L
+        update_league_ranks(session, team.group_id)
+        defer_dirty(session, [team.division_id])
+
+
+@with_session
+def withdraw_team(session, team_id):
+    team = session.query(Team).filter_by(id=team_id).first()
+    for match in team.home_matches:
+        session.delete(match)
+    for match in team.away_matches:
+        session.delete(match)
+    team.fielded_all = False
+    team.played = 0
+    team.won = 0
+    team.drawn = 0
+    team.lost = 0
+    team.goals_for = 0
+    team.points_for = 0
+    team.goals_against = 0
+    team.points_against = 0
+    team.goals_for_x_wo = 0
+    team.points_for_x_wo = 0
+    team.goals_against_x_wo = 0
+    team.points_against_x_wo = 0
+    update_league_ranks(session, team.group_id)
+    defer_dirty(session, [team.division_id])
+
+
+name = "County Competitions"
+__version__ = "0.1.0"
+__author__ = "Breandán Anraoi MacGabhann"
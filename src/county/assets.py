@@ -0,0 +1,186 @@
+import hashlib
+import io
+import json
+import logging
+import os
+from functools import lru_cache
+
+from PIL import Image, ImageFont
+
+from .publish import write_atomic
+
+ASSETS_DIR = "data"
+ATLAS_INDEX_PATH = f"{ASSETS_DIR}/logos/atlas.json"
+ATLAS_WIDTH = 1024
+# Logo heights used by the image layouts; the atlas holds a copy at each
+LOGO_SIZES = (30,)
+
+
+@lru_cache(maxsize=32)
+def font(name, size):
+    """A TrueType font from data/, loaded once per process for each size."""
+    return ImageFont.truetype(f"{ASSETS_DIR}/{name}", size)
+
+
+def _decode(path):
+    # Decode fully and close the file; the cached copy holds no file handle
+    with Image.open(path) as image:
+        image.load()
+        return image.copy()
+
+
+@lru_cache(maxsize=8)
+def background(name="fix_bg.png"):
+    """A decoded background image from data/. Callers must not draw on it."""
+    return _decode(f"{ASSETS_DIR}/{name}")
+
+
+@lru_cache(maxsize=512)
+def logo(club_name, size=30):
+    """A club's decoded logo from data/logos/, or None if the club has none.
+
+    Missing logos are logged once and then remembered, so rendering carries on
+    without them.
+    """
+    try:
+        return _decode(f"{ASSETS_DIR}/logos/logo{size}_{club_name}.png")
+    except FileNotFoundError:
+        logging.warning("No logo found for club %s", club_name)
+        return None
+
+
+def atlas_path(size):
+    return f"{ASSETS_DIR}/logos/atlas_{size}.png"
+
+
+def _png_bytes(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def build_logo_atlas(clubs, sizes=LOGO_SIZES):
+    """Packs every club logo into one atlas image per size, indexed by club id.
+
+    clubs are (id, name) pairs; logos come from data/logos/logo30_<name>.png
+    and are scaled to each height in sizes. Writes data/logos/atlas_<size>.png
+    and data/logos/atlas.json, which maps size -> club id -> [x, y, w, h].
+    Clubs without a logo are left out. Returns the index.
+    """
+    clubs = list(clubs)
+    index = {}
+    for size in sizes:
+        tiles = []
+        for club_id, club_name in clubs:
+            if (source := logo(club_name)) is None:
+                continue
+            if source.height != size:
+                width = max(1, round(source.width * size / source.height))
+                source = source.resize((width, size), Image.Resampling.LANCZOS)
+            tiles.append((club_id, source.convert("RGBA")))
+
+        # Shelf packing: left to right, a new row when the current one is full
+        boxes = {}
+        x = y = row_height = 0
+        for club_id, tile in tiles:
+            if x + tile.width > ATLAS_WIDTH:
+                x, y, row_height = 0, y + row_height, 0
+            boxes[str(club_id)] = [x, y, tile.width, tile.height]
+            x += tile.width
+            row_height = max(row_height, tile.height)
+        atlas = Image.new("RGBA", (ATLAS_WIDTH, max(1, y + row_height)))
+        for club_id, tile in tiles:
+            atlas.paste(tile, tuple(boxes[str(club_id)][:2]))
+        write_atomic(atlas_path(size), _png_bytes(atlas))
+        index[str(size)] = boxes
+
+    write_atomic(ATLAS_INDEX_PATH, json.dumps(index, sort_keys=True).encode("utf-8"))
+    clear_asset_cache()
+    return index
+
+
+@lru_cache(maxsize=1)
+def _atlas_index():
+    try:
+        with open(ATLAS_INDEX_PATH) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+@lru_cache(maxsize=len(LOGO_SIZES) + 2)
+def _atlas(size):
+    try:
+        return _decode(atlas_path(size))
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def club_logo(club_id, size=30):
+    """A club's logo cut from the in-memory atlas, or None if it is not there."""
+    box = _atlas_index().get(str(size), {}).get(str(club_id))
+    if box is None or (atlas := _atlas(size)) is None:
+        return None
+    x, y, width, height = box
+    return atlas.crop((x, y, x + width, y + height))
+
+
+def paste_logo(image, club_ids, club_names, position, size=30):
+    """Pastes the logo of a team's first club onto image, if it has one.
+
+    Logos come from the atlas by club id; without an atlas entry the logo
+    file is looked up by club name instead.
+    """
+    if not club_ids:
+        return
+    if (team_logo := club_logo(club_ids[0], size)) is None:
+        team_logo = logo(club_names[0], size)
+    if team_logo is not None:
+        image.paste(team_logo, position)
+
+
+@lru_cache(maxsize=1)
+def asset_version():
+    """Fingerprint of the fonts, backgrounds and logos under data/.
+
+    Built from file names, sizes and modification times, so replacing a logo
+    or font changes it without reading any image data. Cached until the next
+    refresh_assets(), so a batch of images sees one version throughout.
+    """
+    entries = []
+    for root, _, names in os.walk(ASSETS_DIR):
+        for name in names:
+            if name.endswith((".ttf", ".otf", ".png", ".json")):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((path, stat.st_size, stat.st_mtime_ns))
+    data = repr(sorted(entries)).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def refresh_assets():
+    """Re-reads asset_version() at the start of a batch of images.
+
+    If anything under data/ changed since the last batch, the cached fonts,
+    backgrounds and logos are dropped too. Returns the current version.
+    """
+    previous = asset_version()
+    asset_version.cache_clear()
+    if asset_version() != previous:
+        clear_asset_cache()
+    return asset_version()
+
+
+def clear_asset_cache():
+    """Forgets all cached assets, e.g. after data/ has been updated."""
+    for cached in (
+        font,
+        background,
+        logo,
+        _atlas_index,
+        _atlas,
+        club_logo,
+        asset_version,
+    ):
+        cached.cache_clear()
@@ -0,0 +1,224 @@
+import hashlib
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from .pages import round_key, round_label
+from .publish import publish
+
+CALENDAR_DOMAIN = "county"
+CALENDAR_DIR = "outputs/calendars/"
+# Bump when the event layout changes, so every feed is rewritten
+CALENDAR_FORMAT_VERSION = 1
+MATCH_DURATION = timedelta(minutes=90)
+
+VTIMEZONE = (
+    "BEGIN:VTIMEZONE",
+    "TZID:Europe/Dublin",
+    "BEGIN:STANDARD",
+    "DTSTART:19701025T020000",
+    "TZOFFSETFROM:+0100",
+    "TZOFFSETTO:+0000",
+    "TZNAME:GMT",
+    "RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU",
+    "END:STANDARD",
+    "BEGIN:DAYLIGHT",
+    "DTSTART:19700329T010000",
+    "TZOFFSETFROM:+0000",
+    "TZOFFSETTO:+0100",
+    "TZNAME:IST",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU",
+    "END:DAYLIGHT",
+    "END:VTIMEZONE",
+)
+
+
+def calendar_path(feed):
+    kind, feed_id = feed
+    return f"{CALENDAR_DIR}{kind}_{feed_id}.ics"
+
+
+def _feed_of(path):
+    kind, feed_id = os.path.basename(path).removesuffix(".ics").rsplit("_", 1)
+    return kind, int(feed_id)
+
+
+def match_uid(match_id):
+    """Event UID; stable for the life of the match so clients update in place."""
+    return f"match-{match_id}@{CALENDAR_DOMAIN}"
+
+
+def _feeds_of(division_id, home_team_id, away_team_id, club_ids, referee_id):
+    feeds = {("division", division_id)}
+    feeds.update(("team", team_id) for team_id in (home_team_id, away_team_id))
+    feeds.update(("club", club_id) for club_id in club_ids)
+    feeds.add(("referee", referee_id))
+    return {feed for feed in feeds if feed[1] is not None}
+
+
+def _escape(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Folds a content line to 75 octets, never splitting a UTF-8 sequence."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    start, limit = 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts)
+
+
+def _score(match):
+    if match.walkover:
+        home = "W/O" if match.winner_id == match.home_team_id else "X"
+        away = "W/O" if match.winner_id == match.away_team_id else "X"
+        return home, away
+    return (
+        f"{match.home_goals}-{match.home_points:02}",
+        f"{match.away_goals}-{match.away_points:02}",
+    )
+
+
+def _event(snapshot, match):
+    home = match.home_team_name or "TBC"
+    away = match.away_team_name or "TBC"
+    if match.has_result:
+        home_score, away_score = _score(match)
+        summary = f"{home} {home_score} v {away_score} {away}"
+    else:
+        summary = f"{home} v {away}"
+    description = (
+        f"{snapshot.competition_name} {snapshot.name}, {round_label(round_key(match))}"
+    )
+    if match.referee_name:
+        referee = match.referee_name
+        if match.referee_club_name:
+            referee += f" ({match.referee_club_name})"
+        description += f"\nReferee: {referee}"
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{match_uid(match.id)}",
+        # Deterministic, so an unchanged feed is byte-identical and not rewritten
+        f"DTSTAMP:{match.date:%Y%m%d}T000000Z",
+    ]
+    if match.time is None:
+        lines += [
+            f"DTSTART;VALUE=DATE:{match.date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{match.date + timedelta(days=1):%Y%m%d}",
+        ]
+    else:
+        start = datetime.combine(match.date, match.time)
+        lines += [
+            f"DTSTART;TZID=Europe/Dublin:{start:%Y%m%dT%H%M%S}",
+            f"DTEND;TZID=Europe/Dublin:{start + MATCH_DURATION:%Y%m%dT%H%M%S}",
+        ]
+    lines.append(f"SUMMARY:{_escape(summary)}")
+    if match.venue_name:
+        lines.append(f"LOCATION:{_escape(match.venue_name)}")
+    lines += [f"DESCRIPTION:{_escape(description)}", "END:VEVENT"]
+    return lines
+
+
+def render_calendar(name, events):
+    """iCalendar text for a feed from (snapshot, match) pairs, ordered by match id."""
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{CALENDAR_DOMAIN}//fixtures//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+        "X-WR-TIMEZONE:Europe/Dublin",
+        *VTIMEZONE,
+    ]
+    for snapshot, match in sorted(events, key=lambda event: event[1].id):
+        lines += _event(snapshot, match)
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+def calendar_feeds(snapshots):
+    """Maps each feed (kind, id) to its name and (snapshot, match) events.
+
+    Every dated match goes into its division's, both teams', their clubs' and
+    its referee's feed.
+    """
+    names = {}
+    events = defaultdict(list)
+    for snapshot in snapshots:
+        names[("division", snapshot.id)] = (
+            f"{snapshot.competition_name} {snapshot.name}"
+        )
+        for group in snapshot.groups:
+            for team in group.teams:
+                names[("team", team.id)] = team.name
+                names.update(zip((("club", i) for i in team.club_ids), team.club_names))
+        for match in snapshot.matches:
+            if match.date is None:
+                continue
+            touched = _feeds_of(
+                snapshot.id,
+                match.home_team_id,
+                match.away_team_id,
+                match.home_club_ids + match.away_club_ids,
+                match.referee_id,
+            )
+            if match.referee_id is not None:
+                names[("referee", match.referee_id)] = match.referee_name
+            for feed in touched:
+                events[feed].append((snapshot, match))
+    return {
+        feed: (names.get(feed, f"{feed[0]} {feed[1]}"), feed_events)
+        for feed, feed_events in events.items()
+    }
+
+
+def feed_version(name, events):
+    """Hash of everything a feed is rendered from: its name and its matches."""
+    data = (
+        CALENDAR_FORMAT_VERSION,
+        name,
+        [
+            (snapshot.competition_name, snapshot.name, match)
+            for snapshot, match in sorted(events, key=lambda event: event[1].id)
+        ],
+    )
+    return hashlib.sha256(repr(data).encode("utf-8")).hexdigest()[:16]
+
+
+def write_calendars(snapshots, manifest, force=False, compress=None):
+    """Publishes the feeds whose version differs from the manifest's.
+
+    snapshots must cover the whole season, as club and referee feeds span
+    divisions. A feed published before whose last match has since moved away
+    is rewritten empty. Returns the paths written.
+    """
+    feeds = calendar_feeds(snapshots)
+    for path in list(manifest.versions):
+        if path.startswith(CALENDAR_DIR) and (feed := _feed_of(path)) not in feeds:
+            feeds[feed] = (f"{feed[0]} {feed[1]}", [])
+    written = []
+    for feed, (name, events) in feeds.items():
+        path = calendar_path(feed)
+        version = feed_version(name, events)
+        if not force and manifest.is_current(path, version, compress):
+            continue
+        publish(path, render_calendar(name, events), compress)
+        manifest.set(path, version)
+        written.append(path)
+    return written
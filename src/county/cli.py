@@ -0,0 +1,393 @@
+"""The county command line: one-off subcommands, or a shell that stays warm."""
+
+import argparse
+import cmd
+import datetime
+import os
+import shlex
+import sys
+import time
+
+import pandas as pd
+
+import county
+
+# Tables in the order they must be loaded, with their add_* function and keyword
+TABLES = {
+    "clubs": ("add_clubs", "clubs_df"),
+    "referees": ("add_referees", "referees_df"),
+    "venues": ("add_venues", "venues_df"),
+    "competitions": ("add_competitions", "competitions_df"),
+    "divisions": ("add_divisions", "divisions_df"),
+    "groups": ("add_groups", "groups_df"),
+    "criteria": ("add_criteria", "criteria_df"),
+    "teams": ("add_teams", "teams_df"),
+    "matches": ("add_matches", "matches_df"),
+}
+MATCH_DTYPES = {
+    "match_id": "Int64",
+    "home_team_id": "Int64",
+    "away_team_id": "Int64",
+    "venue_id": "Int64",
+    "competition_id": "Int64",
+    "division_id": "Int64",
+    "stage": str,
+    "group_round": str,
+    "match_no": "Int64",
+    "group_id": "Int64",
+    "match_date_time": str,
+    "referee_id": "Int64",
+}
+
+
+def read_table(table, path):
+    """Reads one of the setup CSVs the way setup.py does."""
+    if table != "matches":
+        return pd.read_csv(path, encoding="latin-1")
+    matches_df = pd.read_csv(
+        path, encoding="latin-1", dtype=MATCH_DTYPES, engine="pyarrow"
+    )
+    match_date_time = pd.to_datetime(matches_df["match_date_time"], errors="coerce")
+    matches_df["match_date"] = match_date_time.dt.date
+    matches_df["match_time"] = match_date_time.dt.time
+    return matches_df
+
+
+def _table(name):
+    if name not in TABLES:
+        raise argparse.ArgumentTypeError(
+            f"unknown table {name!r} (choose from {', '.join(TABLES)})"
+        )
+    return name
+
+
+def _date(text):
+    return datetime.datetime.strptime(text, "%Y-%m-%d").date()
+
+
+# Match times as typed by the fixtures secretary, e.g. 05/07/2025 19:30
+DATE_TIME_FORMAT = "%d/%m/%Y %H:%M"
+
+
+def _datetime(text):
+    return datetime.datetime.strptime(text, DATE_TIME_FORMAT)
+
+
+def _ingest(args):
+    tables = args.tables or [
+        table for table in TABLES if os.path.exists(f"{args.dir}/{table}.csv")
+    ]
+    for table in tables:
+        function, keyword = TABLES[table]
+        data = read_table(table, f"{args.dir}/{table}.csv")
+        getattr(county, function)(**{keyword: data})
+        print(f"{table}: {len(data)} rows")
+
+
+def _results(args):
+    new_results = pd.read_csv(args.csv, encoding="latin-1", engine="pyarrow")
+    county.add_new_results(new_results=new_results)
+    return f"{len(new_results)} results"
+
+
+def read_amendments(path):
+    """Reads fixture changes: match_id plus any of match_date_time, venue_id, referee_id.
+
+    match_date_time is in the same day-first format as reschedule takes; a
+    value that doesn't match it is an error rather than a guessed date.
+    """
+    amendments = pd.read_csv(path, encoding="latin-1", dtype=MATCH_DTYPES)
+    if "match_date_time" in amendments:
+        match_date_time = pd.to_datetime(
+            amendments["match_date_time"], format=DATE_TIME_FORMAT, errors="raise"
+        )
+        amendments["match_date"] = match_date_time.dt.date
+        amendments["match_time"] = match_date_time.dt.time
+    return amendments
+
+
+def _plan(args):
+    new_results = None
+    if args.csv:
+        new_results = pd.read_csv(args.csv, encoding="latin-1", engine="pyarrow")
+    amendments = read_amendments(args.amendments) if args.amendments else None
+    if new_results is None and amendments is None:
+        return "nothing to plan: give a results CSV and/or --amendments"
+    return county.plan_results(new_results, amendments, args.format).report()
+
+
+def _result(args):
+    county.add_match_result(
+        args.match_id,
+        args.home_goals,
+        args.home_points,
+        args.away_goals,
+        args.away_points,
+    )
+
+
+def _walkover(args):
+    county.add_match_result(args.match_id, walkover=True, winner_id=args.winner_id)
+
+
+def _tables(args):
+    if args.division:
+        for division_id in args.division:
+            county.update_division_tables(division_id)
+    else:
+        county.update_all_tables()
+
+
+def _check(args):
+    discrepancies = county.check_standings(repair=args.repair)
+    if discrepancies.empty:
+        return "standings match the results"
+    teams = discrepancies["team_id"].nunique()
+    action = "repaired" if args.repair else "found"
+    return (
+        f"{discrepancies.to_string(index=False)}\n"
+        f"{action} {len(discrepancies)} wrong values across {teams} teams"
+    )
+
+
+def _pages(args):
+    rebuilt = county.generate_all_pages(force=args.force, workers=args.workers)
+    if args.season:
+        rebuilt += county.generate_season_pages(force=args.force, workers=args.workers)
+    if args.json:
+        rebuilt += county.export_json(force=args.force)
+    return rebuilt
+
+
+def _images(args):
+    dates = {f"{args.kind}_date": args.date}
+    return county.generate_all_images(
+        **dates,
+        days=args.days,
+        division_ids=args.division,
+        workers=args.workers,
+        force=args.force,
+        image_format=args.format,
+    )
+
+
+def _weekly(args):
+    return county.weekly_social_batch(
+        args.date,
+        days=args.days,
+        division_ids=args.division,
+        workers=args.workers,
+        force=args.force,
+        image_format=args.format,
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="county", description=__doc__)
+    parser.add_argument(
+        "--db", help="database URL (default: the DATABASE_URL environment variable)"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    def command(name, func, help):
+        sub = commands.add_parser(name, help=help, description=help)
+        sub.set_defaults(func=func)
+        return sub
+
+    sub = command("ingest", _ingest, "Load clubs ... matches from <dir>/<table>.csv")
+    sub.add_argument("tables", nargs="*", type=_table, metavar="table")
+    sub.add_argument("--dir", default="data")
+
+    sub = command("results", _results, "Add the results in a CSV file")
+    sub.add_argument("csv")
+
+    sub = command(
+        "plan", _plan, "Show what results and fixture changes would do, without saving"
+    )
+    sub.add_argument("csv", nargs="?", help="results, shaped like new_results.csv")
+    sub.add_argument("--amendments", help="CSV of match_id and changed columns")
+    sub.add_argument("--format", help="image format the images would use")
+
+    sub = command("result", _result, "Add one match result")
+    for name in ("match_id", "home_goals", "home_points", "away_goals", "away_points"):
+        sub.add_argument(name, type=int)
+
+    sub = command(
+        "watch",
+        lambda args: county.watch_results(
+            args.path, args.interval, args.debounce, not args.no_images, args.format
+        ),
+        "Apply and publish new results as they are saved",
+    )
+    sub.add_argument("path", nargs="?", default="data/new_results.csv")
+    sub.add_argument("--interval", type=float, default=1.0, help="seconds")
+    sub.add_argument("--debounce", type=float, default=2.0, help="seconds")
+    sub.add_argument("--no-images", action="store_true")
+    sub.add_argument("--format", help="png, png8, jpeg:85 or webp:80")
+
+    sub = command("walkover", _walkover, "Award a match as a walkover")
+    sub.add_argument("match_id", type=int)
+    sub.add_argument("winner_id", type=int)
+
+    sub = command(
+        "referee",
+        lambda args: county.update_match_referee(args.match_id, args.referee_id),
+        "Change a match's referee",
+    )
+    sub.add_argument("match_id", type=int)
+    sub.add_argument("referee_id", type=int)
+
+    sub = command(
+        "reschedule",
+        lambda args: county.update_match_datetime(args.match_id, args.when),
+        "Move a match to a new date and time",
+    )
+    sub.add_argument("match_id", type=int)
+    sub.add_argument("when", type=_datetime, help="'DD/MM/YYYY HH:MM'")
+
+    sub = command(
+        "venue",
+        lambda args: county.update_match_venue(args.match_id, args.venue_id),
+        "Move a match to another venue",
+    )
+    sub.add_argument("match_id", type=int)
+    sub.add_argument("venue_id", type=int)
+
+    sub = command(
+        "withdraw",
+        lambda args: county.withdraw_team(args.team_id),
+        "Withdraw a team and remove its matches",
+    )
+    sub.add_argument("team_id", type=int)
+
+    sub = command("tables", _tables, "Recalculate league tables")
+    sub.add_argument("--division", type=int, nargs="+")
+
+    sub = command("check", _check, "Check team standings against the results")
+    sub.add_argument("--repair", action="store_true", help="fix the Team rows")
+
+    sub = command("pages", _pages, "Regenerate division pages")
+    sub.add_argument("--force", action="store_true")
+    sub.add_argument("--workers", type=int)
+    sub.add_argument("--season", action="store_true", help="team/club/referee pages")
+    sub.add_argument("--json", action="store_true", help="JSON exports too")
+
+    sub = command(
+        "calendars",
+        lambda args: county.generate_calendars(force=args.force),
+        "Rewrite the iCalendar feeds whose matches changed",
+    )
+    sub.add_argument("--force", action="store_true")
+
+    images = command("images", _images, "Render results or fixtures images")
+    images.add_argument("kind", choices=["results", "fixtures"])
+    images.add_argument("date", type=_date, help="YYYY-MM-DD")
+
+    weekly = command("weekly", _weekly, "Render the week's social media images")
+    weekly.add_argument("date", type=_date, nargs="?", help="week start, YYYY-MM-DD")
+
+    for parser_, days in ((images, 0), (weekly, 6)):
+        parser_.add_argument("--days", type=int, default=days)
+        parser_.add_argument("--division", type=int, nargs="+")
+        parser_.add_argument("--workers", type=int)
+        parser_.add_argument("--force", action="store_true")
+        parser_.add_argument("--format", help="png, png8, jpeg:85 or webp:80")
+
+    command(
+        "queue",
+        lambda args: county.queue_metrics() or "background regeneration is off",
+        "Show the background regeneration queue's metrics",
+    )
+
+    sub = command("shell", None, "Run many commands in one warm session")
+    sub.add_argument(
+        "--regenerate",
+        action="store_true",
+        help="rebuild affected outputs in the background after each change",
+    )
+    sub.add_argument("--debounce", type=float, default=2.0, help="seconds")
+    return parser
+
+
+def run(args):
+    """Runs a parsed command and prints what it returns."""
+    result = args.func(args)
+    if isinstance(result, list):
+        print("\n".join(map(str, result)) or "nothing to do")
+    elif result is not None:
+        print(result)
+
+
+class CountyShell(cmd.Cmd):
+    """Reads commands line by line, keeping the engine and asset caches warm.
+
+    Each line is a county subcommand (without the 'county'); its run time is
+    printed after it. 'help' lists the commands and 'quit' leaves.
+    """
+
+    intro = "county shell: type help or ? for commands, quit to leave."
+    prompt = "county> "
+
+    def __init__(self, parser):
+        super().__init__()
+        self.parser = parser
+
+    def default(self, line):
+        try:
+            args = self.parser.parse_args(shlex.split(line))
+        except SystemExit:
+            # argparse has already printed the problem
+            return
+        if args.func is None:
+            return
+        start = time.perf_counter()
+        try:
+            run(args)
+        except Exception as error:
+            print(f"error: {error}")
+        print(f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    def do_help(self, line):
+        self.parser.parse_args([*shlex.split(line), "--help"])
+
+    def onecmd(self, line):
+        try:
+            return super().onecmd(line)
+        except SystemExit:
+            return False
+
+    def do_quit(self, line):
+        """Leave the shell."""
+        return True
+
+    do_exit = do_quit
+
+    def do_EOF(self, line):
+        print()
+        return True
+
+    def emptyline(self):
+        pass
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+    county.initialise(args.db)
+    if args.command == "shell":
+        if args.regenerate:
+            county.start_regeneration(args.debounce)
+        try:
+            CountyShell(parser).cmdloop()
+        finally:
+            county.stop_regeneration()
+    else:
+        run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
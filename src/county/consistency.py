@@ -0,0 +1,235 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, select, update
+
+from .create_schema import Match, Team
+from .standings import TEAM_FIELDS, rank_group
+
+COUNTERS = [
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "points_for",
+    "goals_against",
+    "points_against",
+]
+# Columns rank_group sets
+RANKED = [
+    "goals_for_x_wo",
+    "points_for_x_wo",
+    "goals_against_x_wo",
+    "points_against_x_wo",
+    "league_rank",
+]
+
+
+def load_tables(session):
+    """Every team's stored standings and every group match, as two DataFrames."""
+    connection = session.connection()
+    teams = pd.read_sql(
+        select(
+            Team.id,
+            Team.name,
+            Team.division_id,
+            Team.group_id,
+            Team.competition_id,
+            *(getattr(Team, column) for column in TEAM_FIELDS),
+        ).order_by(Team.id),
+        connection,
+    )
+    matches = pd.read_sql(
+        select(
+            Match.id,
+            Match.group_id,
+            Match.home_team_id,
+            Match.away_team_id,
+            Match.home_goals,
+            Match.home_points,
+            Match.away_goals,
+            Match.away_points,
+            Match.walkover,
+            Match.winner_id,
+        )
+        .where(Match.stage == "group")
+        .order_by(Match.id),
+        connection,
+    )
+    teams["fielded_all"] = teams["fielded_all"].astype(bool)
+    matches["walkover"] = matches["walkover"].fillna(False).astype(bool)
+    return teams, matches
+
+
+def _by_team(matches):
+    """Each match twice, once from each team's side, with its outcome for that team."""
+    scores = matches[["home_goals", "home_points", "away_goals", "away_points"]]
+    scored = scores.fillna(0).where(~matches["walkover"], 0)
+    home_score = scored["home_goals"] * 3 + scored["home_points"]
+    away_score = scored["away_goals"] * 3 + scored["away_points"]
+    # add_result takes a walkover, or all-zero scores with a winner, at winner_id
+    decided = matches["walkover"] | (
+        (scores == 0).all(axis=1) & matches["winner_id"].notna()
+    )
+    home_won = np.where(
+        decided,
+        matches["winner_id"] == matches["home_team_id"],
+        home_score > away_score,
+    )
+    away_won = np.where(
+        decided,
+        matches["winner_id"] != matches["home_team_id"],
+        away_score > home_score,
+    )
+    sides = []
+    for side, other, won, lost in (
+        ("home", "away", home_won, away_won),
+        ("away", "home", away_won, home_won),
+    ):
+        sides.append(
+            pd.DataFrame(
+                {
+                    "match_id": matches["id"],
+                    "group_id": matches["group_id"],
+                    "team_id": matches[f"{side}_team_id"],
+                    "opponent_id": matches[f"{other}_team_id"],
+                    "played": matches["walkover"] | matches["home_goals"].notna(),
+                    "won": won,
+                    "lost": lost,
+                    "walkover_lost": matches["walkover"] & lost,
+                    "goals_for": scored[f"{side}_goals"],
+                    "points_for": scored[f"{side}_points"],
+                    "goals_against": scored[f"{other}_goals"],
+                    "points_against": scored[f"{other}_points"],
+                }
+            )
+        )
+    sides = pd.concat(sides, ignore_index=True)
+    sides["won"] &= sides["played"]
+    sides["lost"] &= sides["played"]
+    sides["drawn"] = sides["played"] & ~sides["won"] & ~sides["lost"]
+    for column in ("goals_for", "points_for", "goals_against", "points_against"):
+        sides[column] = sides[column].where(sides["played"], 0)
+    return sides
+
+
+def _rank(expected, matches):
+    """Scores excluding walkovers and league ranks, by team id, from rank_group.
+
+    expected holds each team's recomputed counters and fielded_all; rank_group
+    works on a transient Team per team, so its tie-breaks are the only ones.
+    """
+    # rank_group reads missing scores and winners as 0
+    scores = ["home_goals", "home_points", "away_goals", "away_points", "winner_id"]
+    scored = matches.fillna(dict.fromkeys(scores, 0)).astype(dict.fromkeys(scores, int))
+    # Converted once rather than per group, which would cost more than ranking
+    group_matches = defaultdict(list)
+    for match in scored.itertuples(index=False):
+        group_matches[match.group_id].append(match)
+    group_teams = defaultdict(list)
+    columns = ["id", "competition_id", "fielded_all", *COUNTERS]
+    for group_id, team in zip(
+        expected["group_id"], expected[columns].to_dict("records")
+    ):
+        group_teams[group_id].append(Team(**team))
+    ranked = []
+    for group_id, teams in group_teams.items():
+        rank_group(teams, group_matches[group_id])
+        ranked += [
+            (team.id, *(getattr(team, column) for column in RANKED)) for team in teams
+        ]
+    return pd.DataFrame(ranked, columns=["id", *RANKED]).set_index("id")
+
+
+def expected_standings(teams, matches):
+    """Recomputes every team's table columns from the match rows.
+
+    Counters are summed over the matches in one vectorized pass, following
+    update_group_table_stats. Scores excluding walkovers and league ranks come
+    from rank_group, so the tie-breaks are those add_new_results applies.
+    fielded_all is cleared by a walkover loss, or by a withdrawal, which
+    leaves the team with no matches in a group that has some.
+    """
+    sides = _by_team(matches)
+    sides = sides.merge(
+        teams[["id", "group_id"]],
+        left_on=["team_id", "group_id"],
+        right_on=["id", "group_id"],
+    )
+    totals = sides.groupby("team_id")[[*COUNTERS, "walkover_lost"]].sum()
+    expected = teams[["id", "group_id", "competition_id"]].join(totals, on="id")
+    expected[COUNTERS] = expected[COUNTERS].fillna(0).astype(int)
+    scheduled = pd.concat([matches["home_team_id"], matches["away_team_id"]])
+    withdrawn = ~expected["id"].isin(scheduled) & expected["group_id"].isin(
+        matches["group_id"]
+    )
+    expected["fielded_all"] = ~(expected["walkover_lost"].fillna(0) > 0) & ~withdrawn
+    expected = expected.join(_rank(expected, matches), on="id")
+    return expected.set_index("id")[list(TEAM_FIELDS)]
+
+
+def find_discrepancies(teams, matches):
+    """Stored team values that differ from the recomputed ones, one row per value.
+
+    Columns: team_id, name, division_id, group_id, column, stored, expected.
+    """
+    stored = teams.set_index("id")[list(TEAM_FIELDS)]
+    expected = expected_standings(teams, matches)
+    differs = stored.ne(expected)
+    if not differs.any(axis=None):
+        return pd.DataFrame(
+            columns=[
+                "team_id",
+                "name",
+                "division_id",
+                "group_id",
+                "column",
+                "stored",
+                "expected",
+            ]
+        )
+    found = (
+        differs.rename_axis(index="team_id", columns="column")
+        .stack()
+        .loc[lambda flags: flags]
+        .index.to_frame(index=False)
+    )
+    found["stored"] = [
+        stored.at[team_id, column]
+        for team_id, column in zip(found.team_id, found.column)
+    ]
+    found["expected"] = [
+        expected.at[team_id, column]
+        for team_id, column in zip(found.team_id, found.column)
+    ]
+    details = teams.set_index("id")[["name", "division_id", "group_id"]]
+    found = found.join(details, on="team_id")
+    return found[
+        ["team_id", "name", "division_id", "group_id", "column", "stored", "expected"]
+    ]
+
+
+def repair_standings(session, discrepancies):
+    """Writes the expected values of discrepancies to their Team rows.
+
+    One executemany per wrong column, whatever the number of teams. Returns
+    the ids of the teams repaired.
+    """
+    table = Team.__table__
+    for column, wrong in discrepancies.groupby("column"):
+        session.execute(
+            update(table)
+            .where(table.c.id == bindparam("team_id"))
+            .values({column: bindparam("value")}),
+            [
+                {
+                    "team_id": int(team_id),
+                    # numpy scalars to the Python values the driver expects
+                    "value": value.item() if hasattr(value, "item") else value,
+                }
+                for team_id, value in zip(wrong["team_id"], wrong["expected"])
+            ],
+        )
+    return sorted(set(discrepancies["team_id"]))
@@ -0,0 +1,95 @@
+import io
+import os
+import time
+from dataclasses import dataclass
+
+from PIL import Image
+
+# name -> (Pillow format, file extension)
+ENCODERS = {
+    "png": ("PNG", ".png"),
+    "png8": ("PNG", ".png"),
+    "jpeg": ("JPEG", ".jpg"),
+    "webp": ("WEBP", ".webp"),
+}
+DEFAULT_QUALITY = {"jpeg": 85, "webp": 80}
+
+
+@dataclass(frozen=True)
+class ImageFormat:
+    """How slides are encoded: png (optimized), png8 (quantized to 256 colours),
+    progressive jpeg or webp, with a quality for the lossy ones."""
+
+    name: str = "png"
+    quality: int = 0
+
+    def __post_init__(self):
+        if self.name not in ENCODERS:
+            raise ValueError(f"Unknown image format {self.name!r}")
+
+    @property
+    def extension(self):
+        return ENCODERS[self.name][1]
+
+    @property
+    def spec(self):
+        return f"{self.name}:{self.quality}" if self.quality else self.name
+
+
+def parse_image_format(spec):
+    """Parses 'png', 'png8', 'jpeg:85' or 'webp:80' into an ImageFormat."""
+    name, _, quality = spec.strip().lower().partition(":")
+    name = {"jpg": "jpeg"}.get(name, name)
+    return ImageFormat(name, int(quality) if quality else DEFAULT_QUALITY.get(name, 0))
+
+
+def default_image_format():
+    """Format from the COUNTY_IMAGE_FORMAT environment variable, else optimized PNG."""
+    return parse_image_format(os.environ.get("COUNTY_IMAGE_FORMAT", "png"))
+
+
+def as_image_format(value):
+    """An ImageFormat from None (the default), a spec string or an ImageFormat."""
+    if value is None:
+        return default_image_format()
+    if isinstance(value, str):
+        return parse_image_format(value)
+    return value
+
+
+def encode_image(image, image_format=None):
+    """Encodes an image; returns (bytes, seconds taken)."""
+    image_format = as_image_format(image_format)
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    pil_format = ENCODERS[image_format.name][0]
+    match image_format.name:
+        case "png":
+            image.save(buffer, format=pil_format, optimize=True)
+        case "png8":
+            quantized = image.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+            quantized.save(buffer, format=pil_format, optimize=True)
+        case "jpeg":
+            image.save(
+                buffer,
+                format=pil_format,
+                quality=image_format.quality,
+                optimize=True,
+                progressive=True,
+            )
+        case "webp":
+            image.save(
+                buffer, format=pil_format, quality=image_format.quality, method=6
+            )
+    return buffer.getvalue(), time.perf_counter() - start
+
+
+def compare_formats(image, image_formats):
+    """Encodes one image in each format; returns spec, byte size and seconds for each."""
+    report = []
+    for image_format in image_formats:
+        data, seconds = encode_image(image, image_format)
+        report.append(
+            {"format": image_format.spec, "bytes": len(data), "seconds": seconds}
+        )
+    return report
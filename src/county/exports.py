@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import threading
+
+from .publish import publish
+
+JSON_INDEX_PATH = "outputs/json/index.json"
+_index_lock = threading.Lock()
+
+
+def division_json_path(division_id):
+    return f"outputs/json/division_{division_id}.json"
+
+
+def team_json_path(team_id):
+    return f"outputs/json/team_{team_id}.json"
+
+
+def _standing(team):
+    return {
+        "team_id": team.id,
+        "name": team.name,
+        "league_rank": team.league_rank,
+        "played": team.played,
+        "won": team.won,
+        "drawn": team.drawn,
+        "lost": team.lost,
+        "goals_for": team.goals_for,
+        "points_for": team.points_for,
+        "goals_against": team.goals_against,
+        "points_against": team.points_against,
+        "scoring_difference_x_wo": team.scoring_difference_x_wo,
+        "league_points": team.league_points,
+    }
+
+
+def _match(match):
+    document = {
+        "match_id": match.id,
+        "stage": match.stage,
+        "round": match.round,
+        "date": match.date.isoformat() if match.date else None,
+        "time": match.time.strftime("%H:%M") if match.time else None,
+        "home_team_id": match.home_team_id,
+        "home_team": match.home_team_name,
+        "away_team_id": match.away_team_id,
+        "away_team": match.away_team_name,
+        "venue": match.venue_name,
+        "referee": match.referee_name,
+    }
+    if match.has_result:
+        document.update(
+            home_goals=match.home_goals,
+            home_points=match.home_points,
+            away_goals=match.away_goals,
+            away_points=match.away_points,
+            walkover=bool(match.walkover),
+            winner_id=match.winner_id,
+        )
+    return document
+
+
+def etag(*parts):
+    """Strong ETag over the data a document is built from."""
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+    return f'"{digest}"'
+
+
+def _split(matches):
+    results = [_match(m) for m in matches if m.has_result]
+    fixtures = [_match(m) for m in matches if not m.has_result and m.date]
+    return results, fixtures
+
+
+def division_document(snapshot):
+    """Standings, results and fixtures of a division, with its ETag."""
+    results, fixtures = _split(snapshot.matches)
+    return {
+        "etag": etag("division", snapshot.version),
+        "division_id": snapshot.id,
+        "division": snapshot.name,
+        "competition": snapshot.competition_name,
+        "standings": [
+            {
+                "group_id": group.id,
+                "group": group.name,
+                "teams": [_standing(team) for team in group.teams],
+            }
+            for group in snapshot.groups
+        ],
+        "results": results,
+        "fixtures": fixtures,
+    }
+
+
+def team_documents(snapshot):
+    """Yields the document of every team in a division, each with its own ETag.
+
+    A team's ETag covers only its own standing and matches, so a result
+    elsewhere in the division leaves it, and the file, unchanged.
+    """
+    matches_by_team = {}
+    for match in snapshot.matches:
+        for team_id in (match.home_team_id, match.away_team_id):
+            matches_by_team.setdefault(team_id, []).append(match)
+    for group in snapshot.groups:
+        for team in group.teams:
+            matches = matches_by_team.get(team.id, [])
+            results, fixtures = _split(matches)
+            yield {
+                "etag": etag("team", snapshot.id, group.name, team, matches),
+                "team_id": team.id,
+                "name": team.name,
+                "clubs": list(team.club_names),
+                "division_id": snapshot.id,
+                "division": snapshot.name,
+                "group": group.name,
+                "standing": _standing(team),
+                "results": results,
+                "fixtures": fixtures,
+            }
+
+
+def dumps(document):
+    """Compact JSON encoding used for every exported document."""
+    return json.dumps(document, separators=(",", ":"), ensure_ascii=False)
+
+
+def division_exports(snapshot):
+    """Maps each output path of a division's JSON documents to its document."""
+    exports = {division_json_path(snapshot.id): division_document(snapshot)}
+    for document in team_documents(snapshot):
+        exports[team_json_path(document["team_id"])] = document
+    return exports
+
+
+def write_json_exports(snapshots, manifest, force=False, compress=None):
+    """Publishes the JSON documents of the given division snapshots.
+
+    Documents whose ETag matches the manifest are skipped. outputs/json/index.json
+    maps every document ever exported to its current ETag, so clients can poll
+    one small file. Returns the paths written.
+    """
+    etags = {}
+    written = []
+    for snapshot in snapshots:
+        for fname, document in division_exports(snapshot).items():
+            etags[fname.removeprefix("outputs/json/")] = document["etag"]
+            if not force and manifest.is_current(fname, document["etag"], compress):
+                continue
+            publish(fname, dumps(document), compress)
+            manifest.set(fname, document["etag"])
+            written.append(fname)
+    # Read, merge and rewrite in one go, so concurrent exports keep each other's entries
+    with _index_lock:
+        index = {}
+        if os.path.exists(JSON_INDEX_PATH):
+            with open(JSON_INDEX_PATH) as file:
+                index = json.load(file)
+        index.update(etags)
+        if publish(JSON_INDEX_PATH, dumps(dict(sorted(index.items()))), compress):
+            written.append(JSON_INDEX_PATH)
+    return written
@@ -0,0 +1,383 @@
+import hashlib
+import logging
+import os
+from dataclasses import replace
+from datetime import timedelta
+
+from .assets import asset_version, font, paste_logo
+from .encoders import as_image_format, encode_image
+from .layout import Block, Column, SlideLayout, render_slides
+from .publish import publish
+from .textfit import fit_text
+from .tracing import traced
+
+# Bump whenever the slide drawing changes so that existing images are redrawn
+IMAGE_LAYOUT_VERSION = 2
+
+# Geometry shared by the results and fixtures slides
+LEFT = 50
+RIGHT = 1030
+CENTRE = 540
+TABLE_ROW = 40
+TABLE_BASELINE = 31
+SECTION_GAP = 20
+DATE_HEADING = 50
+
+# Team names are fitted to the space between their anchor and the next column
+NAME_FONT = ("klima-regular-web.ttf", 30)
+TABLE_NAME_WIDTH = 430  # x=140 up to the P column
+RESULT_NAME_WIDTH = 335  # Between the logo and the score boxes
+FIXTURE_NAME_WIDTH = 375  # Between the logo and the "v"
+
+# define background colours
+TABLE_HEAD_BG = "#ffffffbf"  # "rgba(255, 255, 255, 0.75)"
+ROW_BG_ODD = "#2d8c3380"  # rgba(45, 140, 51, 0.5)"
+ROW_BG_EVEN = "#ffffff33"  # "rgba(255, 255, 255, 0.2)"
+RESULT_BG = "#ffffff80"  # "rgba(255, 255, 255, 0.5)"
+
+TABLE_COLUMNS = (
+    Column("P", 600, lambda team: str(team.played)),
+    Column("W", 640, lambda team: str(team.won)),
+    Column("D", 680, lambda team: str(team.drawn)),
+    Column("L", 720, lambda team: str(team.lost)),
+    Column("F", 785, lambda team: f"{team.goals_for}-{team.points_for}"),
+    Column("A", 875, lambda team: f"{team.goals_against}-{team.points_against}"),
+    Column("+/-", 950, lambda team: str(team.scoring_difference_x_wo)),
+    Column("Pts", 1005, lambda team: str(team.league_points)),
+)
+
+RESULTS_LAYOUT = SlideLayout(title_gap=20)
+FIXTURES_LAYOUT = SlideLayout(title_gap=30)
+
+
+def _date_range(start_date, days=0):
+    date_range = [start_date]
+    if days > 0:
+        date_range.extend(start_date + timedelta(days=i) for i in range(1, days + 1))
+    return date_range
+
+
+def _is_result(match):
+    return match.walkover or all(
+        score is not None and score >= 0
+        for score in (
+            match.home_goals,
+            match.away_goals,
+            match.home_points,
+            match.away_points,
+        )
+    )
+
+
+def _matches_by_date(snapshot, date_range, predicate=None):
+    """Groups the division's matches within date_range by date, in a single pass."""
+    wanted = set(date_range)
+    by_date = {}
+    for match in snapshot.matches:
+        if match.date in wanted and (predicate is None or predicate(match)):
+            by_date.setdefault(match.date, []).append(match)
+    return by_date
+
+
+def slide_path(fname, number):
+    """Path of a carousel's nth slide; the first keeps the plain name."""
+    if number == 1:
+        return fname
+    root, ext = os.path.splitext(fname)
+    return f"{root}_{number}{ext}"
+
+
+def results_image_path(snapshot, start_date, days=0, extension=".png"):
+    end_date = _date_range(start_date, days)[-1]
+    return f"outputs/results_{snapshot.name}_{end_date.strftime('%Y%m%d')}{extension}"
+
+
+def fixtures_image_path(snapshot, start_date, days=0, extension=".png"):
+    start = start_date.strftime("%A %d %B %Y")
+    return f"outputs/fixtures_{snapshot.name}_{start}{extension}"
+
+
+def existing_slides(fname):
+    """Paths of the slides of an image that are already in outputs/."""
+    fnames = []
+    while os.path.exists(slide := slide_path(fname, len(fnames) + 1)):
+        fnames.append(slide)
+    return fnames
+
+
+def shows_matches(kind, snapshot, start_date, days=0):
+    """True if a results or fixtures image would list any matches in its date range."""
+    predicate = _is_result if kind == "results" else None
+    date_range = _date_range(start_date, days)
+    return bool(_matches_by_date(snapshot, date_range, predicate))
+
+
+def image_version(kind, snapshot, start_date, days=0, image_format=None):
+    """Hash of everything a results or fixtures image is drawn from.
+
+    Covers the division's standings, the matches shown in the date range, the
+    assets under data/, IMAGE_LAYOUT_VERSION and the output encoding, so an
+    unchanged image can be skipped without rendering it.
+    """
+    date_range = _date_range(start_date, days)
+    predicate = _is_result if kind == "results" else None
+    by_date = _matches_by_date(snapshot, date_range, predicate)
+    data = (
+        IMAGE_LAYOUT_VERSION,
+        kind,
+        as_image_format(image_format).spec,
+        asset_version(),
+        _title(snapshot),
+        snapshot.groups,
+        [(match_date, by_date.get(match_date)) for match_date in date_range],
+    )
+    return hashlib.sha256(repr(data).encode("utf-8")).hexdigest()[:16]
+
+
+def _title(division):
+    # Add uppercase division name as title
+    if division.competition_id < 3:
+        return f"{division.competition_name.upper()} {division.name.upper()}"
+    return division.name.upper()
+
+
+def _table_block(division, group):
+    """A group's league table, drawn as one block so it is never split."""
+    font_section = font("klima-medium-web.ttf", 30)
+    font_stats = font("klima-light-web.ttf", 30)
+    heading = group.name if len(division.groups) > 1 else division.name
+
+    def draw_table(slide, y):
+        draw = slide.draw
+        # Header row
+        draw.rectangle([LEFT, y, RIGHT, y + TABLE_ROW], fill=TABLE_HEAD_BG)
+        baseline = y + TABLE_BASELINE
+        draw.text((60, baseline), heading, font=font_section, fill="black", anchor="ls")
+        for column in TABLE_COLUMNS:
+            draw.text(
+                (column.x, baseline),
+                column.label,
+                font=font_stats,
+                fill="black",
+                anchor="ms",
+            )
+
+        for team in group.teams:
+            y += TABLE_ROW
+            baseline = y + TABLE_BASELINE
+            draw.rectangle(
+                [LEFT, y, RIGHT, y + TABLE_ROW],
+                fill=(ROW_BG_EVEN if team.league_rank % 2 == 0 else ROW_BG_ODD),
+            )
+            draw.text(
+                (70, baseline),
+                str(team.league_rank),
+                font=font_stats,
+                fill="white",
+                anchor="ms",
+            )
+            paste_logo(slide.image, team.club_ids, team.club_names, (95, y + 5))
+            name, name_font = fit_text(team.name, *NAME_FONT, TABLE_NAME_WIDTH)
+            draw.text((140, baseline), name, font=name_font, fill="white", anchor="ls")
+            for column in TABLE_COLUMNS:
+                draw.text(
+                    (column.x, baseline),
+                    column.value(team),
+                    font=font_stats,
+                    fill="white",
+                    anchor="ms",
+                )
+
+    height = TABLE_ROW * (len(group.teams) + 1)
+    return Block(height, draw_table, gap=SECTION_GAP)
+
+
+def _date_block(match_date):
+    """The date heading above a day's matches; never left at the foot of a slide."""
+    font_subtitle = font("klima-medium-italic-web.ttf", 40)
+    date_str = match_date.strftime("%A %d %B %Y")
+
+    def draw_date(slide, y):
+        slide.draw.text(
+            (CENTRE, y + 35),
+            date_str,
+            font=font_subtitle,
+            fill="lightgray",
+            anchor="ms",
+        )
+
+    return Block(DATE_HEADING, draw_date, keep_with_next=True)
+
+
+def _scores(result):
+    if result.walkover:
+        home_score = "W/O" if result.winner_id == result.home_team_id else "X"
+        away_score = "W/O" if result.winner_id == result.away_team_id else "X"
+        return home_score, away_score
+    return (
+        f"{result.home_goals}-{result.home_points:02}",
+        f"{result.away_goals}-{result.away_points:02}",
+    )
+
+
+def _result_block(result):
+    font_name = font(*NAME_FONT)
+    home_name, home_font = fit_text(
+        result.home_team_name, *NAME_FONT, RESULT_NAME_WIDTH
+    )
+    away_name, away_font = fit_text(
+        result.away_team_name, *NAME_FONT, RESULT_NAME_WIDTH
+    )
+    home_score, away_score = _scores(result)
+
+    def draw_result(slide, y):
+        draw = slide.draw
+        bottom = y + 50
+        baseline = y + 36
+        draw.rectangle([LEFT, y, RIGHT, bottom], fill=RESULT_BG)
+        draw.rectangle([440, y, 530, bottom], fill="white")
+        draw.rectangle([550, y, 640, bottom], fill="white")
+        paste_logo(
+            slide.image, result.home_club_ids, result.home_club_names, (60, y + 10)
+        )
+        draw.text((100, baseline), home_name, font=home_font, fill="black", anchor="ls")
+        draw.text(
+            (485, baseline), home_score, font=font_name, fill="black", anchor="ms"
+        )
+        draw.text(
+            (595, baseline), away_score, font=font_name, fill="black", anchor="ms"
+        )
+        draw.text((980, baseline), away_name, fill="black", anchor="rs", font=away_font)
+        paste_logo(
+            slide.image, result.away_club_ids, result.away_club_names, (990, y + 10)
+        )
+
+    return Block(50, draw_result, gap=20)
+
+
+def _fixture_block(fixture):
+    font_name = font(*NAME_FONT)
+    font_info = font("klima-light-italic-web.ttf", 20)
+    home_name, home_font = fit_text(
+        fixture.home_team_name or "TBC", *NAME_FONT, FIXTURE_NAME_WIDTH
+    )
+    away_name, away_font = fit_text(
+        fixture.away_team_name or "TBC", *NAME_FONT, FIXTURE_NAME_WIDTH
+    )
+    match_time = fixture.time.strftime("%H:%M") if fixture.time else "TBC"
+    if fixture.referee_name:
+        match_info = f"Venue: {fixture.venue_name} - Referee: {fixture.referee_name} ({fixture.referee_club_name})"
+    else:
+        match_info = f"{fixture.venue_name}"
+
+    def draw_fixture(slide, y):
+        draw = slide.draw
+        baseline = y + 31
+        draw.rectangle([LEFT, y, RIGHT, y + 60], fill=RESULT_BG)
+        paste_logo(
+            slide.image, fixture.home_club_ids, fixture.home_club_names, (150, y + 5)
+        )
+        draw.text((60, baseline), match_time, font=font_name, fill="black", anchor="ls")
+        draw.text((190, baseline), home_name, font=home_font, fill="black", anchor="ls")
+        draw.text((585, baseline), "v", font=font_name, fill="black", anchor="ms")
+        draw.text((980, baseline), away_name, fill="black", anchor="rs", font=away_font)
+        paste_logo(
+            slide.image, fixture.away_club_ids, fixture.away_club_names, (990, y + 5)
+        )
+        draw.text(
+            (585, baseline + 22),
+            match_info,
+            font=font_info,
+            fill="black",
+            anchor="ms",
+        )
+
+    return Block(60, draw_fixture, gap=10)
+
+
+def _dated_blocks(matches_by_date, date_range, block):
+    blocks = []
+    for match_date in date_range:
+        if matches := matches_by_date.get(match_date):
+            heading = _date_block(match_date)
+            blocks.append(heading)
+            blocks.extend(replace(block(match), heading=heading) for match in matches)
+    return blocks
+
+
+@traced
+def render_division_results(snapshot, start_date, days=0):
+    """Renders the Instagram slides with results and tables for a division.
+
+    The tables come first, then each day's results; a busy weekend continues
+    onto further slides. Returns the list of slide images.
+    """
+    date_range = _date_range(start_date, days)
+    blocks = [_table_block(snapshot, group) for group in snapshot.groups]
+    blocks += _dated_blocks(
+        _matches_by_date(snapshot, date_range, _is_result), date_range, _result_block
+    )
+    return render_slides(_title(snapshot), blocks, RESULTS_LAYOUT)
+
+
+@traced
+def render_division_fixtures(snapshot, start_date, days=0):
+    """Renders the Instagram slides with fixtures and tables for a division.
+
+    Returns the list of slide images.
+    """
+    date_range = _date_range(start_date, days)
+    blocks = [_table_block(snapshot, group) for group in snapshot.groups]
+    blocks += _dated_blocks(
+        _matches_by_date(snapshot, date_range), date_range, _fixture_block
+    )
+    return render_slides(_title(snapshot), blocks, FIXTURES_LAYOUT)
+
+
+@traced
+def _publish_slides(fname, slides, image_format):
+    fnames = []
+    for number, slide in enumerate(slides, 1):
+        fnames.append(slide_path(fname, number))
+        data, seconds = encode_image(slide, image_format)
+        logging.info(
+            "Encoded %s as %s: %d bytes in %.0f ms",
+            fnames[-1],
+            image_format.spec,
+            len(data),
+            seconds * 1000,
+        )
+        publish(fnames[-1], data)
+    # Remove slides left over from an earlier, longer carousel
+    number = len(slides) + 1
+    while os.path.exists(stale := slide_path(fname, number)):
+        os.remove(stale)
+        number += 1
+    return fnames
+
+
+def write_division_results(snapshot, start_date, days=0, image_format=None):
+    """Renders and publishes a division's results slides; returns their paths.
+
+    image_format is an ImageFormat or spec such as 'webp:80'; by default
+    COUNTY_IMAGE_FORMAT, else optimized PNG.
+    """
+    image_format = as_image_format(image_format)
+    fname = results_image_path(snapshot, start_date, days, image_format.extension)
+    slides = render_division_results(snapshot, start_date, days)
+    return _publish_slides(fname, slides, image_format)
+
+
+def write_division_fixtures(snapshot, start_date, days=0, image_format=None):
+    """Renders and publishes a division's fixtures slides; returns their paths."""
+    image_format = as_image_format(image_format)
+    fname = fixtures_image_path(snapshot, start_date, days, image_format.extension)
+    slides = render_division_fixtures(snapshot, start_date, days)
+    return _publish_slides(fname, slides, image_format)
+
+
+# Output path and writer of each kind of image
+IMAGE_KINDS = {
+    "results": (results_image_path, write_division_results),
+    "fixtures": (fixtures_image_path, write_division_fixtures),
+}
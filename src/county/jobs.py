@@ -0,0 +1,172 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# The running RegenerationQueue, or None when writes regenerate nothing
+_queue = None
+
+
+class RegenerationQueue:
+    """Coalesces "division dirty" events and regenerates outputs in the background.
+
+    Events for a division are merged until none has arrived for `debounce`
+    seconds; all divisions ready at that point go to `regenerate` as one job
+    of {division_id: (results dates, fixture dates)}, run on a pool of
+    `workers` threads. Results dates are those of new results and fixture
+    dates those of amended matches, before and after the change.
+    A division is never in two jobs at once: events arriving while it is being
+    regenerated wait for the next job.
+    """
+
+    def __init__(self, regenerate, debounce=2.0, workers=2):
+        self.regenerate = regenerate
+        self.debounce = debounce
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="regenerate")
+        # division id -> [results dates, fixture dates, first event, last event]
+        self.pending = {}
+        self.running = set()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.stats = {"events": 0, "coalesced": 0, "jobs": 0, "failed": 0}
+        self.latencies = deque(maxlen=1000)  # first event -> job done, seconds
+        self.dispatcher = threading.Thread(
+            target=self._dispatch, name="regenerate-dispatch", daemon=True
+        )
+        self.dispatcher.start()
+
+    def mark_dirty(self, division_id, dates=(), fixture_dates=()):
+        now = time.monotonic()
+        with self.condition:
+            self.stats["events"] += 1
+            if (entry := self.pending.get(division_id)) is not None:
+                self.stats["coalesced"] += 1
+                entry[0].update(dates)
+                entry[1].update(fixture_dates)
+                entry[3] = now
+            else:
+                self.pending[division_id] = [set(dates), set(fixture_dates), now, now]
+            self.condition.notify()
+
+    def _ready(self, now):
+        return [
+            division_id
+            for division_id, (_, _, _, last) in self.pending.items()
+            if now - last >= self.debounce and division_id not in self.running
+        ]
+
+    def _dispatch(self):
+        with self.condition:
+            while not self.closed:
+                now = time.monotonic()
+                if ready := self._ready(now):
+                    job = {}
+                    started = []
+                    for division_id in ready:
+                        dates, fixture_dates, first, _ = self.pending.pop(division_id)
+                        job[division_id] = (dates, fixture_dates)
+                        started.append(first)
+                    self.running.update(job)
+                    self.pool.submit(self._run, job, min(started))
+                    continue
+                waits = [
+                    last + self.debounce - now
+                    for division_id, (_, _, _, last) in self.pending.items()
+                    if division_id not in self.running
+                ]
+                self.condition.wait(max(min(waits), 0.01) if waits else None)
+
+    def _run(self, job, first_event):
+        try:
+            self.regenerate(job)
+            outcome = "jobs"
+        except Exception:
+            logging.exception("Regenerating divisions %s failed", sorted(job))
+            outcome = "failed"
+        with self.condition:
+            self.running.difference_update(job)
+            self.stats[outcome] += 1
+            self.latencies.append(time.monotonic() - first_event)
+            self.condition.notify_all()
+
+    def metrics(self):
+        """Queue depth, jobs in flight, event and job counts, and job latency."""
+        with self.condition:
+            latencies = sorted(self.latencies)
+            metrics = {
+                "depth": len(self.pending),
+                "running": len(self.running),
+                **self.stats,
+            }
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("max", 1.0)):
+            index = min(len(latencies) - 1, int(fraction * len(latencies)))
+            metrics[f"latency_{name}"] = latencies[index] if latencies else None
+        return metrics
+
+    def flush(self, timeout=None):
+        """Waits until every pending division has been regenerated; True if it was."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while self.pending or self.running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def close(self, flush=True):
+        if flush:
+            self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.dispatcher.join()
+        self.pool.shutdown()
+
+
+def queue_running():
+    return _queue is not None
+
+
+def mark_dirty(division_ids, dates=(), fixture_dates=()):
+    """Queues divisions for regeneration; does nothing without a running queue."""
+    if _queue is not None:
+        for division_id in division_ids:
+            _queue.mark_dirty(division_id, dates, fixture_dates)
+
+
+def defer_dirty(session, division_ids, dates=(), fixture_dates=()):
+    """Marks divisions dirty once session commits, so jobs never see old data."""
+    if _queue is not None:
+        dirty = session.info.setdefault("dirty_divisions", {})
+        for division_id in division_ids:
+            results, fixtures = dirty.setdefault(division_id, (set(), set()))
+            results.update(d for d in dates if d)
+            fixtures.update(d for d in fixture_dates if d)
+
+
+def after_commit(session):
+    for division_id, (dates, fixture_dates) in session.info.pop(
+        "dirty_divisions", {}
+    ).items():
+        mark_dirty([division_id], dates, fixture_dates)
+
+
+def start_queue(regenerate, debounce=2.0, workers=2):
+    global _queue
+    if _queue is None:
+        _queue = RegenerationQueue(regenerate, debounce, workers)
+    return _queue
+
+
+def stop_queue(flush=True):
+    global _queue
+    queue, _queue = _queue, None
+    if queue is not None:
+        queue.close(flush)
+    return queue
+
+
+def queue_metrics():
+    return None if _queue is None else _queue.metrics()
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from PIL import Image, ImageDraw
+
+from .assets import background, font
+
+SLIDE_SIZE = (1080, 1350)
+TITLE_Y = 100  # Baseline of the slide title
+BOTTOM_MARGIN = 30
+
+
+@dataclass(frozen=True)
+class Column:
+    """A table column: its header label, x position and how to get its text."""
+
+    label: str
+    x: int
+    value: Callable
+
+
+@dataclass(frozen=True)
+class Block:
+    """A horizontal band of a slide: its height, the gap below it and how to draw it.
+
+    draw(slide, y) paints the band with its top edge at y. A block that keeps
+    with the next one is never left alone at the bottom of a slide, and a
+    block with a heading repeats that heading when it starts a new slide.
+    """
+
+    height: int
+    draw: Callable
+    gap: int = 0
+    keep_with_next: bool = False
+    heading: Optional["Block"] = None
+
+
+@dataclass(frozen=True)
+class Slide:
+    image: Image.Image
+    draw: ImageDraw.ImageDraw
+
+
+@dataclass(frozen=True)
+class SlideLayout:
+    title_gap: int  # Space between the title baseline and the first block
+    size: tuple = SLIDE_SIZE
+    bottom_margin: int = BOTTOM_MARGIN
+
+    @property
+    def top(self):
+        return TITLE_Y + self.title_gap
+
+    @property
+    def bottom(self):
+        return self.size[1] - self.bottom_margin
+
+
+def _chains(blocks):
+    """Runs of blocks that must stay on one slide."""
+    chains, chain = [], []
+    for block in blocks:
+        chain.append(block)
+        if not block.keep_with_next:
+            chains.append(chain)
+            chain = []
+    if chain:
+        chains.append(chain)
+    return chains
+
+
+def paginate(blocks, layout):
+    """Splits blocks into slides using their measured heights alone.
+
+    A chain of blocks that does not fit below the previous one starts a new
+    slide, under its heading if it has one; a chain taller than a whole slide
+    gets a slide to itself.
+    """
+    slides = [[]]
+    y = layout.top
+    for chain in _chains(blocks):
+        extent = sum(block.height + block.gap for block in chain) - chain[-1].gap
+        if slides[-1] and y + extent > layout.bottom:
+            slides.append([])
+            y = layout.top
+            if (heading := chain[0].heading) is not None:
+                slides[-1].append(heading)
+                y += heading.height + heading.gap
+        slides[-1].extend(chain)
+        y += extent + chain[-1].gap
+    return slides
+
+
+def render_slides(title, blocks, layout):
+    """Renders blocks onto as many slides as they need, each in a single pass.
+
+    Every slide gets the background and title; a carousel also gets n/total
+    in the bottom corner. Returns the slide images.
+    """
+    pages = paginate(blocks, layout)
+    width, height = layout.size
+    slides = []
+    for number, page in enumerate(pages, 1):
+        image = Image.new("RGB", layout.size, color="white")
+        image.paste(background(), (0, 0))  # Paste background image
+        draw = ImageDraw.Draw(image, "RGBA")
+        draw.text(
+            (width // 2, TITLE_Y),
+            title,
+            font=font("klima-bold-web.ttf", 60),
+            fill="white",
+            anchor="ms",
+        )
+        if len(pages) > 1:
+            draw.text(
+                (width - 50, height - 10),
+                f"{number}/{len(pages)}",
+                font=font("klima-light-italic-web.ttf", 20),
+                fill="white",
+                anchor="rs",
+            )
+        slide = Slide(image, draw)
+        y = layout.top
+        for block in page:
+            block.draw(slide, y)
+            y += block.height + block.gap
+        slides.append(image)
+    return slides
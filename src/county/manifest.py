@@ -0,0 +1,51 @@
+import json
+import os
+import threading
+
+from .publish import siblings_current, write_atomic
+
+DEFAULT_MANIFEST_PATH = "outputs/.manifest.json"
+_save_lock = threading.Lock()
+
+
+class Manifest:
+    """Records the data version each output file was last built from."""
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.versions = self._load()
+        self.changed = {}
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path) as file:
+                return json.load(file)
+        return {}
+
+    def is_current(self, output_path, version, compress=None):
+        """True if output_path exists, was built from this version and has the
+        precompressed siblings that compress (default: COUNTY_PRECOMPRESS) asks for.
+        """
+        return (
+            self.versions.get(output_path) == version
+            and os.path.exists(output_path)
+            and siblings_current(output_path, compress)
+        )
+
+    def get(self, output_path):
+        return self.versions.get(output_path)
+
+    def set(self, output_path, version):
+        self.versions[output_path] = version
+        self.changed[output_path] = version
+
+    def save(self):
+        """Writes the versions set here over the latest saved ones.
+
+        Merging keeps entries saved meanwhile by another Manifest, e.g. from a
+        background regeneration job.
+        """
+        with _save_lock:
+            self.versions = {**self._load(), **self.changed}
+            data = json.dumps(self.versions, indent=1, sort_keys=True)
+            write_atomic(self.path, data.encode("utf-8"))
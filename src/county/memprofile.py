@@ -0,0 +1,140 @@
+import atexit
+import json
+import logging
+import os
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+
+from .publish import write_atomic
+
+# The active MemoryProfile, or None when profiling is off
+_profile = None
+_NO_PHASE = nullcontext()
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+MB = 1024 * 1024
+
+
+@dataclass
+class Phase:
+    name: str
+    retained: int  # Bytes still allocated at the end, relative to the start
+    peak: int  # Highest bytes allocated during the phase
+    top: list = field(default_factory=list)  # [(site, bytes retained, count)]
+
+
+class MemoryProfile:
+    """Peak and retained memory, with the top allocation sites, for each phase.
+
+    A phase is an outermost public call (add_clubs, add_new_results,
+    update_all_tables, generate_all_pages, ...) or a phase() block. Built on
+    tracemalloc, which slows Python down noticeably, so it is opt-in.
+    """
+
+    def __init__(self, top=5):
+        self.top = top
+        self.phases = []
+        self._depth = 0
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name):
+        # Nested phases are part of the outer one; resetting the peak would lose it
+        self._depth += 1
+        if self._depth > 1:
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+        tracemalloc.reset_peak()
+        start_size = tracemalloc.get_traced_memory()[0]
+        before = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            size, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+            top = [
+                (str(stat.traceback), stat.size_diff, stat.count_diff)
+                for stat in after.compare_to(before, "lineno")[: self.top]
+            ]
+            self.phases.append(Phase(name, size - start_size, peak - start_size, top))
+
+    def close(self):
+        if self._started:
+            tracemalloc.stop()
+
+    def report(self):
+        """The phases as text: retained and peak MB, then the top allocation sites."""
+        lines = []
+        for phase in self.phases:
+            lines.append(
+                f"{phase.name}: peak {phase.peak / MB:.1f} MB, "
+                f"retained {phase.retained / MB:+.1f} MB"
+            )
+            for site, size, count in phase.top:
+                lines.append(f"  {size / MB:+8.2f} MB {count:+8d} blocks  {site}")
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        data = json.dumps([asdict(phase) for phase in self.phases], indent=1)
+        write_atomic(path, data.encode("utf-8"))
+        return path
+
+
+def phase(name):
+    """A context manager profiling a block as a phase; does nothing when profiling is off."""
+    if _profile is None:
+        return _NO_PHASE
+    return _profile.phase(name)
+
+
+def start_memory_profiling(top=5):
+    """Starts tracemalloc and profiles each phase from now on; returns the MemoryProfile."""
+    global _profile
+    if _profile is None:
+        _profile = MemoryProfile(top)
+    return _profile
+
+
+def stop_memory_profiling():
+    """Stops profiling; returns the MemoryProfile with the phases so far, if any."""
+    global _profile
+    profile, _profile = _profile, None
+    if profile is not None:
+        profile.close()
+    return profile
+
+
+@contextmanager
+def memory_profiling(top=5):
+    """Profiles the phases inside the block; yields the MemoryProfile."""
+    profile = start_memory_profiling(top)
+    try:
+        yield profile
+    finally:
+        stop_memory_profiling()
+
+
+def _profile_to_file(path):
+    if (profile := stop_memory_profiling()) is not None:
+        profile.write_json(path)
+        logging.info("Memory profile written to %s\n%s", path, profile.report())
+
+
+# COUNTY_MEMPROFILE=<path> profiles the whole run and writes the phases on exit.
+# Render workers inherit the variable, so only the process that first saw it profiles.
+if profile_path := os.environ.get("COUNTY_MEMPROFILE"):
+    owner = os.environ.setdefault("COUNTY_MEMPROFILE_PID", str(os.getpid()))
+    if owner == str(os.getpid()):
+        start_memory_profiling()
+        atexit.register(_profile_to_file, profile_path)
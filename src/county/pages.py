@@ -0,0 +1,838 @@
+import hashlib
+import re
+from collections import defaultdict
+from datetime import date
+from functools import cache
+from urllib.parse import quote
+
+from .publish import publish
+
+# Bump whenever the page markup changes so that existing pages are rebuilt
+PAGE_TEMPLATE_VERSION = 3
+
+# Match dates shown on a division page; older and later rounds get archive pages
+RESULTS_WINDOW = 3
+FIXTURES_WINDOW = 3
+
+# Shared by every division page and served as one cacheable file
+LEAGUE_PAGE_CSS = """
+        /* CSS styles */
+        body {
+            font-family: sans-serif;
+        }
+        .h2 {
+        font-family: "IBM Plex Sans", sans-serif;
+        font-size: 1.5rem;
+        font-weight: 600;
+        color: rgba(0, 102, 0, 1);
+        letter-spacing: 0;
+        line-height: 2rem;
+        margin-top: 20px;
+    }
+    .container {
+        grid-template-columns: 1fr; /* Single column for all screen sizes */
+        grid-gap: 20px; /* Gap between rows */
+    }
+
+    .table-row {
+        grid-column: 1;
+        grid-row: 1;
+    }
+
+    .fixtures-results-container { /* Styles for smaller screens */
+        display: grid;
+        grid-template-columns: 1fr; /* Single column */
+        grid-template-rows: auto auto; /* Two rows for Results and Fixtures */
+        grid-gap: 20px; /* Gap between rows */
+        grid-column: 1;
+        grid-row: 2;
+    }
+
+    .results-column {
+        grid-column: 1;
+        grid-row: 1;
+    }
+
+    .fixtures-column {
+        grid-column: 1;
+        grid-row: 2;
+    }
+
+    @media (min-width: 768px) { /* Example breakpoint - adjust as needed */
+        .fixtures-results-container {
+            grid-template-columns: 1fr 1fr; /* Two columns for Results and Fixtures */
+            grid-template-rows: auto; /* Single row */
+        }
+
+        .results-column {
+            grid-column: 1;
+            grid-row: 1;
+        }
+
+        .fixtures-column {
+            grid-column: 2;
+            grid-row: 1;
+        }
+    }
+    .results-container, .fixtures-container, .group-table-container {
+        display: grid; /* Ensure grid layout within containers */
+    }
+
+    .group-table { /* Apply grid display to the container */
+        display: grid;
+    }
+
+
+    .group-table .grid-row div {
+        padding-top: 7px;
+        padding-bottom: 9px;
+    }
+    .group-table .grid-row div.team {
+        padding-left: 20px;
+    }
+    .group-table .D, .group-table .GA, .group-table .GF, .group-table .L, .group-table .P, .group-table .PA, .group-table .PF, .group-table .W, .group-table .diff, .group-table .points, .group-table .rank {
+        text-align: center;
+        font-weight: 600;
+    }
+
+    .group-table .grid-row {
+        display: grid;
+        grid-template-columns: 1fr 6fr 1fr 1fr 1fr 1fr 1fr 1fr 1fr 1fr 1fr 1fr;
+        color: #000000;
+        font-family: "IBM Plex Sans", sans-serif;
+        font-size: 1rem;
+        letter-spacing: 0;
+        line-height: 1.25rem;
+    }
+    .group-table .grid-row.odd {
+        background-color: white;
+    }
+    .group-table .grid-row.even {
+        background-color: rgba(0, 102, 0, 0.1);
+    }
+    .group-table .grid-row.head {
+        display: grid;
+        color: white;
+        background-color: rgba(0, 102, 0, 1);
+        font-family: "IBM Plex Sans", sans-serif;
+        font-size: 1rem;
+        font-weight: 600;
+        letter-spacing: 0;
+        line-height: 1.25rem;
+        text-align: left;
+        height: 36px;
+        border-spacing: 0;
+        text-transform: capitalize;
+    }
+    .group-table .rank {
+      grid-column: 1;
+      grid-row: 1;
+    }
+    .group-table .team {
+      grid-column: 2;
+      grid-row: 1;
+    }
+    .group-table .P {
+      grid-column: 3;
+      grid-row: 1;
+    }
+    .group-table .W {
+      grid-column: 4;
+      grid-row: 1;
+    }
+    .group-table .D {
+      grid-column: 5;
+      grid-row: 1;
+    }
+    .group-table .L {
+      grid-column: 6;
+      grid-row: 1;
+    }
+
+    .group-table .GF {
+      grid-column: 7;
+      grid-row: 1;
+    }
+    .group-table .PF {
+      grid-column: 8;
+      grid-row: 1;
+    }
+    .group-table .GA {
+      grid-column: 9;
+      grid-row: 1;
+    }
+    .group-table .PA {
+      grid-column: 10;
+      grid-row: 1;
+    }
+
+    .group-table .diff {
+      grid-column: 11;
+      grid-row: 1;
+    }
+    .group-table .points {
+      grid-column: 12;
+      grid-row: 1;
+    }
+
+    td p {
+      text-align: center;
+    }
+
+    td h3 {
+      text-align: center;
+    }
+        /* Hide GF, PF, GA, PA on smaller screens */
+    @media (max-width: 600px) { /* Adjust breakpoint as needed */
+        .group-table .GF,
+        .group-table .PF,
+        .group-table .GA,
+        .group-table .PA {
+            display: none;
+        }
+
+        /* Adjust grid template columns for smaller screens */
+        .group-table .grid-row {
+            grid-template-columns: 1fr 6fr 1fr 1fr 1fr 1fr 1fr 1fr; /* Reduced number of columns */
+        }
+
+        .group-table .rank {
+          grid-column: 1;
+          grid-row: 1;
+        }
+        .group-table .team {
+          grid-column: 2;
+          grid-row: 1;
+        }
+        .group-table .P {
+          grid-column: 3;
+          grid-row: 1;
+        }
+        .group-table .W {
+          grid-column: 4;
+          grid-row: 1;
+        }
+        .group-table .D {
+          grid-column: 5;
+          grid-row: 1;
+        }
+        .group-table .L {
+          grid-column: 6;
+          grid-row: 1;
+        }
+
+        .group-table .diff {
+          grid-column: 7;
+          grid-row: 1;
+        }
+        .group-table .points {
+          grid-column: 8;
+          grid-row: 1;
+        }
+    }
+
+    .fixtures-container {
+        background-color: #EEECEC;
+        margin-top: 20px; /* top padding */
+    }
+
+    .fixtures-container .grid-row {
+        display: grid;
+        grid-template-columns: 5fr 1fr 5fr;
+        grid-template-areas: "home_fix vs away_fix";
+        color: #000000;
+        font-family: "IBM Plex Sans", sans-serif;
+        font-size: 1rem;
+        letter-spacing: 0;
+        line-height: 1rem;
+        padding-top: 7px; /* top padding */
+    }
+
+    .fixtures-container .grid-row.head {
+        color: white;
+        background-color: rgba(0, 102, 0, 1);
+        font-family: "IBM Plex Sans", sans-serif;
+        font-size: 1rem;
+        font-weight: 600;
+        letter-spacing: 0;
+        line-height: 1.25rem;
+        /* Vertically center and add left padding */
+        display: flex;
+        align-items: center; /* Vertical centering */
+        padding-left: 20px; /* Left padding */
+        height: 36px;
+        padding-top: 0; /* top padding */
+        border-spacing: 0;
+        text-transform: capitalize;
+    }
+
+    .fixtures-container h3.date { /* Target the date heading specifically */
+        margin: 0; /* Remove default margins */
+    }
+
+    .fixtures-container .H {
+        grid-area: home_fix;
+        padding-left: 20px;
+        text-align: left;
+        font-weight: 500;
+    }
+    .fixtures-container .A {
+        grid-area: away_fix;
+        padding-right: 20px;
+        text-align: right;
+        font-weight: 500;
+    }
+    .fixtures-container .vs {
+        grid-area: vs;
+        text-align: center;
+        font-weight: 400;
+    }
+
+        /* Style the footer row */
+    .fixtures-container .grid-row.footer {
+        display: grid;
+        grid-template-columns: 1fr;
+        padding-bottom: 7px;
+    }
+
+    .fixtures-container .footer-text {
+        grid-column: 1;
+        margin: 0; /* Remove default margins */
+        font-family: "IBM Plex Sans", sans-serif;
+        letter-spacing: 0;
+        line-height: 0.8rem;
+        text-align: center; /* Center the content */
+        font-size: 0.8rem; /* Smaller font size */
+        color: #444444; /* Lighter text color */
+        padding-bottom: 5px;
+    }
+    .fixtures-container > .grid-row > div { /* Select direct div children of grid-row */
+        margin: 0; /* Remove any default margins */
+    }
+
+    .fixtures-container > .grid-row > div > p { /* Select the <p> within the divs */
+        margin: 0; /* Remove default margins from the <p> */
+    }
+
+    .results-container {
+        background-color: #EEECEC;
+        margin-top: 20px; /* top padding */
+    }
+
+    .results-container h3.date { /* Target the date heading specifically */
+        margin: 0; /* Remove default margins */
+    }
+
+    .results-container .grid-row {
+        display: grid;
+        grid-template-columns: 6fr 2fr 2fr 6fr;
+        grid-template-areas: "r-home hs as r-away";
+        color: #000000;
+        font-family: "IBM Plex Sans", sans-serif;
+        font-size: 1rem;
+        letter-spacing: 0;
+        padding-top: 7px; /* top padding */
+        line-height: 1rem;
+    }
+
+    .results-container .grid-row.head {
+        color: white;
+        background-color: rgba(0, 102, 0, 1);
+        font-family: "IBM Plex Sans", sans-serif;
+        font-size: 1rem;
+        font-weight: 600;
+        letter-spacing: 0;
+        line-height: 1.25rem;
+        /* Vertically center and add left padding */
+        display: flex;
+        align-items: center; /* Vertical centering */
+        padding-left: 20px; /* Left padding */
+        height: 36px;
+        padding-top: 0; /* top padding */
+        border-spacing: 0;
+        text-transform: capitalize;
+    }
+
+    .results-container .H {
+        grid-area: r-home;
+        padding-left: 20px;
+        text-align: left;
+        font-weight: 500;
+    }
+    .results-container .HS {
+        grid-area: hs;
+        padding-right: 20px;
+        text-align: center;
+        font-weight: 400;
+    }
+    .results-container .AS {
+        grid-area: as;
+        padding-left: 20px;
+        text-align: center;
+        font-weight: 400;
+    }
+
+    .results-container .A {
+        grid-area: r-away;
+        padding-right: 20px;
+        text-align: right;
+        font-weight: 500;
+    }
+
+
+        /* Style the footer row */
+    .results-container .grid-row.footer {
+        display: grid;
+        grid-template-columns: 1fr;
+        padding-bottom: 7px;
+    }
+
+    .results-container .footer-text {
+        grid-column: 1;
+        margin: 0; /* Remove default margins */
+        font-family: "IBM Plex Sans", sans-serif;
+        letter-spacing: 0;
+        line-height: 0.8rem;
+        text-align: center; /* Center the content */
+        font-size: 0.8rem; /* Smaller font size */
+        color: #444444; /* Lighter text color */
+        padding-bottom: 5px;
+    }
+    .results-container > .grid-row > div { /* Select direct div children of grid-row */
+        margin: 0; /* Remove any default margins */
+    }
+
+    .results-container > .grid-row > div > p { /* Select the <p> within the divs */
+        margin: 0; /* Remove default margins from the <p> */
+    }
+
+    .archive-links {
+        font-family: "IBM Plex Sans", sans-serif;
+        font-size: 0.9rem;
+        color: #444444;
+    }
+    .archive-links a {
+        color: rgba(0, 102, 0, 1);
+        margin-right: 10px;
+    }
+
+"""
+
+
+def minify_css(css):
+    """Strips comments and insignificant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_html(html):
+    """Collapses the whitespace between and within tags of generated markup."""
+    html = re.sub(r">\s+<", "><", html)
+    return re.sub(r"\s+", " ", html).strip()
+
+
+@cache
+def stylesheet():
+    """Returns the minified stylesheet and its content-hashed file name."""
+    css = minify_css(LEAGUE_PAGE_CSS)
+    digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:10]
+    return css, f"league.{digest}.css"
+
+
+def stylesheet_name():
+    return stylesheet()[1]
+
+
+def write_stylesheet(compress=None):
+    """Publishes the shared stylesheet to outputs/ unless it is already there."""
+    css, name = stylesheet()
+    fname = f"outputs/{name}"
+    publish(fname, css, compress)
+    return fname
+
+
+def league_page_path(division_name):
+    return f"outputs/league_page_{division_name}.html"
+
+
+def round_key(match):
+    return (match.stage, match.round)
+
+
+def round_label(key):
+    stage, round_ = key
+    return f"Round {round_}" if stage == "group" else f"{stage.capitalize()} {round_}"
+
+
+def round_page_path(division_name, key):
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", "-".join(key)).strip("-").lower()
+    return f"outputs/league_page_{division_name}_{slug}.html"
+
+
+def href(fname):
+    """Link to an output file from another page in outputs/."""
+    return quote(fname.removeprefix("outputs/"))
+
+
+def split_matches(snapshot, today):
+    """Groups a division's results and fixtures by date and by round in one pass."""
+    results_by_date = defaultdict(list)
+    fixtures_by_date = defaultdict(list)
+    rounds = defaultdict(list)
+    for match in snapshot.matches:
+        if match.date is None:
+            continue
+        if match.date <= today:
+            if not match.has_result:
+                continue
+            results_by_date[match.date].append(match)
+        elif match.stage == "group":
+            fixtures_by_date[match.date].append(match)
+        else:
+            continue
+        rounds[round_key(match)].append(match)
+    return results_by_date, fixtures_by_date, rounds
+
+
+def archive_rounds(snapshot, today):
+    """Rounds with matches outside the division page's results or fixtures window.
+
+    Returns (earlier, later, rounds): the keys of rounds with results older than
+    the window, the keys of rounds with fixtures beyond it, and the matches of
+    every round.
+    """
+    results_by_date, fixtures_by_date, rounds = split_matches(snapshot, today)
+    old_dates = set(sorted(results_by_date, reverse=True)[RESULTS_WINDOW:])
+    later_dates = set(sorted(fixtures_by_date)[FIXTURES_WINDOW:])
+    # Rounds in the order they were first played
+    keys = sorted(rounds, key=lambda key: min(m.date for m in rounds[key]))
+    earlier = [key for key in keys if any(m.date in old_dates for m in rounds[key])]
+    later = [
+        key
+        for key in keys
+        if any(m.date in later_dates for m in rounds[key]) and key not in earlier
+    ]
+    return earlier, later, rounds
+
+
+def league_page_version(snapshot, today=None):
+    """Version of a division page: its data, which matches are past, and the template."""
+    today = today or date.today()
+    # Pages split matches into results and fixtures around today's date
+    past = tuple(m.id for m in snapshot.matches if m.date and m.date <= today)
+    key = f"{PAGE_TEMPLATE_VERSION}:{stylesheet_name()}:{snapshot.version}:{past}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def round_page_versions(snapshot, today=None):
+    """Maps each archived round's page path to a version of that round's matches only."""
+    today = today or date.today()
+    earlier, later, rounds = archive_rounds(snapshot, today)
+    versions = {}
+    for key in earlier + later:
+        matches = rounds[key]
+        past = tuple(m.id for m in matches if m.date <= today)
+        data = f"{PAGE_TEMPLATE_VERSION}:{stylesheet_name()}:{snapshot.name}"
+        data += f":{key}:{matches!r}:{past}"
+        versions[round_page_path(snapshot.name, key)] = hashlib.sha256(
+            data.encode("utf-8")
+        ).hexdigest()[:16]
+    return versions
+
+
+def page_head(title):
+    """Opening HTML of a page, down to its container div."""
+    return f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href="{stylesheet_name()}">
+</head>
+<body>
+  <div class="container">
+    """
+
+
+def results_html(results_by_date, dates):
+    """Results cards for the given dates, under a heading per date."""
+    html = ""
+    for match_date in dates:  # Iterate through dates and add date heading
+        html += f"""
+        <div class="results-container">
+          <div class="grid-row head">
+            <h3 class="date">{match_date.strftime('%A %d %B %Y')}</h3>
+          </div>
+    """
+        for match in results_by_date[match_date]:
+            home_team_name = (
+                f"<strong>{match.home_team_name}</strong>"
+                if (match.winner_id == match.home_team_id)
+                else match.home_team_name
+            )
+            away_team_name = (
+                f"<strong>{match.away_team_name}</strong>"
+                if (match.winner_id == match.away_team_id)
+                else match.away_team_name
+            )
+            if match.walkover:
+                home_score = "W/O" if (match.winner_id == match.home_team_id) else "X"
+                away_score = "W/O" if (match.winner_id == match.away_team_id) else "X"
+            else:
+                home_score = f"{match.home_goals}-{match.home_points:02}"
+                away_score = f"{match.away_goals}-{match.away_points:02}"
+
+            html += f"""
+          <div class="grid-row">
+            <div class="H">
+              <p class="team-name team-home ">{home_team_name}</p>
+            </div>
+            <div class="HS">
+              <p class="match-main-info">{home_score}</p>
+            </div>
+            <div class="AS">
+              <p class="match-main-info">{away_score}</p>
+            </div>
+            <div class="A">
+              <p class="team-name team-away">{away_team_name}</p>
+            </div>
+          </div>
+                """
+            # Add footer row for each match
+            if match.referee_name:  # Check if referee is available
+                html += f"""
+          <div class="grid-row footer">
+            <p class="footer-text">Referee: {match.referee_name} ({match.referee_club_name})</p>
+          </div>
+                """
+
+        # Close results-container
+        html += """
+        </div>
+        """
+    return html
+
+
+def fixtures_html(fixtures_by_date, dates):
+    """Fixtures cards for the given dates, under a heading per date."""
+    html = ""
+    for match_date in dates:  # Iterate through dates and add date heading
+        html += f"""
+        <div class="fixtures-container">
+          <div class="grid-row head">
+            <h3 class="date">{match_date.strftime('%A %d %B %Y')}</h3>
+          </div>
+    """
+        for match in fixtures_by_date[match_date]:
+            html += f"""
+          <div class="grid-row">
+            <div class="H">
+              <p class="team-name team-home ">{match.home_team_name}</p>
+            </div>
+            <div class="vs"><p>v</p></div>
+            <div class="A">
+              <p class="team-name team-away">{match.away_team_name}</p>
+            </div>
+          </div>
+          <div class="grid-row footer">
+            <p class="footer-text">Throw-in: {match.time.strftime('%H:%M') if match.time else 'TBC'}, {match.venue_name}
+                """
+            # Add footer row for each match
+            if match.referee_name:  # Check if referee is available
+                html += f"""(Referee: {match.referee_name})
+                """
+            html += """
+            </p>
+          </div>
+        """
+
+        # Close fixtures-container
+        html += """
+        </div>
+                """
+    return html
+
+
+def group_table_html(group, division_name):
+    """A group's league table."""
+    if group.name == "(single group)":
+        table_title = f"{division_name}"
+    else:
+        table_title = f"{group.name}"
+
+    html = f"""
+
+      <div class="group-table">
+        <div class="grid-row head">
+          <div class="rank  "></div>
+          <div class="team  ">{table_title}</div>
+          <div class="P  ">P</div>
+          <div class="W  ">W</div>
+          <div class="D  ">D</div>
+          <div class="L  ">L</div>
+          <div class="GF  ">GF</div>
+          <div class="PF  ">PF</div>
+          <div class="GA  ">GA</div>
+          <div class="PA  ">PA</div>
+          <div class="diff  ">+/-</div>
+          <div class="points  ">Pts</div>
+        </div>
+        """
+
+    for team in group.teams:
+        html += f"""
+        <div class="grid-row {'even' if team.league_rank % 2 == 0 else 'odd'}">
+          <div class="rank">{team.league_rank}</div>
+          <div class="team">{team.name}</div>
+          <div class="P">{team.played}</div>
+          <div class="W">{team.won}</div>
+          <div class="D">{team.drawn}</div>
+          <div class="L">{team.lost}</div>
+          <div class="GF">{team.goals_for}</div>
+          <div class="PF">{team.points_for}</div>
+          <div class="GA">{team.goals_against}</div>
+          <div class="PA">{team.points_against}</div>
+          <div class="diff">{team.scoring_difference_x_wo}</div>
+          <div class="points">{team.league_points}</div>
+        </div>
+            """
+
+    # close group-table
+    html += """
+      </div>
+        """
+    return html
+
+
+def _archive_links_html(title, division_name, keys):
+    if not keys:
+        return ""
+    links = " ".join(
+        f'<a href="{href(round_page_path(division_name, key))}">{round_label(key)}</a>'
+        for key in keys
+    )
+    return f"""
+        <p class="archive-links">{title}: {links}</p>
+    """
+
+
+def render_league_page(snapshot, today=None):
+    """Renders the league table, recent results and upcoming fixtures for a division."""
+    today = today or date.today()
+    results_by_date, fixtures_by_date, _ = split_matches(snapshot, today)
+    earlier, later, _ = archive_rounds(snapshot, today)
+
+    # Start of HTML
+    html = page_head("League Table, Results, and Fixtures")
+    html += """
+    <div class="group-table-container">
+    """
+
+    for group in snapshot.groups:
+        html += group_table_html(group, snapshot.name)
+
+    # close group-table-container, add fixtures-results-container and results
+    html += """
+    </div>
+    <div class="fixtures-results-container">
+      <div class="results-column">
+        <div class="h2">Results</div>
+    """
+    recent_dates = sorted(results_by_date, reverse=True)[:RESULTS_WINDOW]
+    html += results_html(results_by_date, recent_dates)
+    html += _archive_links_html("Earlier rounds", snapshot.name, earlier)
+
+    # Close results-column, add fixtures-column
+    html += """
+      </div>
+      <div class="fixtures-column">
+        <div class="h2">Fixtures</div>
+        """
+    upcoming_dates = sorted(fixtures_by_date)[:FIXTURES_WINDOW]
+    html += fixtures_html(fixtures_by_date, upcoming_dates)
+    html += _archive_links_html("Later rounds", snapshot.name, later)
+
+    # Close fixtures-column, fixtures-results-container, container, body, html
+    html += """
+      </div>
+    </div>
+  </div>
+</body>
+</html>
+            """
+
+    return minify_html(html)
+
+
+def render_round_page(snapshot, key, today=None):
+    """Renders the archive page with every result and fixture of one round."""
+    today = today or date.today()
+    results_by_date = defaultdict(list)
+    fixtures_by_date = defaultdict(list)
+    for match in split_matches(snapshot, today)[2][key]:
+        if match.date <= today:
+            results_by_date[match.date].append(match)
+        else:
+            fixtures_by_date[match.date].append(match)
+
+    html = page_head(f"{snapshot.name}: {round_label(key)}")
+    html += f"""
+    <div class="h2">{snapshot.name}: {round_label(key)}</div>
+    <p class="archive-links"><a href="{href(league_page_path(snapshot.name))}">League table</a></p>
+    <div class="fixtures-results-container">
+      <div class="results-column">
+    """
+    if results_by_date:
+        html += """
+        <div class="h2">Results</div>
+        """
+        html += results_html(results_by_date, sorted(results_by_date, reverse=True))
+    html += """
+      </div>
+      <div class="fixtures-column">
+    """
+    if fixtures_by_date:
+        html += """
+        <div class="h2">Fixtures</div>
+        """
+        html += fixtures_html(fixtures_by_date, sorted(fixtures_by_date))
+    html += """
+      </div>
+    </div>
+  </div>
+</body>
+</html>
+            """
+
+    return minify_html(html)
+
+
+def write_league_page(snapshot, today=None, compress=None):
+    """Renders a division page and publishes it to outputs/; returns its path."""
+    write_stylesheet(compress)
+    fname = league_page_path(snapshot.name)
+    publish(fname, render_league_page(snapshot, today), compress)
+    return fname
+
+
+def write_division_pages(snapshot, today, fnames, compress=None):
+    """Publishes the given pages of a division: its main page and/or round pages.
+
+    fnames are paths from league_page_path and round_page_versions; rendering a
+    division's pages in one call ships its snapshot to a worker only once.
+    Returns the paths written.
+    """
+    write_stylesheet(compress)
+    earlier, later, _ = archive_rounds(snapshot, today)
+    rounds = {round_page_path(snapshot.name, key): key for key in earlier + later}
+    for fname in fnames:
+        if fname in rounds:
+            html = render_round_page(snapshot, rounds[fname], today)
+        else:
+            html = render_league_page(snapshot, today)
+        publish(fname, html, compress)
+    return fnames
@@ -0,0 +1,290 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+
+import pandas as pd
+
+from .create_schema import Match
+from .encoders import as_image_format
+from .exports import division_exports
+from .images import IMAGE_KINDS, image_version
+from .pages import league_page_path, league_page_version, round_page_versions
+from .season import build_season_index
+from .season_pages import season_page_versions
+from .snapshots import load_division_snapshots
+from .standings import (
+    TEAM_FIELDS,
+    apply_result,
+    load_groups,
+    rank_group,
+    result_from_row,
+)
+from .update_matches import update_knockout_teams
+
+# Fixture changes a plan can preview, as columns of an amendments DataFrame
+AMENDMENT_FIELDS = {
+    "match_date": "date",
+    "match_time": "time",
+    "venue_id": "venue_id",
+    "referee_id": "referee_id",
+}
+
+
+@dataclass
+class Plan:
+    """What a batch of results and fixture changes would do, without doing it."""
+
+    results: list = field(default_factory=list)  # match ids whose result is new
+    amendments: list = field(default_factory=list)  # match ids amended
+    skipped: dict = field(default_factory=dict)  # match id -> reason
+    teams: dict = field(default_factory=dict)  # team id -> {column: (before, after)}
+    team_names: dict = field(default_factory=dict)
+    knockouts: dict = field(default_factory=dict)  # match id -> {slot: (before, after)}
+    pages: list = field(default_factory=list)
+    json: list = field(default_factory=list)
+    images: list = field(default_factory=list)
+
+    @property
+    def ranks(self):
+        """team id -> (rank before, rank after), for teams whose rank moves."""
+        return {
+            team_id: changes["league_rank"]
+            for team_id, changes in self.teams.items()
+            if "league_rank" in changes
+        }
+
+    def report(self):
+        lines = [
+            f"{len(self.results)} results and {len(self.amendments)} amendments "
+            f"would be applied; {len(self.skipped)} rows skipped"
+        ]
+        for match_id, reason in self.skipped.items():
+            lines.append(f"  skip match {match_id}: {reason}")
+        if self.teams:
+            lines.append(f"Teams ({len(self.teams)}):")
+        for team_id, changes in self.teams.items():
+            described = ", ".join(
+                f"{column} {before} -> {after}"
+                for column, (before, after) in changes.items()
+            )
+            lines.append(f"  {self.team_names[team_id]} ({team_id}): {described}")
+        if self.knockouts:
+            lines.append(f"Knockout slots ({len(self.knockouts)} matches):")
+        for match_id, slots in self.knockouts.items():
+            described = ", ".join(
+                f"{slot} {before} -> {after}" for slot, (before, after) in slots.items()
+            )
+            lines.append(f"  match {match_id}: {described}")
+        for title, paths in (
+            ("Pages", self.pages),
+            ("JSON", self.json),
+            ("Images", self.images),
+        ):
+            if paths:
+                lines.append(f"{title} ({len(paths)}):")
+                lines.extend(f"  {path}" for path in paths)
+        return "\n".join(lines)
+
+
+def _team_values(team):
+    return {column: getattr(team, column) for column in TEAM_FIELDS}
+
+
+def _changed(before, after):
+    """Keys whose value differs between two dicts, including added or removed ones."""
+    return sorted(
+        key for key in before.keys() | after.keys() if before.get(key) != after.get(key)
+    )
+
+
+def _page_versions(snapshot, today):
+    return {
+        league_page_path(snapshot.name): league_page_version(snapshot, today),
+        **round_page_versions(snapshot, today),
+    }
+
+
+def _json_versions(snapshot):
+    return {
+        fname: document["etag"]
+        for fname, document in division_exports(snapshot).items()
+    }
+
+
+def _stage_results(session, matches, new_results, plan):
+    """Applies the new results to the session's rows; returns the matches applied."""
+    staged = []
+    for idx, row in new_results.iterrows():
+        match_id = int(row["match_id"])
+        if (match := matches.get(match_id)) is None:
+            plan.skipped[match_id] = "no such match"
+        elif match.walkover or match.home_goals is not None:
+            plan.skipped[match_id] = "already has a result"
+        else:
+            staged.append((match, row))
+    if not staged:
+        return []
+
+    # Team rows and group matches for every affected group, in two queries
+    group_ids = {match.group_id for match, _ in staged if match.stage == "group"}
+    teams, group_matches = load_groups(session, group_ids)
+    for group_teams in teams.values():
+        for team in group_teams:
+            plan.team_names[team.id] = team.name
+    before = {
+        team.id: _team_values(team)
+        for group_teams in teams.values()
+        for team in group_teams
+    }
+    for match, row in staged:
+        group_teams = {team.id: team for team in teams.get(match.group_id, [])}
+        apply_result(match, group_teams, **result_from_row(row))
+        plan.results.append(match.id)
+    # Rank each group once for the whole batch, rather than once per result
+    for group_id in group_ids:
+        rank_group(teams[group_id], group_matches[group_id])
+    for group_teams in teams.values():
+        for team in group_teams:
+            after = _team_values(team)
+            if changes := {
+                column: (before[team.id][column], after[column])
+                for column in _changed(before[team.id], after)
+            }:
+                plan.teams[team.id] = changes
+    return [match for match, _ in staged]
+
+
+def _stage_knockouts(session, division_ids, plan):
+    knockouts = (
+        session.query(Match)
+        .filter(Match.division_id.in_(list(division_ids)), Match.stage == "knockout")
+        .all()
+    )
+    before = {m.id: (m.home_team_id, m.away_team_id) for m in knockouts}
+    for division_id in sorted(division_ids):
+        update_knockout_teams(session, division_id)
+    for match in knockouts:
+        slots = {}
+        for slot, old, new in zip(
+            ("home_team_id", "away_team_id"),
+            before[match.id],
+            (match.home_team_id, match.away_team_id),
+        ):
+            if old != new:
+                slots[slot] = (old, new)
+        if slots:
+            plan.knockouts[match.id] = slots
+
+
+def _stage_amendments(matches, amendments, plan):
+    """Applies fixture changes to the session's rows; returns {match: dates before and after}."""
+    amended = {}
+    for idx, row in amendments.iterrows():
+        match_id = int(row["match_id"])
+        if (match := matches.get(match_id)) is None:
+            plan.skipped[match_id] = "no such match"
+            continue
+        amended.setdefault(match, {match.date})
+        for column, attribute in AMENDMENT_FIELDS.items():
+            if column in row and pd.notna(row[column]):
+                value = row[column]
+                setattr(
+                    match, attribute, int(value) if column.endswith("_id") else value
+                )
+        amended[match].add(match.date)
+        plan.amendments.append(match_id)
+    return amended
+
+
+def plan_changes(
+    session,
+    new_results=None,
+    amendments=None,
+    image_format=None,
+    days=0,
+    today=None,
+):
+    """Works out what applying new results and fixture changes would change.
+
+    The changes are made to the session's rows inside a transaction that is
+    always rolled back, so nothing is committed. Standings come from one
+    batched recompute per affected group rather than from replaying
+    add_result row by row. The pages, JSON documents and images listed are
+    those whose data version the changes alter. Returns a Plan.
+    """
+    today = today or date.today()
+    plan = Plan()
+    try:
+        before = load_division_snapshots(session)
+        match_ids = [
+            int(match_id)
+            for frame in (new_results, amendments)
+            if frame is not None
+            for match_id in frame["match_id"]
+        ]
+        matches = {
+            match.id: match
+            for match in session.query(Match).filter(Match.id.in_(match_ids))
+        }
+        staged = []
+        if new_results is not None:
+            staged = _stage_results(session, matches, new_results, plan)
+        result_divisions = {match.division_id for match in staged}
+        if result_divisions:
+            _stage_knockouts(session, result_divisions, plan)
+        amended = {}
+        if amendments is not None:
+            amended = _stage_amendments(matches, amendments, plan)
+        divisions = result_divisions | {match.division_id for match in amended}
+        if not divisions:
+            return plan
+        after = {**before, **load_division_snapshots(session, divisions)}
+
+        for division_id in sorted(divisions):
+            old, new = before[division_id], after[division_id]
+            old_pages, new_pages = _page_versions(old, today), _page_versions(
+                new, today
+            )
+            plan.pages += [
+                fname for fname in _changed(old_pages, new_pages) if fname in new_pages
+            ]
+            plan.json += _changed(_json_versions(old), _json_versions(new))
+        plan.pages += _changed(
+            season_page_versions(build_season_index(before.values()), today),
+            season_page_versions(build_season_index(after.values()), today),
+        )
+
+        # The images publish_results would draw, and the fixtures on amended dates
+        images = []
+        dates = sorted({match.date for match in staged if match.date})
+        if dates:
+            days_covered = (dates[-1] - dates[0]).days
+            images += [
+                ("results", division_id, dates[0], days_covered)
+                for division_id in sorted(result_divisions)
+            ]
+        images += sorted(
+            {
+                ("fixtures", match.division_id, match_date, days)
+                for match, match_dates in amended.items()
+                for match_date in match_dates
+                if match_date
+            }
+        )
+        for kind, division_id, start_date, span_days in images:
+            old, new = before[division_id], after[division_id]
+            old_version = image_version(kind, old, start_date, span_days, image_format)
+            new_version = image_version(kind, new, start_date, span_days, image_format)
+            if old_version != new_version:
+                path_of, _ = IMAGE_KINDS[kind]
+                extension = as_image_format(image_format).extension
+                plan.images.append(path_of(new, start_date, span_days, extension))
+        return plan
+    finally:
+        session.rollback()
+        logging.info(
+            "plan_changes: %d results, %d amendments, %d teams changed",
+            len(plan.results),
+            len(plan.amendments),
+            len(plan.teams),
+        )
@@ -0,0 +1,103 @@
+import gzip
+import os
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # Optional: install county[brotli] for .br siblings
+    brotli = None
+
+# Text artifacts that get precompressed .gz/.br siblings
+COMPRESSIBLE = (".html", ".css", ".json", ".ics")
+
+
+def precompress_enabled():
+    """True if the COUNTY_PRECOMPRESS environment variable is set to a true value."""
+    return os.environ.get("COUNTY_PRECOMPRESS", "").lower() in ("1", "true", "yes")
+
+
+def _unchanged(path, data):
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as file:
+            return file.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def write_atomic(path, data):
+    """Writes bytes to path via a temp file and rename, unless path already holds them.
+
+    Readers see either the old file or the new one, never a partial write.
+    Returns True if the file was written.
+    """
+    if _unchanged(path, data):
+        return False
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return True
+
+
+def expected_siblings(path, compress=None):
+    """The precompressed siblings publish(path, data, compress) leaves beside path."""
+    if compress is None:
+        compress = precompress_enabled()
+    if not compress or not path.endswith(COMPRESSIBLE):
+        return []
+    return [path + ".gz"] + ([path + ".br"] if brotli is not None else [])
+
+
+def siblings_current(path, compress=None):
+    """True if path has exactly the .gz/.br siblings publish would give it."""
+    expected = expected_siblings(path, compress)
+    return all(
+        os.path.exists(sibling) == (sibling in expected)
+        for sibling in (path + ".gz", path + ".br")
+    )
+
+
+def publish(path, data, compress=None):
+    """Publishes an output file atomically, with optional precompressed siblings.
+
+    data may be str (written as UTF-8) or bytes. If compress is None the
+    COUNTY_PRECOMPRESS environment variable decides. HTML, CSS, JSON and ICS files
+    then also get path.gz and, if brotli is installed, path.br. Siblings are
+    removed when compression is off, so they can never go stale. Returns True
+    if path itself was rewritten.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if compress is None:
+        compress = precompress_enabled()
+
+    changed = write_atomic(path, data)
+    if not path.endswith(COMPRESSIBLE):
+        return changed
+
+    siblings = {path + ".gz": None, path + ".br": None}
+    for sibling in expected_siblings(path, compress):
+        if sibling.endswith(".gz"):
+            siblings[sibling] = gzip.compress(data, compresslevel=9, mtime=0)
+        else:
+            siblings[sibling] = brotli.compress(data, quality=11)
+    for sibling, compressed in siblings.items():
+        if compressed is not None:
+            write_atomic(sibling, compressed)
+        elif os.path.exists(sibling):
+            os.remove(sibling)
+    return changed
@@ -0,0 +1,170 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Collectors of the count_queries blocks open in this thread (or context), so
+# statements from other threads, such as the server's, are not counted
+_active = ContextVar("county_query_counters", default=())
+# Blocks open across all threads; the listeners are installed while any is
+_open_blocks = 0
+_listeners_lock = threading.Lock()
+
+
+@dataclass
+class Tally:
+    statements: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class QueryStats:
+    """Statements, rows and database time seen while counting.
+
+    rows are rows written plus ORM objects loaded. Totals are also broken
+    down by the public county function that issued them (the innermost
+    @with_session call) and by call site: the county source line nearest the
+    query, such as update_matches.py:278 in update_scores_x_wo.
+    """
+
+    statements: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    by_function: dict = field(default_factory=dict)  # name -> Tally
+    by_call_site: dict = field(default_factory=dict)  # "file:line func" -> Tally
+    attribute: bool = True  # Whether to fill in by_function and by_call_site
+    _last: tuple = (None, None)
+
+    def _add(self, keys, statements=0, rows=0, seconds=0.0):
+        self.statements += statements
+        self.rows += rows
+        self.seconds += seconds
+        if not self.attribute:
+            return
+        for breakdown, key in zip((self.by_function, self.by_call_site), keys):
+            tally = breakdown.setdefault(key, Tally())
+            tally.statements += statements
+            tally.rows += rows
+            tally.seconds += seconds
+
+    def report(self, top=10):
+        """The totals and the call sites issuing the most statements, as text."""
+        lines = [
+            f"{self.statements} statements, {self.rows} rows, "
+            f"{self.seconds * 1000:.1f} ms"
+        ]
+        sites = sorted(self.by_call_site.items(), key=lambda item: -item[1].statements)
+        for site, tally in sites[:top]:
+            lines.append(f"  {tally.statements:6d} x {site}")
+        return "\n".join(lines)
+
+
+def _origin():
+    """(public function, call site) of the query being executed."""
+    function = call_site = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        in_county = code.co_filename.startswith(PACKAGE_DIR)
+        if call_site is None and in_county and code.co_filename != __file__:
+            name = os.path.basename(code.co_filename)
+            call_site = f"{name}:{frame.f_lineno} {code.co_name}"
+        # The wrapper made by with_session holds the public function as func
+        if in_county and code.co_name == "wrapper" and "func" in frame.f_locals:
+            function = frame.f_locals["func"].__name__
+            break
+        frame = frame.f_back
+    return function or "(outside county)", call_site or "(outside county)"
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        # Already running when the first block opened, so not counted
+        return
+    seconds = time.perf_counter() - started.pop()
+    if not (active := _active.get()):
+        return
+    keys = _origin() if any(stats.attribute for stats in active) else (None, None)
+    # rowcount is -1 for SELECTs; their rows are counted as objects are loaded
+    rows = max(cursor.rowcount, 0)
+    for stats in active:
+        stats._add(keys, 1, rows, seconds)
+        stats._last = keys
+
+
+def _loaded(session, instance):
+    for stats in _active.get():
+        stats._add(stats._last, rows=1)
+
+
+_LISTENERS = (
+    (Engine, "before_cursor_execute", _before_execute),
+    (Engine, "after_cursor_execute", _after_execute),
+    (Session, "loaded_as_persistent", _loaded),
+)
+
+
+@contextmanager
+def count_queries(attribute=True):
+    """Counts the statements every engine executes inside the block.
+
+    Yields a QueryStats that fills in as queries run. Only statements issued
+    by the thread that opened the block count, not those of the server or
+    background regeneration. The event listeners are only installed while a
+    block is open, so counting costs nothing otherwise. Blocks may be nested.
+    Without attribute only the totals are kept, which saves inspecting the
+    stack for every statement.
+    """
+    global _open_blocks
+    stats = QueryStats(attribute=attribute)
+    with _listeners_lock:
+        if not _open_blocks:
+            for target, name, listener in _LISTENERS:
+                event.listen(target, name, listener)
+        _open_blocks += 1
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+        with _listeners_lock:
+            _open_blocks -= 1
+            if not _open_blocks:
+                for target, name, listener in _LISTENERS:
+                    event.remove(target, name, listener)
+
+
+@contextmanager
+def query_budget(max_statements):
+    """Raises AssertionError if the block issues more than max_statements."""
+    with count_queries() as stats:
+        yield stats
+    if stats.statements > max_statements:
+        raise AssertionError(
+            f"Query budget of {max_statements} exceeded\n{stats.report()}"
+        )
+
+
+def assert_query_budget(max_statements, func, *args, **kwargs):
+    """Calls func(*args, **kwargs) and asserts it issues at most max_statements.
+
+    For tests, e.g. assert_query_budget(20, update_all_tables). Returns the
+    function's result.
+    """
+    with query_budget(max_statements):
+        return func(*args, **kwargs)
@@ -0,0 +1,41 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+def default_workers():
+    """Worker count from the COUNTY_WORKERS environment variable, else all cores."""
+    if workers := os.environ.get("COUNTY_WORKERS"):
+        return max(1, int(workers))
+    return os.cpu_count() or 1
+
+
+def _pool_context():
+    """The multiprocessing context for a render pool.
+
+    A child forked while another thread holds a lock (logging, the connection
+    pool) inherits it held and can hang, so while other threads run, as with
+    background regeneration, workers are spawned instead.
+    """
+    if threading.active_count() > 1:
+        return multiprocessing.get_context("spawn")
+    return None
+
+
+def render_jobs(jobs, workers=None):
+    """Runs render jobs across a process pool.
+
+    Each job is a tuple (func, *args) where func is a module-level writer such as
+    write_league_page and args are picklable (division snapshots, dates). Returns
+    each job's result in job order, so output is independent of scheduling.
+    Jobs run in the calling thread when it is not the main thread, e.g. a
+    background regeneration worker, rather than starting a pool from it.
+    """
+    jobs = list(jobs)
+    workers = min(workers or default_workers(), len(jobs))
+    if workers <= 1 or threading.current_thread() is not threading.main_thread():
+        return [func(*args) for func, *args in jobs]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+        futures = [pool.submit(func, *args) for func, *args in jobs]
+        return [future.result() for future in futures]
@@ -0,0 +1,62 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SeasonIndex:
+    """Every division snapshot of a season, indexed by team, club and referee.
+
+    Built in memory from load_division_snapshots, so pages for hundreds of
+    teams, clubs and referees cost no queries beyond the divisions' own.
+    Match lists are sorted by (date, id); undated matches are left out.
+    """
+
+    divisions: dict = field(default_factory=dict)  # id -> DivisionSnapshot
+    teams: dict = field(default_factory=dict)  # id -> (division id, group, TeamRow)
+    clubs: dict = field(default_factory=dict)  # id -> name
+    club_teams: dict = field(default_factory=lambda: defaultdict(list))
+    referees: dict = field(default_factory=dict)  # id -> (name, club name)
+    team_matches: dict = field(default_factory=lambda: defaultdict(list))
+    referee_matches: dict = field(default_factory=lambda: defaultdict(list))
+    match_division: dict = field(default_factory=dict)  # match id -> division id
+
+    def club_matches(self, club_id):
+        """Matches of all of a club's teams, each once, by (date, id)."""
+        matches = {
+            match.id: match
+            for team_id in self.club_teams.get(club_id, [])
+            for match in self.team_matches.get(team_id, [])
+        }
+        return sorted(matches.values(), key=_match_order)
+
+
+def _match_order(match):
+    return match.date, match.id
+
+
+def build_season_index(snapshots):
+    """Indexes division snapshots by team, club and referee in one pass."""
+    index = SeasonIndex()
+    for snapshot in snapshots:
+        index.divisions[snapshot.id] = snapshot
+        for group in snapshot.groups:
+            for team in group.teams:
+                index.teams[team.id] = (snapshot.id, group, team)
+                for club_id, club_name in zip(team.club_ids, team.club_names):
+                    index.clubs[club_id] = club_name
+                    index.club_teams[club_id].append(team.id)
+        for match in snapshot.matches:
+            if match.date is None:
+                continue
+            index.match_division[match.id] = snapshot.id
+            for team_id in {match.home_team_id, match.away_team_id} - {None}:
+                index.team_matches[team_id].append(match)
+            if match.referee_id is not None:
+                index.referees[match.referee_id] = (
+                    match.referee_name,
+                    match.referee_club_name,
+                )
+                index.referee_matches[match.referee_id].append(match)
+    for matches in (*index.team_matches.values(), *index.referee_matches.values()):
+        matches.sort(key=_match_order)
+    return index
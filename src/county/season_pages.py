@@ -0,0 +1,212 @@
+import hashlib
+from collections import defaultdict
+from datetime import date
+
+from .pages import (
+    FIXTURES_WINDOW,
+    PAGE_TEMPLATE_VERSION,
+    RESULTS_WINDOW,
+    fixtures_html,
+    group_table_html,
+    href,
+    league_page_path,
+    minify_html,
+    page_head,
+    results_html,
+    stylesheet_name,
+    write_stylesheet,
+)
+from .publish import publish
+
+FORM_LENGTH = 5
+
+
+def team_page_path(team_id):
+    return f"outputs/team_{team_id}.html"
+
+
+def club_page_path(club_id):
+    return f"outputs/club_{club_id}.html"
+
+
+def referee_page_path(referee_id):
+    return f"outputs/referee_{referee_id}.html"
+
+
+def _split(matches, today):
+    """Results up to today and fixtures after it, by date."""
+    results_by_date = defaultdict(list)
+    fixtures_by_date = defaultdict(list)
+    for match in matches:
+        if match.date <= today:
+            if match.has_result:
+                results_by_date[match.date].append(match)
+        else:
+            fixtures_by_date[match.date].append(match)
+    return results_by_date, fixtures_by_date
+
+
+def form(team_id, matches, today):
+    """W/D/L letters of a team's last results, oldest first."""
+    results = [m for m in matches if m.date <= today and m.has_result]
+    letters = []
+    for match in results[-FORM_LENGTH:]:
+        if match.winner_id is None:
+            letters.append("D")
+        else:
+            letters.append("W" if match.winner_id == team_id else "L")
+    return " ".join(letters)
+
+
+def _division_title(snapshot):
+    return f"{snapshot.competition_name} {snapshot.name}"
+
+
+def _link(fname, text):
+    return f'<a href="{href(fname)}">{text}</a>'
+
+
+def _columns_html(matches, today, results_window=None, fixtures_window=None):
+    """The results and fixtures columns, optionally limited to the nearest dates."""
+    results_by_date, fixtures_by_date = _split(matches, today)
+    html = """
+    <div class="fixtures-results-container">
+      <div class="results-column">
+        <div class="h2">Results</div>
+    """
+    dates = sorted(results_by_date, reverse=True)[:results_window]
+    html += results_html(results_by_date, dates)
+    html += """
+      </div>
+      <div class="fixtures-column">
+        <div class="h2">Fixtures</div>
+    """
+    dates = sorted(fixtures_by_date)[:fixtures_window]
+    html += fixtures_html(fixtures_by_date, dates)
+    html += """
+      </div>
+    </div>
+  </div>
+</body>
+</html>
+    """
+    return html
+
+
+def render_team_page(index, team_id, today=None):
+    """Renders a team's standing, form and every result and fixture of its season."""
+    today = today or date.today()
+    division_id, group, team = index.teams[team_id]
+    snapshot = index.divisions[division_id]
+    matches = index.team_matches.get(team_id, [])
+
+    clubs = ", ".join(
+        _link(club_page_path(club_id), club_name)
+        for club_id, club_name in zip(team.club_ids, team.club_names)
+    )
+    html = page_head(team.name)
+    html += f"""
+    <div class="h2">{team.name}</div>
+    <p class="archive-links">{_link(league_page_path(snapshot.name), _division_title(snapshot))}</p>
+    <p class="archive-links">Club: {clubs}</p>
+    <p class="archive-links">Form: {form(team_id, matches, today) or '-'}</p>
+    <div class="group-table-container">
+    """
+    html += group_table_html(group, snapshot.name)
+    html += """
+    </div>
+    """
+    html += _columns_html(matches, today)
+    return minify_html(html)
+
+
+def render_club_page(index, club_id, today=None):
+    """Renders a club's teams across all competitions with their recent matches."""
+    today = today or date.today()
+    club_name = index.clubs[club_id]
+
+    html = page_head(club_name)
+    html += f"""
+    <div class="h2">{club_name}</div>
+    """
+    for team_id in index.club_teams.get(club_id, []):
+        division_id, group, team = index.teams[team_id]
+        snapshot = index.divisions[division_id]
+        team_form = form(team_id, index.team_matches.get(team_id, []), today)
+        html += f"""
+    <p class="archive-links">{_link(team_page_path(team_id), team.name)}:
+      {_link(league_page_path(snapshot.name), _division_title(snapshot))},
+      position {team.league_rank} of {len(group.teams)}, {team.league_points} pts.
+      Form: {team_form or '-'}</p>
+    """
+    html += _columns_html(
+        index.club_matches(club_id), today, RESULTS_WINDOW, FIXTURES_WINDOW
+    )
+    return minify_html(html)
+
+
+def render_referee_page(index, referee_id, today=None):
+    """Renders every appointment of a referee this season."""
+    today = today or date.today()
+    name, club_name = index.referees[referee_id]
+    title = f"{name} ({club_name})" if club_name else name
+
+    html = page_head(title)
+    html += f"""
+    <div class="h2">{title}</div>
+    """
+    html += _columns_html(index.referee_matches.get(referee_id, []), today)
+    return minify_html(html)
+
+
+def _version(today, matches, *data):
+    # Pages split matches into results and fixtures around today's date
+    past = tuple(m.id for m in matches if m.date <= today)
+    key = f"{PAGE_TEMPLATE_VERSION}:{stylesheet_name()}:{data!r}:{matches!r}:{past}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def season_page_versions(index, today=None):
+    """Maps the path of every team, club and referee page to its data version."""
+    today = today or date.today()
+    versions = {}
+    for team_id, (division_id, group, team) in index.teams.items():
+        snapshot = index.divisions[division_id]
+        versions[team_page_path(team_id)] = _version(
+            today,
+            index.team_matches.get(team_id, []),
+            snapshot.name,
+            snapshot.competition_name,
+            group,
+        )
+    for club_id, club_name in index.clubs.items():
+        teams = [index.teams[team_id] for team_id in index.club_teams[club_id]]
+        divisions = [index.divisions[division_id] for division_id, _, _ in teams]
+        versions[club_page_path(club_id)] = _version(
+            today,
+            index.club_matches(club_id),
+            club_name,
+            [(d.name, d.competition_name) for d in divisions],
+            [(t, len(g.teams)) for _, g, t in teams],
+        )
+    for referee_id, referee in index.referees.items():
+        versions[referee_page_path(referee_id)] = _version(
+            today, index.referee_matches.get(referee_id, []), referee
+        )
+    return versions
+
+
+def write_season_pages(index, today, fnames, compress=None):
+    """Publishes the given team, club and referee pages; returns the paths written."""
+    write_stylesheet(compress)
+    renderers = {}
+    for team_id in index.teams:
+        renderers[team_page_path(team_id)] = (render_team_page, team_id)
+    for club_id in index.clubs:
+        renderers[club_page_path(club_id)] = (render_club_page, club_id)
+    for referee_id in index.referees:
+        renderers[referee_page_path(referee_id)] = (render_referee_page, referee_id)
+    for fname in fnames:
+        render, key = renderers[fname]
+        publish(fname, render(index, key, today), compress)
+    return fnames
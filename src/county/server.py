@@ -0,0 +1,297 @@
+import gzip
+import io
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .exports import division_exports, dumps, etag
+from .images import (
+    fixtures_image_path,
+    render_division_fixtures,
+    render_division_results,
+    results_image_path,
+    slide_path,
+)
+from .pages import (
+    archive_rounds,
+    league_page_path,
+    render_league_page,
+    render_round_page,
+    round_page_path,
+    stylesheet,
+)
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".json": "application/json",
+    ".png": "image/png",
+}
+
+# results_<division>_<YYYYMMDD>.png or fixtures_<division>_<Saturday 05 July 2025>.png,
+# with _<n> before the extension for later slides, as written to outputs/
+IMAGE_PATH = re.compile(
+    r"(results|fixtures)_(.+)_(\d{8}|\w+ \d{2} \w+ \d{4})(?:_(\d+))?\.png"
+)
+IMAGE_DATE_FORMATS = {"results": "%Y%m%d", "fixtures": "%A %d %B %Y"}
+
+
+class SnapshotCache:
+    """Division snapshots, reloaded at most once every `ttl` seconds.
+
+    Only one thread reloads at a time; the others keep serving the previous
+    snapshots meanwhile, so a burst of requests costs a single fetch.
+    """
+
+    def __init__(self, loader, ttl=5.0):
+        self.loader = loader
+        self.ttl = ttl
+        self.snapshots = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+
+    def get(self):
+        if self.snapshots is None or time.monotonic() - self.loaded_at > self.ttl:
+            blocking = self.snapshots is None
+            if self.lock.acquire(blocking=blocking):
+                try:
+                    if (
+                        self.snapshots is None
+                        or time.monotonic() - self.loaded_at > self.ttl
+                    ):
+                        self.snapshots = self.loader()
+                        self.loaded_at = time.monotonic()
+                finally:
+                    self.lock.release()
+        return self.snapshots
+
+
+class ResponseCache:
+    """Bounded LRU cache of rendered responses keyed by request and data version."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        return None
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+def _png(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class Routes:
+    """Maps request paths to (etag, render) pairs over the current snapshots.
+
+    Paths mirror the files written to outputs/, so links inside rendered pages
+    work unchanged. Images are named as in outputs/ too and take ?days=N for
+    the number of days after the first they cover.
+    """
+
+    def __init__(self, snapshots):
+        self.snapshots = snapshots
+        self.today = date.today()
+        self.pages = {}
+        self.divisions = {}
+        self._json = None
+        self._index = None
+        for snapshot in snapshots.values():
+            self.divisions[snapshot.name] = snapshot
+            self.pages[league_page_path(snapshot.name)] = (snapshot, None)
+            earlier, later, _ = archive_rounds(snapshot, self.today)
+            for key in earlier + later:
+                self.pages[round_page_path(snapshot.name, key)] = (snapshot, key)
+
+    @property
+    def json(self):
+        """JSON documents by output path, built on first use."""
+        if self._json is None:
+            documents = {}
+            for snapshot in self.snapshots.values():
+                documents.update(division_exports(snapshot))
+            self._json = documents
+        return self._json
+
+    @property
+    def index(self):
+        """json/index.json: the ETag of every JSON document, by path under json/."""
+        if self._index is None:
+            self._index = dict(
+                sorted(
+                    (fname.removeprefix("outputs/json/"), document["etag"])
+                    for fname, document in self.json.items()
+                )
+            )
+        return self._index
+
+    def resolve(self, path, query):
+        """Returns (etag, render) for a path, or None if there is no such resource.
+
+        render() returns the body, or None if the resource turns out not to exist.
+        """
+        css, css_name = stylesheet()
+        if path == css_name:
+            return etag(css_name), lambda: css.encode("utf-8")
+
+        if (page := self.pages.get(f"outputs/{path}")) is not None:
+            snapshot, key = page
+            page_etag = etag(path, snapshot.version, self.today)
+            if key is None:
+                return (
+                    page_etag,
+                    lambda: render_league_page(snapshot, self.today).encode(),
+                )
+            return (
+                page_etag,
+                lambda: render_round_page(snapshot, key, self.today).encode(),
+            )
+
+        if path == "json/index.json":
+            index = self.index
+            return etag("index", tuple(index.items())), lambda: dumps(index).encode()
+
+        if path.startswith("json/"):
+            if (document := self.json.get(f"outputs/{path}")) is None:
+                return None
+            return document["etag"], lambda: dumps(document).encode("utf-8")
+
+        if match := IMAGE_PATH.fullmatch(path):
+            return self._image(path, query, *match.groups())
+        return None
+
+    def _image(self, path, query, kind, name, day, slide):
+        if (snapshot := self.divisions.get(name)) is None:
+            return None
+        try:
+            day = datetime.strptime(day, IMAGE_DATE_FORMATS[kind]).date()
+            days = int(query.get("days", ["0"])[0])
+        except ValueError:
+            return None
+        slide = int(slide or 1)
+        if days < 0 or slide < 1:
+            return None
+        if kind == "results":
+            # Results images are named after the last day they cover
+            start_date = day - timedelta(days=days)
+            path_of, render = results_image_path, render_division_results
+        else:
+            start_date = day
+            path_of, render = fixtures_image_path, render_division_fixtures
+        # Only the exact name written to outputs/, e.g. not a mistyped weekday
+        if slide_path(path_of(snapshot, start_date, days), slide) != f"outputs/{path}":
+            return None
+
+        def render_slide():
+            slides = render(snapshot, start_date, days)
+            return _png(slides[slide - 1]) if slide <= len(slides) else None
+
+        return etag(path, snapshot.version, days), render_slide
+
+
+class CountyRequestHandler(BaseHTTPRequestHandler):
+    server_version = "county"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = unquote(url.path).lstrip("/") or "index.html"
+        query = parse_qs(url.query)
+        gzip_ok = "gzip" in self.headers.get("Accept-Encoding", "")
+
+        routes = self.server.routes()
+        try:
+            resolved = routes.resolve(path, query)
+        except Exception:
+            logging.exception("county server: error resolving %s", self.path)
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR)
+            return
+        if resolved is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        etag, render = resolved
+        suffix = "." + path.rsplit(".", 1)[-1]
+        compress = gzip_ok and suffix != ".png"
+        if compress:
+            # The gzipped body is a different representation, so it gets its own tag
+            etag = etag[:-1] + '-gzip"'
+
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        key = etag
+        if (body := self.server.responses.get(key)) is None:
+            try:
+                body = render()
+            except Exception:
+                logging.exception("county server: error rendering %s", self.path)
+                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR)
+                return
+            if body is None:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            if compress:
+                body = gzip.compress(body, compresslevel=6, mtime=0)
+            self.server.responses.set(key, body)
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES.get(suffix, "text/plain"))
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.info("county server: " + format, *args)
+
+
+class CountyServer(ThreadingHTTPServer):
+    """Serves division pages, JSON and images rendered on demand from snapshots."""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address, loader, ttl=5.0, cache_size=1024):
+        super().__init__(address, CountyRequestHandler)
+        self.snapshot_cache = SnapshotCache(loader, ttl)
+        self.responses = ResponseCache(cache_size)
+        self._routes = None
+        self._routes_lock = threading.Lock()
+
+    def routes(self):
+        """Routes for the current snapshots, rebuilt only when they are reloaded."""
+        snapshots = self.snapshot_cache.get()
+        routes = self._routes
+        if routes is None or routes.snapshots is not snapshots:
+            with self._routes_lock:
+                if self._routes is None or self._routes.snapshots is not snapshots:
+                    self._routes = Routes(snapshots)
+                routes = self._routes
+        return routes
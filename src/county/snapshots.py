@@ -0,0 +1,227 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import astuple, dataclass
+from datetime import date, time
+from typing import Optional
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from .create_schema import Division, Group, Match, Referee, Team
+
+
+@dataclass(frozen=True)
+class TeamRow:
+    id: int
+    name: str
+    group_id: int
+    league_rank: int
+    played: int
+    won: int
+    drawn: int
+    lost: int
+    goals_for: int
+    points_for: int
+    goals_against: int
+    points_against: int
+    scoring_difference_x_wo: int
+    league_points: int
+    fielded_all: bool
+    club_ids: tuple[int, ...]
+    club_names: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class MatchRow:
+    id: int
+    stage: str
+    round: str
+    match_no: int
+    group_id: Optional[int]
+    date: Optional[date]
+    time: Optional[time]
+    home_team_id: Optional[int]
+    away_team_id: Optional[int]
+    home_team_name: Optional[str]
+    away_team_name: Optional[str]
+    home_club_ids: tuple[int, ...]
+    away_club_ids: tuple[int, ...]
+    home_club_names: tuple[str, ...]
+    away_club_names: tuple[str, ...]
+    venue_name: Optional[str]
+    referee_id: Optional[int]
+    referee_name: Optional[str]
+    referee_club_name: Optional[str]
+    home_goals: Optional[int]
+    home_points: Optional[int]
+    away_goals: Optional[int]
+    away_points: Optional[int]
+    walkover: Optional[bool]
+    winner_id: Optional[int]
+
+    @property
+    def has_result(self):
+        return not (
+            self.winner_id is None
+            and self.home_goals is None
+            and self.away_goals is None
+            and self.home_points is None
+            and self.away_points is None
+        )
+
+
+@dataclass(frozen=True)
+class GroupSnapshot:
+    id: int
+    name: str
+    teams: tuple[TeamRow, ...]  # Sorted by league_rank
+
+
+@dataclass(frozen=True)
+class DivisionSnapshot:
+    """Everything the division outputs are rendered from, detached from the session."""
+
+    id: int
+    name: str
+    competition_id: int
+    competition_name: str
+    groups: tuple[GroupSnapshot, ...]
+    matches: tuple[MatchRow, ...]  # Sorted by id
+
+    @property
+    def version(self):
+        """Content hash of the division's data; changes whenever any input does."""
+        return hashlib.sha256(repr(astuple(self)).encode("utf-8")).hexdigest()[:16]
+
+
+def _team_row(team):
+    return TeamRow(
+        id=team.id,
+        name=team.name,
+        group_id=team.group_id,
+        league_rank=team.league_rank,
+        played=team.played,
+        won=team.won,
+        drawn=team.drawn,
+        lost=team.lost,
+        goals_for=team.goals_for,
+        points_for=team.points_for,
+        goals_against=team.goals_against,
+        points_against=team.points_against,
+        scoring_difference_x_wo=team.scoring_difference_x_wo,
+        league_points=team.league_points,
+        fielded_all=team.fielded_all,
+        club_ids=tuple(club.id for club in team.clubs),
+        club_names=tuple(club.name for club in team.clubs),
+    )
+
+
+def _match_row(match, teams):
+    home = teams.get(match.home_team_id)
+    away = teams.get(match.away_team_id)
+    referee = match.referee
+    return MatchRow(
+        id=match.id,
+        stage=match.stage,
+        round=match.round,
+        match_no=match.match_no,
+        group_id=match.group_id,
+        date=match.date,
+        time=match.time,
+        home_team_id=match.home_team_id,
+        away_team_id=match.away_team_id,
+        home_team_name=home.name if home else None,
+        away_team_name=away.name if away else None,
+        home_club_ids=home.club_ids if home else (),
+        away_club_ids=away.club_ids if away else (),
+        home_club_names=home.club_names if home else (),
+        away_club_names=away.club_names if away else (),
+        venue_name=match.venue.name if match.venue else None,
+        referee_id=match.referee_id,
+        referee_name=referee.name if referee else None,
+        referee_club_name=referee.club.name if referee and referee.club else None,
+        home_goals=match.home_goals,
+        home_points=match.home_points,
+        away_goals=match.away_goals,
+        away_points=match.away_points,
+        walkover=match.walkover,
+        winner_id=match.winner_id,
+    )
+
+
+def load_division_snapshots(session, division_ids=None):
+    """Loads snapshots for the given divisions (default: all) in a fixed number of queries."""
+
+    query = session.query(Division).options(joinedload(Division.competition))
+    if division_ids is not None:
+        query = query.filter(Division.id.in_(list(division_ids)))
+    divisions = query.order_by(Division.id).all()
+    ids = [division.id for division in divisions]
+
+    groups = session.query(Group).filter(Group.division_id.in_(ids)).all()
+    teams = {
+        team.id: _team_row(team)
+        for team in session.query(Team)
+        .options(selectinload(Team.clubs))
+        .filter(Team.division_id.in_(ids))
+    }
+    matches = (
+        session.query(Match)
+        .options(
+            joinedload(Match.venue),
+            joinedload(Match.referee).joinedload(Referee.club),
+        )
+        .filter(Match.division_id.in_(ids))
+        .all()
+    )
+
+    # Knockout matches may reference teams from outside the division
+    missing = {
+        team_id
+        for match in matches
+        for team_id in (match.home_team_id, match.away_team_id)
+        if team_id is not None and team_id not in teams
+    }
+    if missing:
+        for team in (
+            session.query(Team)
+            .options(selectinload(Team.clubs))
+            .filter(Team.id.in_(missing))
+        ):
+            teams[team.id] = _team_row(team)
+
+    teams_by_group = defaultdict(list)
+    for team in teams.values():
+        teams_by_group[team.group_id].append(team)
+    groups_by_division = defaultdict(list)
+    for group in sorted(groups, key=lambda group: group.id):
+        groups_by_division[group.division_id].append(
+            GroupSnapshot(
+                id=group.id,
+                name=group.name,
+                teams=tuple(
+                    sorted(
+                        teams_by_group[group.id], key=lambda t: (t.league_rank, t.id)
+                    )
+                ),
+            )
+        )
+    matches_by_division = defaultdict(list)
+    for match in matches:
+        matches_by_division[match.division_id].append(_match_row(match, teams))
+
+    snapshots = {}
+    for division in divisions:
+        snapshots[division.id] = DivisionSnapshot(
+            id=division.id,
+            name=division.name,
+            competition_id=division.competition_id,
+            competition_name=division.competition.name,
+            groups=tuple(groups_by_division[division.id]),
+            matches=tuple(sorted(matches_by_division[division.id], key=lambda m: m.id)),
+        )
+    return snapshots
+
+
+def load_division_snapshot(session, division_id):
+    """Loads the snapshot for a single division, or None if it does not exist."""
+    return load_division_snapshots(session, [division_id]).get(division_id)
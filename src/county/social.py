@@ -0,0 +1,45 @@
+import json
+from datetime import timedelta
+
+from .publish import write_atomic
+
+
+def social_manifest_path(week_start):
+    return f"outputs/social_{week_start.strftime('%Y%m%d')}.json"
+
+
+def week_windows(week_start, days=6):
+    """Start dates of the results and fixtures windows for a weekly batch.
+
+    Results cover the days + 1 days before week_start and fixtures the days + 1
+    days from it, so the default is last week's results and this week's fixtures.
+    """
+    return week_start - timedelta(days=days + 1), week_start
+
+
+def write_social_manifest(path, week_start, days, image_format, entries):
+    """Writes the list of images a weekly batch produced, for whoever posts them.
+
+    entries are (kind, start_date, snapshot, slide paths) for each image.
+    """
+    results_date, fixtures_date = week_windows(week_start, days)
+    document = {
+        "week_start": week_start.isoformat(),
+        "days": days,
+        "format": image_format.spec,
+        "results_from": results_date.isoformat(),
+        "fixtures_from": fixtures_date.isoformat(),
+        "images": [
+            {
+                "kind": kind,
+                "start_date": start_date.isoformat(),
+                "division_id": snapshot.id,
+                "division": snapshot.name,
+                "competition": snapshot.competition_name,
+                "slides": slides,
+            }
+            for kind, start_date, snapshot, slides in entries
+        ],
+    }
+    write_atomic(path, json.dumps(document, indent=1).encode("utf-8"))
+    return path
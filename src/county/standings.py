@@ -0,0 +1,208 @@
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from .create_schema import Match, Team
+from .update_matches import determine_winner
+
+# Team columns that results change
+TEAM_FIELDS = (
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "points_for",
+    "goals_against",
+    "points_against",
+    "goals_for_x_wo",
+    "points_for_x_wo",
+    "goals_against_x_wo",
+    "points_against_x_wo",
+    "league_rank",
+    "fielded_all",
+)
+
+
+def result_from_row(row):
+    """add_result keyword arguments from a row shaped like data/new_results.csv."""
+
+    def value(column):
+        return int(row[column]) if pd.notna(row[column]) else None
+
+    return {
+        "home_goals": value("home_goals"),
+        "home_points": value("home_points"),
+        "away_goals": value("away_goals"),
+        "away_points": value("away_points"),
+        "walkover": bool(row["walkover"]) if pd.notna(row["walkover"]) else False,
+        "winner_id": value("winner_id"),
+    }
+
+
+def apply_result(
+    match,
+    teams,
+    home_goals=None,
+    home_points=None,
+    away_goals=None,
+    away_points=None,
+    walkover=False,
+    winner_id=None,
+):
+    """Records a result on match and adds it to its teams, as add_result does.
+
+    teams maps team id -> Team for the match's group; nothing is queried.
+    League ranks are left alone, for rank_group to settle once per group.
+    """
+    if walkover:
+        match.walkover = True
+        match.winner_id = winner_id
+    else:
+        match.home_goals = home_goals
+        match.home_points = home_points
+        match.away_goals = away_goals
+        match.away_points = away_points
+    if match.stage != "group":
+        return
+    home = teams[match.home_team_id]
+    away = teams[match.away_team_id]
+    home.played += 1
+    away.played += 1
+    if match.walkover:
+        winner, loser = (
+            (home, away) if match.winner_id == match.home_team_id else (away, home)
+        )
+        winner.won += 1
+        loser.lost += 1
+        loser.fielded_all = False
+    elif (home_goals, home_points, away_goals, away_points) == (0, 0, 0, 0) and (
+        winner_id is not None
+    ):
+        winner, loser = (
+            (home, away) if winner_id == match.home_team_id else (away, home)
+        )
+        winner.won += 1
+        loser.lost += 1
+        match.winner_id = winner_id
+    else:
+        home.goals_for += home_goals
+        home.points_for += home_points
+        home.goals_against += away_goals
+        home.points_against += away_points
+        away.goals_for += away_goals
+        away.points_for += away_points
+        away.goals_against += home_goals
+        away.points_against += home_points
+        match determine_winner(home_goals, home_points, away_goals, away_points):
+            case "home":
+                home.won += 1
+                away.lost += 1
+                match.winner_id = match.home_team_id
+            case "away":
+                home.lost += 1
+                away.won += 1
+                match.winner_id = match.away_team_id
+            case "draw":
+                home.drawn += 1
+                away.drawn += 1
+
+
+def _head_to_head(matches, tied):
+    # The first group match between the tied teams, as update_league_ranks finds it
+    ids = {team.id for team in tied}
+    return next(
+        (m for m in matches if m.home_team_id in ids and m.away_team_id in ids), None
+    )
+
+
+def _break_tie(tied, matches):
+    ranks = [team.league_rank for team in tied]
+    if tied[0].fielded_all != tied[1].fielded_all:
+        return
+    h2h = _head_to_head(matches, tied)
+    if h2h is not None and h2h.winner_id:
+        first, second = (min(ranks), max(ranks))
+        if h2h.winner_id != tied[0].id:
+            first, second = second, first
+        tied[0].league_rank = first
+        tied[1].league_rank = second
+
+
+def rank_group(teams, matches):
+    """Recomputes a group's scores excluding walkovers and its league ranks in memory.
+
+    teams are the group's Team rows and matches its group-stage Match rows.
+    Follows update_scores_x_wo and update_league_ranks exactly, including the
+    head-to-head tie-breaks, but without a query per team or tie.
+    """
+    matches = sorted(matches, key=lambda m: m.id)
+    fielded = {team.id for team in teams if team.fielded_all}
+    for team in teams:
+        counted = fielded | {team.id}
+        team.goals_for_x_wo = 0
+        team.points_for_x_wo = 0
+        team.goals_against_x_wo = 0
+        team.points_against_x_wo = 0
+        for m in matches:
+            if m.home_team_id not in counted or m.away_team_id not in counted:
+                continue
+            if m.home_team_id == team.id:
+                team.goals_for_x_wo += m.home_goals or 0
+                team.points_for_x_wo += m.home_points or 0
+                team.goals_against_x_wo += m.away_goals or 0
+                team.points_against_x_wo += m.away_points or 0
+            elif m.away_team_id == team.id:
+                team.goals_for_x_wo += m.away_goals or 0
+                team.points_for_x_wo += m.away_points or 0
+                team.goals_against_x_wo += m.home_goals or 0
+                team.points_against_x_wo += m.home_points or 0
+
+    ranked = sorted(
+        teams,
+        key=lambda team: (
+            team.league_points,
+            team.fielded_all,
+            team.scoring_difference_x_wo,
+        ),
+        reverse=True,
+    )
+    for i, team in enumerate(ranked):
+        team.league_rank = i + 1
+
+    for points, count in Counter(team.league_points for team in ranked).items():
+        tied = [team for team in ranked if team.league_points == points]
+        if count == 2:
+            _break_tie(tied, matches)
+        elif count > 2:
+            diffs = Counter(team.scoring_difference_x_wo for team in tied)
+            for diff, diff_count in diffs.items():
+                if diff_count == 2:
+                    _break_tie(
+                        [t for t in tied if t.scoring_difference_x_wo == diff], matches
+                    )
+
+
+def load_groups(session, group_ids):
+    """The Team and group-stage Match rows of the groups, in two queries.
+
+    Returns ({group id: [Team]}, {group id: [Match]}).
+    """
+    group_ids = list(group_ids)
+    teams = defaultdict(list)
+    for team in session.query(Team).filter(Team.group_id.in_(group_ids)):
+        teams[team.group_id].append(team)
+    matches = defaultdict(list)
+    for match in session.query(Match).filter(
+        Match.group_id.in_(group_ids), Match.stage == "group"
+    ):
+        matches[match.group_id].append(match)
+    return teams, matches
+
+
+def recompute_ranks(session, group_ids):
+    """Re-ranks the groups in a batch: two queries, however many teams and ties."""
+    teams, matches = load_groups(session, group_ids)
+    for group_id in group_ids:
+        rank_group(teams[group_id], matches[group_id])
+    return teams
@@ -0,0 +1,422 @@
+import random
+from dataclasses import dataclass, replace
+from datetime import date, time, timedelta
+
+import pandas as pd
+
+PREFIXES = (
+    "Bally",
+    "Kil",
+    "Knock",
+    "Glen",
+    "Castle",
+    "Dun",
+    "Ard",
+    "Clon",
+    "Rath",
+    "Tully",
+    "Carrig",
+    "Drom",
+    "Temple",
+    "Mount",
+    "New",
+)
+SUFFIXES = (
+    "more",
+    "beg",
+    "bane",
+    "keel",
+    "connell",
+    "brien",
+    "ross",
+    "gar",
+    "lough",
+    "ahane",
+    "dreen",
+    "cashel",
+    "finny",
+    "agh",
+    "town",
+)
+GROUP_NAMES = "ABCDEFGH"
+MATCH_TIMES = (time(19, 0), time(19, 30), time(11, 0), time(12, 30))
+
+
+@dataclass(frozen=True)
+class CountySpec:
+    """Size and shape of a synthetic county season.
+
+    Competition ids 1 and 2 are adult; later ones are juvenile, whose tables
+    rank on scores conceded. A goal is worth 3 points in every competition,
+    as determine_winner counts it. Each division has groups_per_division groups of
+    teams_per_group teams playing a double round robin, one round a week from
+    season_start, followed by semi-finals and a final whose teams come from
+    criteria on the group tables. Matches in the first played_fraction of the
+    season have results, a few of them walkovers.
+    """
+
+    clubs: int = 40
+    referees: int = 30
+    competitions: int = 3
+    divisions_per_competition: int = 5
+    groups_per_division: int = 1
+    teams_per_group: int = 6
+    season_start: date = date(2025, 3, 1)
+    played_fraction: float = 0.6
+    walkover_rate: float = 0.02
+    seed: int = 2025
+
+    def scaled(self, factor):
+        """The same county with factor times as many clubs, referees and divisions."""
+        return replace(
+            self,
+            clubs=self.clubs * factor,
+            referees=self.referees * factor,
+            divisions_per_competition=self.divisions_per_competition * factor,
+        )
+
+
+@dataclass(frozen=True)
+class SyntheticCounty:
+    """DataFrames shaped for add_clubs ... add_matches and add_new_results."""
+
+    clubs: pd.DataFrame
+    referees: pd.DataFrame
+    venues: pd.DataFrame
+    competitions: pd.DataFrame
+    divisions: pd.DataFrame
+    groups: pd.DataFrame
+    criteria: pd.DataFrame
+    teams: pd.DataFrame
+    matches: pd.DataFrame
+    results: pd.DataFrame
+
+    @property
+    def sizes(self):
+        return {
+            name: len(getattr(self, name))
+            for name in (
+                "clubs",
+                "referees",
+                "venues",
+                "divisions",
+                "groups",
+                "teams",
+                "matches",
+                "results",
+            )
+        }
+
+
+def club_name(number):
+    """A made-up but plausible club name; distinct for every number."""
+    prefix = PREFIXES[number % len(PREFIXES)]
+    suffix = SUFFIXES[(number // len(PREFIXES)) % len(SUFFIXES)]
+    cycle = number // (len(PREFIXES) * len(SUFFIXES))
+    return f"{prefix}{suffix}" + (f" {cycle + 1}" if cycle else "")
+
+
+def round_robin(team_ids):
+    """Double round robin by the circle method: a list of rounds of (home, away)."""
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)
+    rounds = []
+    for _ in range(len(teams) - 1):
+        pairs = [(teams[i], teams[-1 - i]) for i in range(len(teams) // 2)]
+        rounds.append([pair for pair in pairs if None not in pair])
+        teams.insert(1, teams.pop())
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+
+def _rank_query(group_id, rank):
+    return f"SELECT id FROM teams WHERE group_id = {group_id} AND league_rank = {rank}"
+
+
+def _winner_query(match_id):
+    # The recorded winner of a walkover, else the higher score as determine_winner
+    # counts it; add_result only records knockout winners for walkovers
+    return (
+        "SELECT COALESCE(winner_id, CASE WHEN home_goals * 3 + home_points >= "
+        "away_goals * 3 + away_points THEN home_team_id ELSE away_team_id END) "
+        "FROM matches WHERE id = {m} AND (walkover OR home_goals IS NOT NULL)"
+    ).format(m=match_id)
+
+
+def _score(rng):
+    return rng.randint(0, 4), rng.randint(3, 18)
+
+
+def synthetic_county(spec=None):
+    """Generates a whole season for spec (default CountySpec()); deterministic per seed."""
+    spec = spec or CountySpec()
+    rng = random.Random(spec.seed)
+
+    clubs = [(i, club_name(i - 1)) for i in range(1, spec.clubs + 1)]
+    referees = [
+        (i, f"Referee {i}", rng.randint(1, spec.clubs))
+        for i in range(1, spec.referees + 1)
+    ]
+    competitions = [
+        (i, "Senior League" if i == 1 else f"League {i}")
+        for i in range(1, spec.competitions + 1)
+    ]
+
+    divisions, groups, teams, matches, criteria = [], [], [], [], []
+    group_rounds = 2 * (spec.teams_per_group - 1 + spec.teams_per_group % 2)
+    next_club = 0
+    for competition_id, _ in competitions:
+        for d in range(spec.divisions_per_competition):
+            division_id = len(divisions) + 1
+            divisions.append(
+                (division_id, f"C{competition_id} Division {d + 1}", competition_id)
+            )
+            match_no = 0
+            division_groups = []
+            for g in range(spec.groups_per_division):
+                group_id = len(groups) + 1
+                name = (
+                    f"Group {GROUP_NAMES[g % len(GROUP_NAMES)]}"
+                    if spec.groups_per_division > 1
+                    else "(single group)"
+                )
+                groups.append((group_id, name, competition_id, division_id))
+                division_groups.append(group_id)
+                home_ground = {}
+                for _ in range(spec.teams_per_group):
+                    team_id = len(teams) + 1
+                    club_id1 = next_club % spec.clubs + 1
+                    next_club += 1
+                    club_id2 = None
+                    name = club_name(club_id1 - 1)
+                    # Every tenth team is an amalgamation of two clubs
+                    if team_id % 10 == 0 and spec.clubs > 1:
+                        club_id2 = next_club % spec.clubs + 1
+                        next_club += 1
+                        name = f"{name}/{club_name(club_id2 - 1)}"
+                    teams.append(
+                        (
+                            team_id,
+                            name,
+                            competition_id,
+                            division_id,
+                            group_id,
+                            club_id1,
+                            club_id2,
+                        )
+                    )
+                    home_ground[team_id] = club_id1
+
+                for number, pairs in enumerate(round_robin(home_ground), 1):
+                    match_date = spec.season_start + timedelta(weeks=number - 1)
+                    for home, away in pairs:
+                        match_no += 1
+                        matches.append(
+                            {
+                                "match_id": len(matches) + 1,
+                                "home_team_id": home,
+                                "away_team_id": away,
+                                "venue_id": home_ground[home],
+                                "competition_id": competition_id,
+                                "division_id": division_id,
+                                "stage": "group",
+                                "group_round": str(number),
+                                "match_no": match_no,
+                                "group_id": group_id,
+                                "match_date": match_date,
+                                "match_time": rng.choice(MATCH_TIMES),
+                                "referee_id": rng.choice(referees)[0],
+                                "home_team_criteria_id": None,
+                                "away_team_criteria_id": None,
+                            }
+                        )
+
+            # Semi-finals from the group tables, then a final between their winners
+            if len(division_groups) > 1:
+                a, b = division_groups[:2]
+                pairings = (((a, 1), (b, 2)), ((b, 1), (a, 2)))
+            else:
+                [a] = division_groups
+                pairings = (((a, 1), (a, 4)), ((a, 2), (a, 3)))
+            knockout_date = spec.season_start + timedelta(weeks=group_rounds + 1)
+            semi_finals = []
+            for home, away in pairings:
+                ids = []
+                for group_id, rank in (home, away):
+                    criteria.append(
+                        (
+                            len(criteria) + 1,
+                            f"Group {group_id} position {rank}",
+                            _rank_query(group_id, rank),
+                        )
+                    )
+                    ids.append(len(criteria))
+                match_no += 1
+                semi_finals.append(len(matches) + 1)
+                matches.append(
+                    _knockout(
+                        len(matches) + 1,
+                        competition_id,
+                        division_id,
+                        "Semi-Final",
+                        match_no,
+                        knockout_date,
+                        ids,
+                        rng.randint(1, spec.clubs),
+                        rng.choice(referees)[0],
+                    )
+                )
+            ids = []
+            for semi_final in semi_finals:
+                criteria.append(
+                    (
+                        len(criteria) + 1,
+                        f"Winner of match {semi_final}",
+                        _winner_query(semi_final),
+                    )
+                )
+                ids.append(len(criteria))
+            matches.append(
+                _knockout(
+                    len(matches) + 1,
+                    competition_id,
+                    division_id,
+                    "Final",
+                    match_no + 1,
+                    knockout_date + timedelta(weeks=1),
+                    ids,
+                    rng.randint(1, spec.clubs),
+                    rng.choice(referees)[0],
+                )
+            )
+
+    played_until = spec.season_start + timedelta(
+        weeks=int(group_rounds * spec.played_fraction)
+    )
+    results = []
+    for match in matches:
+        if match["stage"] != "group" or match["match_date"] >= played_until:
+            continue
+        walkover = rng.random() < spec.walkover_rate
+        home_goals, home_points = _score(rng)
+        away_goals, away_points = _score(rng)
+        results.append(
+            {
+                "match_id": match["match_id"],
+                "home_goals": None if walkover else home_goals,
+                "home_points": None if walkover else home_points,
+                "away_goals": None if walkover else away_goals,
+                "away_points": None if walkover else away_points,
+                "walkover": walkover,
+                "winner_id": match["home_team_id"] if walkover else None,
+            }
+        )
+
+    matches_df = pd.DataFrame(matches)
+    for column in (
+        "home_team_id",
+        "away_team_id",
+        "venue_id",
+        "group_id",
+        "referee_id",
+        "home_team_criteria_id",
+        "away_team_criteria_id",
+    ):
+        matches_df[column] = matches_df[column].astype("Int64")
+    results_df = pd.DataFrame(results)
+    for column in ("home_goals", "home_points", "away_goals", "away_points"):
+        results_df[column] = results_df[column].astype("Int64")
+    results_df["winner_id"] = results_df["winner_id"].astype("Int64")
+
+    return SyntheticCounty(
+        clubs=pd.DataFrame(clubs, columns=["club_id", "name"]).assign(ainm=None),
+        referees=pd.DataFrame(referees, columns=["referee_id", "name", "club_id"]),
+        venues=pd.DataFrame(
+            {
+                "venue_id": [club_id for club_id, _ in clubs],
+                "name": [f"{name} GAA Grounds" for _, name in clubs],
+                "club_id": [club_id for club_id, _ in clubs],
+                "address": None,
+            }
+        ),
+        competitions=pd.DataFrame(competitions, columns=["competition_id", "name"]),
+        divisions=pd.DataFrame(
+            divisions, columns=["division_id", "name", "competition_id"]
+        ),
+        groups=pd.DataFrame(
+            groups, columns=["group_id", "name", "competition_id", "division_id"]
+        ),
+        criteria=pd.DataFrame(
+            criteria, columns=["criteria_id", "description", "sql_query"]
+        ),
+        teams=pd.DataFrame(
+            teams,
+            columns=[
+                "team_id",
+                "name",
+                "competition_id",
+                "division_id",
+                "group_id",
+                "club_id1",
+                "club_id2",
+            ],
+        ).astype({"club_id2": "Int64"}),
+        matches=matches_df,
+        results=results_df,
+    )
+
+
+def build_county(spec=None, results=True):
+    """Loads a synthetic season into the current database and returns it.
+
+    The database must already be initialised. Rows go in through add_clubs ...
+    add_matches, and with results the played matches through add_new_results.
+    """
+    from . import (
+        add_clubs,
+        add_competitions,
+        add_criteria,
+        add_divisions,
+        add_groups,
+        add_matches,
+        add_new_results,
+        add_referees,
+        add_teams,
+        add_venues,
+    )
+
+    data = synthetic_county(spec)
+    add_clubs(clubs_df=data.clubs)
+    add_referees(referees_df=data.referees)
+    add_venues(venues_df=data.venues)
+    add_competitions(competitions_df=data.competitions)
+    add_divisions(divisions_df=data.divisions)
+    add_groups(groups_df=data.groups)
+    add_criteria(criteria_df=data.criteria)
+    add_teams(teams_df=data.teams)
+    add_matches(matches_df=data.matches)
+    if results:
+        add_new_results(new_results=data.results)
+    return data
+
+
+def _knockout(
+    match_id, competition_id, division_id, round_, match_no, day, ids, venue, referee
+):
+    return {
+        "match_id": match_id,
+        "home_team_id": None,
+        "away_team_id": None,
+        "venue_id": venue,
+        "competition_id": competition_id,
+        "division_id": division_id,
+        "stage": "knockout",
+        "group_round": round_,
+        "match_no": match_no,
+        "group_id": None,
+        "match_date": day,
+        "match_time": time(15, 0),
+        "referee_id": referee,
+        "home_team_criteria_id": ids[0],
+        "away_team_criteria_id": ids[1],
+    }
@@ -0,0 +1,69 @@
+import re
+from functools import lru_cache
+
+from .assets import font
+
+# Words are first clipped no shorter than GENTLE_WORD letters, then, at the
+# smallest font size, down to MIN_WORD
+GENTLE_WORD = 8
+MIN_WORD = 5
+# Smallest font size, as a fraction of the requested one
+MIN_SCALE = 0.8
+
+
+def _normalise(text):
+    # Amalgamation names come as "A/B" or "A / B"; always space the slash
+    return re.sub(r"\s*/\s*", " / ", text.strip())
+
+
+def abbreviations(text, min_word=MIN_WORD):
+    """Ever shorter forms of a name, clipping its longest word one letter at a time."""
+    tokens = re.findall(r"[^\W\d_]+|[\W\d_]+", text)
+    while True:
+        words = [i for i, t in enumerate(tokens) if t.isalpha() and len(t) > min_word]
+        if not words:
+            return
+        longest = max(words, key=lambda i: len(tokens[i]))
+        tokens[longest] = tokens[longest][:-1]
+        yield "".join(tokens)
+
+
+def _first_fitting(candidates, measure, max_width):
+    for candidate in candidates:
+        if measure.getlength(candidate) <= max_width:
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=4096)
+def fit_text(text, font_name, size, max_width):
+    """Returns (text, font) for text to fit within max_width pixels.
+
+    Tries the name as it is, then gently clipped words, then smaller sizes
+    down to MIN_SCALE, then shorter words at the smallest size, and finally
+    cuts it with an ellipsis. Memoized per (text, font, size, width), so
+    each team name is fitted once per layout.
+    """
+    full = font(font_name, size)
+    if text is None or full.getlength(text) <= max_width:
+        return text, full
+
+    name = _normalise(text)
+    gentle = [name, *abbreviations(name, GENTLE_WORD)]
+    if (fitted := _first_fitting(gentle, full, max_width)) is not None:
+        return fitted, full
+
+    scaled = full
+    for smaller in range(size - 1, round(size * MIN_SCALE) - 1, -1):
+        scaled = font(font_name, smaller)
+        if (fitted := _first_fitting(gentle, scaled, max_width)) is not None:
+            return fitted, scaled
+
+    shorter = list(abbreviations(gentle[-1], MIN_WORD))
+    if (fitted := _first_fitting(shorter, scaled, max_width)) is not None:
+        return fitted, scaled
+
+    candidate = (shorter or gentle)[-1]
+    while len(candidate) > 1 and scaled.getlength(candidate + "…") > max_width:
+        candidate = candidate[:-1].rstrip()
+    return candidate + "…", scaled
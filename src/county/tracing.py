@@ -0,0 +1,179 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from .publish import write_atomic
+from .querycount import count_queries
+
+# The active Tracer, or None when tracing is off
+_tracer = None
+_NO_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start", "sql")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        stats = self.tracer.queries
+        self.sql = (stats.statements, stats.rows, stats.seconds)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        stats = self.tracer.queries
+        statements, rows, sql_seconds = (
+            now - before
+            for now, before in zip(
+                (stats.statements, stats.rows, stats.seconds), self.sql
+            )
+        )
+        self.tracer._record(
+            self.name,
+            self.start,
+            end - self.start,
+            {
+                **self.args,
+                "statements": statements,
+                "rows": rows,
+                "sql_ms": round(sql_seconds * 1000, 3),
+                "python_ms": round((end - self.start - sql_seconds) * 1000, 3),
+            },
+        )
+        return False
+
+
+class Tracer:
+    """Collects timed spans with the SQL statements, time and rows inside each.
+
+    Spans nest by time on each thread; SQL figures include nested spans.
+    Spans in render worker processes are not collected.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+        self._lock = threading.Lock()
+        self._counting = count_queries(attribute=False)
+        self.queries = self._counting.__enter__()
+
+    def span(self, name, **args):
+        return _Span(self, name, args)
+
+    def _record(self, name, start, duration, args):
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6, 1),
+            "dur": round(duration * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def close(self):
+        self._counting.__exit__(None, None, None)
+
+    def chrome_trace(self):
+        """The spans as a Chrome/Perfetto trace document."""
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        data = json.dumps(self.chrome_trace()).encode("utf-8")
+        write_atomic(path, data)
+        return path
+
+    def summary(self, top=20):
+        """A table of span names by total time, with call counts, SQL and rows."""
+        totals = {}
+        for event in self.events:
+            row = totals.setdefault(event["name"], [0, 0.0, 0.0, 0, 0])
+            row[0] += 1
+            row[1] += event["dur"] / 1000
+            row[2] += event["args"]["sql_ms"]
+            row[3] += event["args"]["statements"]
+            row[4] += event["args"]["rows"]
+        lines = [
+            f"{'span':<32} {'calls':>6} {'total ms':>10} {'sql ms':>9} "
+            f"{'stmts':>7} {'rows':>8}"
+        ]
+        ranked = sorted(totals.items(), key=lambda item: -item[1][1])
+        for name, (calls, total, sql, statements, rows) in ranked[:top]:
+            lines.append(
+                f"{name:<32} {calls:>6} {total:>10.1f} {sql:>9.1f} "
+                f"{statements:>7} {rows:>8}"
+            )
+        return "\n".join(lines)
+
+
+def span(name, **args):
+    """A context manager timing a block as a span; does nothing when tracing is off."""
+    if _tracer is None:
+        return _NO_SPAN
+    return _tracer.span(name, **args)
+
+
+def traced(func):
+    """Decorator recording each call of func as a span named after it."""
+
+    @wraps(func)
+    def traced_call(*args, **kwargs):
+        if _tracer is None:
+            return func(*args, **kwargs)
+        with _tracer.span(func.__name__):
+            return func(*args, **kwargs)
+
+    return traced_call
+
+
+def start_tracing():
+    """Starts collecting spans; returns the Tracer."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing():
+    """Stops collecting spans; returns the Tracer with those collected, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+    return tracer
+
+
+@contextmanager
+def tracing():
+    """Collects spans inside the block; yields the Tracer."""
+    tracer = start_tracing()
+    try:
+        yield tracer
+    finally:
+        stop_tracing()
+
+
+def _trace_to_file(path):
+    if (tracer := stop_tracing()) is not None:
+        tracer.write_chrome_trace(path)
+        logging.info("Trace written to %s\n%s", path, tracer.summary())
+
+
+# COUNTY_TRACE=<path> traces the whole run and writes the trace on exit. Render
+# workers inherit the variable, so only the process that first saw it traces.
+if trace_path := os.environ.get("COUNTY_TRACE"):
+    if os.environ.setdefault("COUNTY_TRACE_PID", str(os.getpid())) == str(os.getpid()):
+        start_tracing()
+        atexit.register(_trace_to_file, trace_path)
@@ -0,0 +1,76 @@
+import glob
+import logging
+import os
+import time
+
+import pandas as pd
+
+
+class InboxWatcher:
+    """Polls a results file, or the CSV files in a directory, for changes.
+
+    poll() reports the files that changed once none has changed for
+    `debounce` seconds, so a burst of saves becomes a single batch. Files
+    present at start-up count as changed, so a restart picks up what it missed.
+    """
+
+    def __init__(self, path, debounce=2.0, pattern="*.csv"):
+        self.path = path
+        self.debounce = debounce
+        self.pattern = pattern
+        self.seen = {}  # path -> (mtime, size) when last reported
+        self.changed = set()
+        self.last_change = None
+
+    def files(self):
+        if os.path.isdir(self.path):
+            return sorted(glob.glob(os.path.join(self.path, self.pattern)))
+        return [self.path] if os.path.exists(self.path) else []
+
+    def poll(self, now=None):
+        now = time.monotonic() if now is None else now
+        for path in self.files():
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self.seen.get(path) != signature:
+                self.seen[path] = signature
+                self.changed.add(path)
+                self.last_change = now
+        if not self.changed or now - self.last_change < self.debounce:
+            return []
+        changed, self.changed = sorted(self.changed), set()
+        return changed
+
+
+def read_results(paths):
+    """Reads results CSVs shaped like data/new_results.csv into one DataFrame.
+
+    A file that cannot be parsed, say because it is still being written, is
+    logged and skipped; it is read again when it next changes.
+    """
+    frames = []
+    for path in paths:
+        try:
+            frames.append(pd.read_csv(path, encoding="latin-1", engine="pyarrow"))
+        except Exception as error:
+            logging.warning("Could not read results from %s: %s", path, error)
+    if not frames:
+        return None
+    # The last file to mention a match wins
+    return pd.concat(frames).drop_duplicates("match_id", keep="last")
+
+
+def run_watcher(watcher, handle, interval=1.0):
+    """Polls watcher every `interval` seconds, passing each batch to handle, until Ctrl-C."""
+    logging.info("Watching %s for results", watcher.path)
+    try:
+        while True:
+            if changed := watcher.poll():
+                try:
+                    handle(changed)
+                except Exception:
+                    # Keep watching; the next change to the files retries them
+                    logging.exception("Failed to process %s", ", ".join(changed))
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
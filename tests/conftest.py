@@ -0,0 +1,15 @@
+import pytest
+
+import county
+
+
+@pytest.fixture
+def county_db(tmp_path, monkeypatch):
+    """An empty county database in a temporary working directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(county, "engine", None)
+    monkeypatch.setattr(county, "Session", None)
+    county.initialise(f"sqlite:///{tmp_path / 'county.db'}")
+    yield
+    county.Session.remove()
+    county.engine.dispose()
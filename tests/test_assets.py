@@ -0,0 +1,48 @@
+from PIL import Image
+
+from county import assets
+
+
+def _save_logo(colour, width):
+    Image.new("RGB", (width, 30), colour).save("data/logos/logo30_Town.png")
+
+
+def test_replaced_logo_is_picked_up_by_the_next_batch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "logos").mkdir(parents=True)
+    assets.clear_asset_cache()
+    _save_logo("red", 30)
+    first = assets.refresh_assets()
+    assert assets.logo("Town").getpixel((0, 0)) == (255, 0, 0)
+
+    _save_logo("blue", 40)
+    # Within a batch the version holds; the next batch sees the new logo
+    assert assets.asset_version() == first
+    assert assets.refresh_assets() != first
+    assert assets.logo("Town").getpixel((0, 0)) == (0, 0, 255)
+    assets.clear_asset_cache()
+
+
+def test_logo_atlas_crops_match_the_logo_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "logos").mkdir(parents=True)
+    assets.clear_asset_cache()
+    # Wide enough that the shelf packer has to start a second row
+    colours = {1: "red", 2: "green", 3: "blue"}
+    for club_id, colour in colours.items():
+        Image.new("RGB", (400, 30), colour).save(f"data/logos/logo30_Club{club_id}.png")
+
+    index = assets.build_logo_atlas(
+        [(club_id, f"Club{club_id}") for club_id in (1, 2, 3, 4)]
+    )
+    assert set(index["30"]) == {"1", "2", "3"}
+    assert index["30"]["3"][:2] == [0, 30]
+    for club_id, colour in colours.items():
+        crop = assets.club_logo(club_id)
+        assert crop.size == (400, 30)
+        assert (
+            crop.convert("RGB").tobytes()
+            == Image.new("RGB", (400, 30), colour).tobytes()
+        )
+    assert assets.club_logo(4) is None
+    assets.clear_asset_cache()
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import county
+from county.calendars import calendar_path, match_uid
+from county.synthetic import CountySpec, build_county
+
+
+def _read(feed):
+    with open(calendar_path(feed), newline="") as file:
+        return file.read()
+
+
+def test_only_feeds_of_an_amended_match_are_rewritten(county_db):
+    build_county(CountySpec(competitions=1, divisions_per_competition=2))
+    written = county.generate_calendars()
+    assert calendar_path(("division", 1)) in written
+    assert county.generate_calendars() == []
+
+    match = next(
+        m
+        for m in county.get_division_snapshots()[1].matches
+        if m.date and not m.has_result and m.referee_id
+    )
+    new_referee = match.referee_id % 30 + 1
+    county.update_match_referee(match.id, new_referee)
+    rewritten = set(county.generate_calendars())
+
+    feeds = {
+        ("division", 1),
+        ("team", match.home_team_id),
+        ("team", match.away_team_id),
+        ("referee", match.referee_id),
+        ("referee", new_referee),
+    }
+    feeds.update(("club", i) for i in match.home_club_ids + match.away_club_ids)
+    assert rewritten == {calendar_path(feed) for feed in feeds}
+    assert match_uid(match.id) in _read(("referee", new_referee))
+    assert match_uid(match.id) not in _read(("referee", match.referee_id))
+
+
+def test_unchanged_feeds_are_byte_identical(county_db):
+    build_county(CountySpec(competitions=1, divisions_per_competition=1))
+    written = county.generate_calendars()
+    before = {fname: Path(fname).read_bytes() for fname in written}
+    assert county.generate_calendars(force=True) == written
+    assert {fname: Path(fname).read_bytes() for fname in written} == before
+    assert before[calendar_path(("division", 1))].startswith(b"BEGIN:VCALENDAR\r\n")
@@ -0,0 +1,51 @@
+import sqlite3
+
+import county
+from county.synthetic import CountySpec, build_county
+
+
+def test_synthetic_county_is_consistent(county_db):
+    build_county()
+    assert county.check_standings().empty
+
+
+def test_repair_restores_corrupted_tables(county_db, tmp_path):
+    build_county(CountySpec(divisions_per_competition=2))
+    db = sqlite3.connect(tmp_path / "county.db")
+    before = db.execute("SELECT * FROM teams ORDER BY id").fetchall()
+    # A result counted twice for one team, and another team's rank swapped
+    db.execute("UPDATE teams SET played = played + 1, won = won + 1 WHERE id = 1")
+    db.execute("UPDATE teams SET league_rank = league_rank % 6 + 1 WHERE id = 8")
+    db.commit()
+
+    found = county.check_standings(repair=True)
+    assert set(found["team_id"]) >= {1, 8}
+    assert {"played", "won", "league_rank"} <= set(found["column"])
+    assert db.execute("SELECT * FROM teams ORDER BY id").fetchall() == before
+    assert county.check_standings().empty
+
+
+def test_wrongly_cleared_fielded_all_is_reported(county_db, tmp_path):
+    build_county(CountySpec(competitions=1, divisions_per_competition=1))
+    db = sqlite3.connect(tmp_path / "county.db")
+    db.execute("UPDATE teams SET fielded_all = 0 WHERE id = 2")
+    db.commit()
+
+    found = county.check_standings(repair=True)
+    assert ("fielded_all", 0, True) in set(
+        found.loc[found["team_id"] == 2, ["column", "stored", "expected"]].itertuples(
+            index=False, name=None
+        )
+    )
+    assert db.execute("SELECT fielded_all FROM teams WHERE id = 2").fetchone() == (1,)
+
+
+def test_withdrawal_is_expected_and_opponents_are_repaired(county_db):
+    build_county(CountySpec(competitions=1, divisions_per_competition=1))
+    county.withdraw_team(3)
+
+    # withdraw_team drops the team's matches but leaves its opponents' counters
+    found = county.check_standings(repair=True)
+    assert 3 not in set(found["team_id"])
+    assert "played" in set(found["column"])
+    assert county.check_standings().empty
@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import county
+from county import exports
+from county.exports import JSON_INDEX_PATH
+from county.jobs import RegenerationQueue
+from county.render import render_jobs
+from county.synthetic import CountySpec, build_county
+
+
+@pytest.fixture
+def two_divisions(county_db, monkeypatch):
+    monkeypatch.setenv("COUNTY_WORKERS", "1")
+    build_county(CountySpec(competitions=1, divisions_per_competition=2))
+
+
+def _index_divisions():
+    with open(JSON_INDEX_PATH) as file:
+        index = json.load(file)
+    return {name for name in index if name.startswith("division_")}
+
+
+def test_parallel_jobs_keep_every_division_in_the_json_index(
+    two_divisions, monkeypatch
+):
+    # Both jobs wait for each other and write slowly, so their exports overlap
+    barrier = threading.Barrier(2, timeout=30)
+    publish = exports.publish
+
+    def slow_publish(*args, **kwargs):
+        time.sleep(0.005)
+        return publish(*args, **kwargs)
+
+    monkeypatch.setattr(exports, "publish", slow_publish)
+
+    def regenerate(job):
+        barrier.wait()
+        county.publish_results(
+            {division_id: dates for division_id, (dates, _) in job.items()},
+            images=False,
+        )
+
+    queue = RegenerationQueue(regenerate, debounce=0, workers=2)
+    try:
+        queue.mark_dirty(1)
+        while not queue.metrics()["running"]:
+            pass
+        queue.mark_dirty(2)
+        assert queue.flush(timeout=60)
+    finally:
+        queue.close()
+    assert queue.metrics()["jobs"] == 2
+    assert _index_divisions() == {"division_1.json", "division_2.json"}
+
+
+def test_events_for_a_division_are_coalesced(two_divisions):
+    jobs = []
+    queue = RegenerationQueue(jobs.append, debounce=0.2, workers=1)
+    try:
+        queue.mark_dirty(1, fixture_dates=["a"])
+        queue.mark_dirty(1, dates=["b"])
+        queue.mark_dirty(2)
+        assert queue.flush(timeout=10)
+    finally:
+        queue.close()
+    assert jobs == [{1: ({"b"}, {"a"}), 2: (set(), set())}]
+    assert queue.metrics()["coalesced"] == 1
+
+
+def test_update_all_tables_queues_every_division(two_divisions):
+    jobs = []
+    county.start_queue(jobs.append, debounce=0)
+    try:
+        county.update_all_tables()
+    finally:
+        county.stop_queue()
+    assert {division_id for job in jobs for division_id in job} == {1, 2}
+
+
+def test_render_jobs_stay_in_background_threads():
+    pids = []
+    thread = threading.Thread(
+        target=lambda: pids.extend(render_jobs([(os.getpid,), (os.getpid,)], 2))
+    )
+    thread.start()
+    thread.join()
+    assert pids == [os.getpid(), os.getpid()]
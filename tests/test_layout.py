@@ -0,0 +1,25 @@
+from county.layout import Block, SlideLayout, paginate
+
+# 200px of room per slide: blocks go from y=100 down to 300
+LAYOUT = SlideLayout(title_gap=0, size=(100, 330), bottom_margin=30)
+
+
+def _block(height, **kwargs):
+    return Block(height=height, draw=lambda slide, y: None, **kwargs)
+
+
+def test_headings_stay_with_their_rows_and_repeat_on_new_slides():
+    day1 = _block(20, keep_with_next=True)
+    day2 = _block(20, keep_with_next=True)
+    a = [_block(50, heading=day1) for _ in range(3)]
+    b = [_block(50, heading=day2) for _ in range(5)]
+
+    slides = paginate([day1, *a, day2, *b], LAYOUT)
+
+    # day2 fits at the foot of slide 1 but its first row doesn't, so both move
+    assert slides == [[day1, *a], [day2, *b[:3]], [day2, *b[3:]]]
+
+
+def test_a_block_taller_than_a_slide_gets_one_to_itself():
+    before, tall, after = _block(50), _block(250), _block(50)
+    assert paginate([before, tall, after], LAYOUT) == [[before], [tall], [after]]
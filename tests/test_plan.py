@@ -0,0 +1,76 @@
+import datetime
+import sqlite3
+
+import pytest
+
+import county
+from county.cli import read_amendments
+from county.standings import TEAM_FIELDS
+from county.synthetic import CountySpec, build_county
+
+
+def _teams(db):
+    return {
+        row[0]: dict(zip(TEAM_FIELDS, row[1:]))
+        for row in db.execute(f"SELECT id, {', '.join(TEAM_FIELDS)} FROM teams")
+    }
+
+
+def _knockout_slots(db):
+    return {
+        row[0]: row[1:]
+        for row in db.execute(
+            "SELECT id, home_team_id, away_team_id FROM matches WHERE stage = 'knockout'"
+        )
+    }
+
+
+def test_plan_matches_add_new_results(county_db, tmp_path):
+    spec = CountySpec(divisions_per_competition=2, played_fraction=1.0)
+    data = build_county(spec, results=False)
+    # Leave the last group rounds for the plan, so the knockout slots get settled
+    split = len(data.results) * 3 // 4
+    earlier, later = data.results.iloc[:split], data.results.iloc[split:]
+    county.add_new_results(new_results=earlier)
+    db = sqlite3.connect(tmp_path / "county.db")
+    teams_before, slots_before = _teams(db), _knockout_slots(db)
+
+    plan = county.plan_results(new_results=later)
+    assert _teams(db) == teams_before  # nothing was committed
+
+    county.add_new_results(new_results=later)
+    teams_after, slots_after = _teams(db), _knockout_slots(db)
+    assert sorted(plan.results) == sorted(later["match_id"].astype(int))
+    assert plan.teams == {
+        team_id: {
+            column: (before[column], teams_after[team_id][column])
+            for column in before
+            if before[column] != teams_after[team_id][column]
+        }
+        for team_id, before in teams_before.items()
+        if before != teams_after[team_id]
+    }
+    assert plan.ranks and plan.knockouts
+    assert plan.knockouts == {
+        match_id: {
+            slot: (old, new)
+            for slot, old, new in zip(
+                ("home_team_id", "away_team_id"), slots, slots_after[match_id]
+            )
+            if old != new
+        }
+        for match_id, slots in slots_before.items()
+        if slots != slots_after[match_id]
+    }
+
+
+def test_read_amendments_parses_day_first_times(tmp_path):
+    path = tmp_path / "amendments.csv"
+    path.write_text("match_id,match_date_time\n1,05/07/2025 19:30\n2,\n")
+    amendments = read_amendments(path)
+    assert amendments.loc[0, "match_date"] == datetime.date(2025, 7, 5)
+    assert amendments.loc[0, "match_time"] == datetime.time(19, 30)
+
+    path.write_text("match_id,match_date_time\n1,2025-07-05 19:30\n")
+    with pytest.raises(ValueError):
+        read_amendments(path)
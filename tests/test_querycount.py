@@ -0,0 +1,59 @@
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import county
+from county import querycount
+from county.querycount import assert_query_budget, count_queries
+from county.synthetic import CountySpec, build_county
+
+
+@pytest.mark.parametrize("scale", [1, 2])
+def test_check_standings_budget_is_independent_of_size(county_db, tmp_path, scale):
+    build_county(CountySpec().scaled(scale))
+    db = sqlite3.connect(tmp_path / "county.db")
+    db.execute("UPDATE teams SET league_rank = 0")
+    db.commit()
+
+    # Teams, matches and one executemany for the wrong column
+    found = assert_query_budget(3, county.check_standings, repair=True)
+    assert len(found) == scale * 90
+
+
+def test_query_budget_reports_the_call_sites(county_db):
+    data = build_county(CountySpec(divisions_per_competition=1), results=False)
+    with pytest.raises(AssertionError, match="update_matches.py"):
+        assert_query_budget(5, county.add_new_results, new_results=data.results)
+
+
+def test_statement_started_before_counting_is_skipped():
+    # A block opened between a statement's before and after events
+    connection = SimpleNamespace(info={})
+    cursor = SimpleNamespace(rowcount=1)
+    with count_queries() as stats:
+        querycount._after_execute(connection, cursor, "SELECT 1", (), None, False)
+    assert stats.statements == 0
+
+
+def test_other_threads_statements_are_not_counted(county_db):
+    county.get_division_snapshots()  # settle the schema queries first
+    started, finish = threading.Event(), threading.Event()
+    background = []
+
+    def count_in_background():
+        with count_queries() as stats:
+            background.append(stats)
+            started.set()
+            finish.wait(10)
+
+    thread = threading.Thread(target=count_in_background)
+    thread.start()
+    started.wait(10)
+    with count_queries() as stats:
+        county.get_division_snapshots()
+    finish.set()
+    thread.join()
+    assert stats.statements > 0
+    assert background[0].statements == 0
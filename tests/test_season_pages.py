@@ -0,0 +1,32 @@
+import os
+
+import county
+from county.season_pages import referee_page_path, team_page_path
+from county.synthetic import CountySpec, build_county
+
+
+def test_season_pages_are_rebuilt_only_where_a_result_lands(county_db):
+    build_county(CountySpec(competitions=1, divisions_per_competition=2))
+    written = county.generate_season_pages(workers=1)
+    assert written and all(os.path.exists(fname) for fname in written)
+    assert county.generate_season_pages(workers=1) == []
+
+    first, second = county.get_division_snapshots().values()
+    match = next(
+        m
+        for m in first.matches
+        if m.stage == "group" and not m.has_result and m.referee_id
+    )
+    county.add_match_result(match.id, 2, 3, 1, 4)
+    rebuilt = set(county.generate_season_pages(workers=1))
+
+    assert {
+        team_page_path(match.home_team_id),
+        team_page_path(match.away_team_id),
+        referee_page_path(match.referee_id),
+    } <= rebuilt
+    other_teams = {team.id for group in second.groups for team in group.teams}
+    assert not rebuilt & {team_page_path(team_id) for team_id in other_teams}
+    with open(team_page_path(match.home_team_id)) as file:
+        page = file.read()
+    assert "2-03" in page and "1-04" in page
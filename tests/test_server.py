@@ -0,0 +1,80 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+import pytest
+from PIL import Image
+
+import county
+import county.server
+from county.images import fixtures_image_path, results_image_path
+from county.pages import league_page_path
+from county.server import CountyServer
+from county.synthetic import CountySpec, build_county
+
+
+@pytest.fixture
+def server(county_db):
+    build_county(CountySpec(competitions=1, divisions_per_competition=1))
+    snapshots = county.get_division_snapshots()
+    server = CountyServer(("127.0.0.1", 0), lambda: snapshots)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, snapshots[1]
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path, **headers):
+    url = f"http://127.0.0.1:{server.server_port}/{quote(path)}"
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as r:
+            return r.status, r.headers, r.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.headers, b""
+
+
+def test_pages_are_revalidated_by_etag(server):
+    server, snapshot = server
+    path = league_page_path(snapshot.name).removeprefix("outputs/")
+    status, headers, body = _get(server, path)
+    assert status == 200 and snapshot.name.encode() in body
+
+    status, _, body = _get(server, path, **{"If-None-Match": headers["ETag"]})
+    assert (status, body) == (304, b"")
+
+
+def test_json_index_lists_every_document_etag(server):
+    server, snapshot = server
+    status, _, body = _get(server, "json/index.json")
+    index = json.loads(body)
+    assert status == 200
+    _, headers, _ = _get(server, "json/division_1.json")
+    assert index["division_1.json"] == headers["ETag"]
+    assert len(index) == 1 + sum(len(group.teams) for group in snapshot.groups)
+
+
+def test_images_are_served_under_their_outputs_names(server, monkeypatch):
+    server, snapshot = server
+    # data/ fonts aren't in the repo; draw one blank slide per image instead
+    slide = Image.new("RGB", (8, 8))
+    for name in ("render_division_results", "render_division_fixtures"):
+        monkeypatch.setattr(county.server, name, lambda *args: [slide])
+    played = min(match.date for match in snapshot.matches if match.has_result)
+    to_play = max(match.date for match in snapshot.matches if match.date)
+
+    for path in (
+        results_image_path(snapshot, played),
+        fixtures_image_path(snapshot, to_play),
+    ):
+        status, headers, body = _get(server, path.removeprefix("outputs/"))
+        assert status == 200 and headers["Content-Type"] == "image/png"
+        assert body.startswith(b"\x89PNG")
+
+    path = results_image_path(snapshot, played).removeprefix("outputs/")
+    assert _get(server, path.replace(".png", "_9.png"))[0] == 404
+    # A weekday that doesn't match the date is not a name written to outputs/
+    path = fixtures_image_path(snapshot, to_play).removeprefix("outputs/")
+    assert _get(server, path.replace(to_play.strftime("%A"), "Funday"))[0] == 404
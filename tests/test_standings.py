@@ -0,0 +1,61 @@
+import sqlite3
+
+import pytest
+
+import county
+from county.querycount import assert_query_budget
+from county.synthetic import CountySpec, build_county
+from county.update_matches import update_league_ranks
+
+RANKED = (
+    "id, goals_for_x_wo, points_for_x_wo, goals_against_x_wo, "
+    "points_against_x_wo, league_rank"
+)
+
+
+def _ranks(db):
+    return db.execute(f"SELECT {RANKED} FROM teams ORDER BY id").fetchall()
+
+
+def _scramble(db):
+    db.execute(
+        "UPDATE teams SET league_rank = 0, goals_for_x_wo = 0, points_for_x_wo = 0, "
+        "goals_against_x_wo = 0, points_against_x_wo = 0"
+    )
+    db.commit()
+
+
+@county.with_session
+def _rank_group_by_group(session):
+    for (group_id,) in session.query(county.Group.id):
+        update_league_ranks(session, group_id)
+
+
+def test_update_all_tables_ranks_as_update_league_ranks(county_db, tmp_path):
+    build_county(CountySpec(walkover_rate=0.1).scaled(2))
+    db = sqlite3.connect(tmp_path / "county.db")
+    # Ties on points and teams that conceded walkovers, so every rule is used
+    assert db.execute(
+        "SELECT count(*) FROM (SELECT 1 FROM teams "
+        "GROUP BY group_id, won * 2 + drawn HAVING count(*) > 1)"
+    ).fetchone()[0]
+    assert db.execute("SELECT count(*) FROM teams WHERE NOT fielded_all").fetchone()[0]
+
+    _scramble(db)
+    _rank_group_by_group()
+    expected = _ranks(db)
+    _scramble(db)
+    county.update_all_tables()
+    assert _ranks(db) == expected
+
+
+@pytest.mark.parametrize("scale", [1, 2])
+def test_update_all_tables_budget_is_independent_of_size(county_db, tmp_path, scale):
+    build_county(CountySpec().scaled(scale))
+    db = sqlite3.connect(tmp_path / "county.db")
+    before = _ranks(db)
+    _scramble(db)
+
+    # Groups, teams, matches and one batched UPDATE of the ranks
+    assert_query_budget(4, county.update_all_tables)
+    assert _ranks(db) == before
@@ -0,0 +1,63 @@
+import sqlite3
+
+import county
+from county.synthetic import CountySpec, build_county
+
+
+def _slots(db, round_):
+    return db.execute(
+        "SELECT id, home_team_id, away_team_id FROM matches "
+        "WHERE stage = 'knockout' AND round = ? ORDER BY match_no",
+        (round_,),
+    ).fetchall()
+
+
+def test_knockout_teams_follow_their_criteria(county_db, tmp_path):
+    # Before criteria were read as a many-to-one relationship, every knockout
+    # criterion failed and the slots stayed empty
+    build_county(CountySpec(competitions=1, divisions_per_competition=1))
+    db = sqlite3.connect(tmp_path / "county.db")
+    ranked = [
+        team_id
+        for (team_id,) in db.execute(
+            "SELECT id FROM teams WHERE group_id = 1 ORDER BY league_rank"
+        )
+    ]
+    semi_finals = _slots(db, "Semi-Final")
+    assert [slots[1:] for slots in semi_finals] == [
+        (ranked[0], ranked[3]),
+        (ranked[1], ranked[2]),
+    ]
+    [(final_id, home, away)] = _slots(db, "Final")
+    assert (home, away) == (None, None)
+
+    semi_final_id, semi_home, _ = semi_finals[0]
+    county.add_match_result(semi_final_id, 2, 10, 1, 8)
+    [(_, home, away)] = _slots(db, "Final")
+    assert (home, away) == (semi_home, None)
+
+
+def test_juvenile_final_takes_the_recorded_semi_final_winner(county_db, tmp_path):
+    build_county(CountySpec(competitions=3, divisions_per_competition=1))
+    db = sqlite3.connect(tmp_path / "county.db")
+    [(semi_final_id, semi_home, _), _] = db.execute(
+        "SELECT id, home_team_id, away_team_id FROM matches "
+        "WHERE stage = 'knockout' AND division_id = 3 AND round = 'Semi-Final' "
+        "ORDER BY match_no"
+    ).fetchall()
+
+    # 2-3 beats 0-8 with goals worth 3 points, as determine_winner counts them
+    county.add_match_result(semi_final_id, 2, 3, 0, 8)
+    [(home,)] = db.execute(
+        "SELECT home_team_id FROM matches " "WHERE division_id = 3 AND round = 'Final'"
+    ).fetchall()
+    assert home == semi_home
+
+
+def test_knockout_fixtures_have_a_venue_and_referee(county_db, tmp_path):
+    build_county(CountySpec(competitions=1, divisions_per_competition=2))
+    db = sqlite3.connect(tmp_path / "county.db")
+    assert db.execute(
+        "SELECT count(*) FROM matches WHERE stage = 'knockout' "
+        "AND (venue_id IS NULL OR referee_id IS NULL)"
+    ).fetchone() == (0,)
@@ -0,0 +1,35 @@
+import logging
+import sqlite3
+
+import county
+from county.querycount import count_queries
+from county.synthetic import CountySpec, build_county
+
+
+def test_apply_new_results_applies_a_season_in_one_batch(county_db, tmp_path):
+    spec = CountySpec(competitions=1, divisions_per_competition=2, played_fraction=1.0)
+    data = build_county(spec, results=False)
+    with count_queries() as stats:
+        applied = county.apply_new_results(data.results)
+
+    # A statement or two per row would be hundreds; this is per group and division
+    assert stats.statements < 60
+    assert set(applied) == {1, 2}
+    assert county.check_standings().empty
+    db = sqlite3.connect(tmp_path / "county.db")
+    assert db.execute(
+        "SELECT count(*) FROM matches "
+        "WHERE round = 'Semi-Final' AND home_team_id IS NULL"
+    ).fetchone() == (0,)
+
+
+def test_apply_new_results_skips_recorded_results(county_db, caplog):
+    data = build_county(CountySpec(competitions=1, divisions_per_competition=1))
+    assert county.apply_new_results(data.results) == {}
+
+    changed = data.results.head(1).copy()
+    changed["home_goals"] = 9
+    changed["walkover"] = False
+    with caplog.at_level(logging.WARNING):
+        assert county.apply_new_results(changed) == {}
+    assert "correct it by hand" in caplog.text